@@ -7,10 +7,11 @@ from discord.ui import Button, View
 
 from config.ocs import OCS_RARITY_MAP
 from config.setup import DEFAULT_EMBED_COLOR
-from utils.cache.cache_list import user_oc_inv_cache
 from utils.cache.user_inv_cache import (
+    ensure_user_oc_inv_cache,
     fetch_all_rarity_oc_invs_cache,
     fetch_user_oc_inv_cache,
+    get_user_oc_inv_snapshot,
 )
 from utils.db.user_oc_inv import user_inv_oc_name_autocomplete
 from utils.logs.debug_log import debug_log, enable_debug
@@ -20,16 +21,30 @@ from utils.visuals.pretty_defer import pretty_defer
 # enable_debug(f"{__name__}.inventory")
 
 
+# The paginator holds the inventory snapshot the command was run on, so pages
+# and footer totals stay consistent while the user keeps pulling. Page text
+# is rendered once per page and reused when paging back and forth.
 class OC_Paginator(View):
 
     def __init__(
-        self, bot, user, items, title, color, context, rarity, per_page=10, timeout=120
+        self,
+        bot,
+        user,
+        snapshot,
+        items,
+        title,
+        color,
+        context,
+        rarity,
+        per_page=10,
+        timeout=120,
     ):
         from utils.logs.pretty_log import pretty_log
 
         super().__init__(timeout=timeout)
         self.bot = bot
         self.user = user
+        self.snapshot = snapshot
         self.items = items
         self.title = title
         self.color = color
@@ -39,6 +54,7 @@ class OC_Paginator(View):
         self.page = 0
         self.max_page = (len(items) - 1) // per_page + 1
         self.message: discord.Message | None = None  # Store the message object
+        self._descriptions: dict[int, str] = {}
 
         pretty_log(
             "debug",
@@ -96,44 +112,23 @@ class OC_Paginator(View):
 
             title = self.title
 
-            desc_lines = []
-            for idx, oc in enumerate(page_items):
-                oc_name = oc.get("card_name", "Unknown")
-                oc_rarity = oc.get("rarity", "Unknown")
-                rarity_emoji = OCS_RARITY_MAP.get(oc_rarity, {}).get("emoji", "")
-                image_link = oc.get("image_link", "No Image")
-                number = start + idx + 1
-                display_name = oc_name.title()
-                name_str = f"{number}. {rarity_emoji} [{display_name}]({image_link}) | Owned: {oc.get('owned', 0)}"
-                desc_lines.append(name_str)
-
-            description = "\n".join(desc_lines)
             embed = discord.Embed(
                 title=title,
                 color=self.color,
-                description=description,
-            )
-            from utils.cache.user_inv_cache import (
-                total_cards_owned_cache,
-                total_owned_cards_by_rarity_cache,
-                total_unique_cards_by_rarity_cache,
-                total_unique_cards_owned_cache,
+                description=self._page_description(start, page_items),
             )
+            snapshot = self.snapshot
 
             if self.context == "all OCs":
-                total_unique_count = total_unique_cards_owned_cache(self.user.id)
-                total_owned_count = total_cards_owned_cache(self.user.id)
+                total_unique_count = snapshot.unique_owned
+                total_owned_count = snapshot.total_owned
                 total_count_str = f"{total_unique_count} Unique OCs | {total_owned_count} Total OCs Owned"
                 embed.set_footer(
                     text=f"Page {self.page + 1} of {self.max_page} | {total_count_str}"
                 )
             else:
-                total_owned = total_owned_cards_by_rarity_cache(
-                    self.user.id, self.rarity
-                )
-                total_unique_cards = total_unique_cards_by_rarity_cache(
-                    self.user.id, self.rarity
-                )
+                total_owned = snapshot.owned_by_rarity(self.rarity)
+                total_unique_cards = snapshot.unique_by_rarity(self.rarity)
                 total_count_str = f"{total_unique_cards} Unique | {total_owned} Owned"
                 embed.set_footer(
                     text=f"Page {self.page + 1} of {self.max_page} | {total_count_str} {self.rarity} OCs"
@@ -154,6 +149,24 @@ class OC_Paginator(View):
                 color=0xFF0000,
             )
 
+    def _page_description(self, start: int, page_items) -> str:
+        description = self._descriptions.get(self.page)
+        if description is None:
+            desc_lines = []
+            for idx, oc in enumerate(page_items):
+                record = oc.record
+                oc_name = record.name if record else "Unknown"
+                oc_rarity = record.rarity if record else "Unknown"
+                rarity_emoji = OCS_RARITY_MAP.get(oc_rarity, {}).get("emoji", "")
+                image_link = (record.image_link if record else None) or "No Image"
+                number = start + idx + 1
+                display_name = oc_name.title()
+                name_str = f"{number}. {rarity_emoji} [{display_name}]({image_link}) | Owned: {oc.owned}"
+                desc_lines.append(name_str)
+
+            description = self._descriptions[self.page] = "\n".join(desc_lines)
+        return description
+
     async def on_timeout(self):
 
         pretty_log("debug", "Paginator timeout: disabling all buttons.")
@@ -205,10 +218,10 @@ class Inventory(commands.Cog):
             f"[INVENTORY] Step: cache check done at {time.perf_counter() - start_time:.4f}s"
         )
 
-        # Check if cache is populated, if not load it
-        if not user_oc_inv_cache:
-            await loader.error(content="No inventory data found.")
-            return
+        # Load the user's inventory into cache if it is not there yet
+        await ensure_user_oc_inv_cache(self.bot, interaction.user.id)
+        # Everything below reads this one version of the inventory
+        snapshot = get_user_oc_inv_snapshot(interaction.user.id)
 
         debug_log(
             f"[INVENTORY] Step: before cache selection at {time.perf_counter() - start_time:.4f}s"
@@ -248,11 +261,16 @@ class Inventory(commands.Cog):
         if not rarity:
             # Sort all OCs alphabetically rarity then name
             rarity_order = {"Common": 1, "Rare": 2, "Epic": 3, "Legendary": 4}
-            sorted_ocs = sorted(
-                selected_cache,
-                key=lambda oc: (
-                    rarity_order.get(oc.get("rarity"), 99),
-                    oc.get("card_name", ""),
+            sorted_ocs = snapshot.cached(
+                ("sorted", None),
+                lambda: tuple(
+                    sorted(
+                        selected_cache,
+                        key=lambda oc: (
+                            rarity_order.get(oc.rarity, 99),
+                            oc.card_name,
+                        ),
+                    )
                 ),
             )
             color = DEFAULT_EMBED_COLOR
@@ -260,7 +278,10 @@ class Inventory(commands.Cog):
         else:
             # Sort by name only
             color = OCS_RARITY_MAP.get(rarity, {}).get("color", DEFAULT_EMBED_COLOR)
-            sorted_ocs = sorted(selected_cache, key=lambda oc: oc.get("card_name", ""))
+            sorted_ocs = snapshot.cached(
+                ("sorted", rarity),
+                lambda: tuple(sorted(selected_cache, key=lambda oc: oc.card_name)),
+            )
             context = f"by rarity"
         debug_log(
             f"[INVENTORY] Step: after sorting at {time.perf_counter() - start_time:.4f}s"
@@ -272,6 +293,7 @@ class Inventory(commands.Cog):
         paginator = OC_Paginator(
             bot=self.bot,
             user=interaction.user,
+            snapshot=snapshot,
             items=sorted_ocs,
             title=title,
             color=color,
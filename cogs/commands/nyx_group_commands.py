@@ -42,6 +42,11 @@ class NyxGroupCommands(commands.Cog):
         description="Commands related to Original Characters (OCs)",
     )
     nyx_group.add_command(oc_group)
+    rates_group = app_commands.Group(
+        name="rates",
+        description="Commands related to gacha rates",
+    )
+    nyx_group.add_command(rates_group)
 
     # 🎀────────────────────────────────────────────
     #              🌸 /nyx echo 🌸
@@ -214,6 +219,67 @@ class NyxGroupCommands(commands.Cog):
     view_ocs.extras = {"category": "Admin"}
 
 
+    # 🎀────────────────────────────────────────────
+    #              🌸 /nyx rates set 🌸
+    # 🎀────────────────────────────────────────────
+    @rates_group.command(
+        name="set",
+        description="Change the rate, emoji or color of a rarity live.",
+    )
+    @app_commands.describe(
+        rarity="The rarity to change.",
+        rate_percent="The new pull rate in percent, e.g. 15 for 15% (leave blank to keep unchanged).",
+        emoji="The new rarity emoji (leave blank to keep unchanged).",
+        color="The new embed color as hex, e.g. #4B69FF (leave blank to keep unchanged).",
+    )
+    async def set_rate(
+        self,
+        interaction: discord.Interaction,
+        rarity: Literal["Common", "Rare", "Epic", "Legendary"],
+        rate_percent: Optional[float] = None,
+        emoji: Optional[str] = None,
+        color: Optional[str] = None,
+    ):
+        """Changes a gacha rate without a restart."""
+        slash_cmd_name = "nyx rates set"
+
+        await run_command_safe(
+            bot=self.bot,
+            interaction=interaction,
+            slash_cmd_name=slash_cmd_name,
+            command_func=set_rate_func,
+            rarity=rarity,
+            rate_percent=rate_percent,
+            emoji=emoji,
+            color=color,
+        )
+
+    set_rate.extras = {"category": "Admin"}
+
+    # 🎀────────────────────────────────────────────
+    #              🌸 /nyx rates view 🌸
+    # 🎀────────────────────────────────────────────
+    @rates_group.command(
+        name="view",
+        description="View the gacha rates currently in use.",
+    )
+    async def view_rates(
+        self,
+        interaction: discord.Interaction,
+    ):
+        """Shows the current gacha rates."""
+        slash_cmd_name = "nyx rates view"
+
+        await run_command_safe(
+            bot=self.bot,
+            interaction=interaction,
+            slash_cmd_name=slash_cmd_name,
+            command_func=view_rates_func,
+        )
+
+    view_rates.extras = {"category": "Admin"}
+
+
 async def setup(bot: commands.Bot):
     """Sets up the NyxGroupCommands cog."""
     await bot.add_cog(NyxGroupCommands(bot))
@@ -1,29 +1,64 @@
 import discord
 from discord.ext import commands
 
-from utils.listener_func.gacha import gacha_pull
+from config.gacha import GACHA_CHANNEL_IDS, MAX_MULTI_PULL
+from utils.essentials.recent_ids import recent_gacha_messages
+from utils.listener_func.gacha_cooldown import GachaCooldown
+from utils.listener_func.gacha_queue import GachaWorkQueue
+from utils.listener_func.message_router import MessageRouter
 from utils.logs.pretty_log import pretty_log
 
 
 class MessageCreateListener(commands.Cog):
     def __init__(self, bot: commands.Bot):
         self.bot = bot
+        self.gacha_queue = GachaWorkQueue(bot)
+        self.gacha_cooldown = GachaCooldown()
+        self.router = MessageRouter(prefix=".")
+        self.router.register(
+            "gacha", self.handle_gacha, channel_allowlist=GACHA_CHANNEL_IDS
+        )
 
-    @commands.Cog.listener()
-    async def on_message(self, message: discord.Message):
+    async def handle_gacha(self, message: discord.Message, args: str):
+        """Handles ".gacha" and ".gacha N"."""
+        # The same message can be delivered twice, only the first one pulls
+        if not recent_gacha_messages.add(message.id):
+            pretty_log(
+                tag="skip",
+                message=f"Ignoring repeated gacha message ID {message.id}.",
+            )
+            return
+
+        count = 1
+        if args:
+            if not args.isdigit():
+                return
+            count = max(1, min(int(args), MAX_MULTI_PULL))
 
-        # Ignore messages from the bot itself and other bots
-        if message.author.bot:
+        # Throttled users get a cooldown reply and never reach the queue
+        if not await self.gacha_cooldown.check(message, cost=count):
             return
 
-        # Simple command check
-        if message.content.lower() == ".gacha":
-            pretty_log(
-                tag="info",
-                message=f"Received gacha command from user {message.author} ({message.author.id})",
-            )
-            # Call your gacha function here
-            await gacha_pull(self.bot, message)
+        pretty_log(
+            tag="info",
+            message=f"Received gacha command (x{count}) from user {message.author} ({message.author.id})",
+        )
+        if not await self.gacha_queue.submit(message, count):
+            # Shed with a busy reply, the pull never ran so it costs nothing
+            self.gacha_cooldown.refund(message, cost=count)
+
+    async def cog_load(self):
+        self.gacha_cooldown.start()
+        self.gacha_queue.start()
+
+    async def cog_unload(self):
+        await self.gacha_queue.stop()
+        self.gacha_cooldown.stop()
+
+    @commands.Cog.listener()
+    async def on_message(self, message: discord.Message):
+        # Bots, non-prefix messages and other channels are rejected inside the router
+        await self.router.route(message)
 
 
 async def setup(bot: commands.Bot):
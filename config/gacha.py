@@ -0,0 +1,101 @@
+# Gacha Settings
+
+# Maximum number of pulls in a single `.gacha N` message.
+# Discord allows at most 10 embeds per message, one embed per pull.
+MAX_MULTI_PULL = 10
+
+# Inventory write-behind buffer.
+# When enabled, pulls update the inventory cache right away and are written
+# to Postgres in batches instead of awaiting a DB write per pull.
+INV_WRITE_BEHIND = True
+INV_FLUSH_INTERVAL_SECONDS = 5
+INV_FLUSH_MAX_PENDING = 500
+INV_JOURNAL_PATH = "data/inv_write_journal.jsonl"
+# Committed batch IDs are kept this long so a retried batch is recognised.
+# A .flushing file left on disk for longer than this would be applied twice.
+INV_FLUSH_BATCH_RETENTION_DAYS = 30
+# Journal appends are synced to disk in a background thread this often (group
+# commit), so the event loop never waits on the disk. Pulls made in the last
+# interval before a power loss or OS crash can be lost; a bot crash loses
+# nothing. 0 leaves syncing to the OS.
+INV_JOURNAL_FSYNC_INTERVAL_MS = 200
+
+# Number of asyncio locks shared by all users for inventory changes.
+# Each user always maps to the same lock; more stripes means fewer unrelated users waiting on each other.
+USER_INV_LOCK_STRIPES = 64
+
+# Channels where .gacha may be used, per guild: {guild_id: [channel_id, ...]}
+# Guilds that are not listed allow .gacha in every channel.
+GACHA_CHANNEL_IDS: dict[int, list[int]] = {}
+
+# Gacha work queue.
+# A fixed pool of workers runs pulls, keeping below the Postgres pool size (10).
+# Once GACHA_QUEUE_HIGH_WATER pulls are waiting, new ones get a "busy" reply instead.
+GACHA_WORKERS = 8
+GACHA_QUEUE_HIGH_WATER = 200
+# Queue metrics are logged this often, skipped while the queue is idle
+GACHA_QUEUE_METRICS_INTERVAL_SECONDS = 300
+# On shutdown queued pulls get this long to finish before the workers are cancelled
+GACHA_QUEUE_DRAIN_TIMEOUT_SECONDS = 30
+
+# Single-pull results for one channel that land within this window are sent as one message.
+GACHA_REPLY_WINDOW_SECONDS = 0.3
+
+# Gacha cooldowns (token buckets). Each pull costs one token, `.gacha N` costs N.
+# Users hold up to GACHA_USER_BUCKET_CAPACITY tokens and regain GACHA_USER_REFILL_PER_SECOND per second.
+GACHA_USER_BUCKET_CAPACITY = 10
+GACHA_USER_REFILL_PER_SECOND = 1 / 6
+# Shared budget for a whole guild
+GACHA_GUILD_BUCKET_CAPACITY = 120
+GACHA_GUILD_REFILL_PER_SECOND = 2
+# A throttled user gets at most one cooldown reply per this many seconds
+GACHA_COOLDOWN_REPLY_INTERVAL = 10
+# Bucket state is saved here so a restart does not reset cooldowns
+GACHA_COOLDOWN_STATE_PATH = "data/gacha_cooldowns.json"
+GACHA_COOLDOWN_SAVE_INTERVAL_SECONDS = 60
+
+# Recently handled .gacha message IDs kept in memory.
+# A message delivered twice (e.g. after a gateway RESUME) is dropped before any work is done.
+GACHA_RECENT_MESSAGE_IDS = 10_000
+
+# Pull history (gacha_pulls table).
+# Pulls are buffered in memory and written with COPY once GACHA_PULL_LOG_FLUSH_ROWS
+# are waiting or every GACHA_PULL_LOG_FLUSH_MS milliseconds, whichever comes first.
+GACHA_PULL_LOG_ENABLED = True
+GACHA_PULL_LOG_FLUSH_ROWS = 500
+GACHA_PULL_LOG_FLUSH_MS = 2000
+# If Postgres is down, at most this many pulls are held for retry, oldest dropped first
+GACHA_PULL_LOG_MAX_BUFFERED = 50_000
+# History is kept forever, old months are dropped by hand with tools/drop_gacha_pulls.py
+
+# User inventory cache.
+# Lazy mode loads a user's inventory from Postgres on first access instead of
+# loading every user at startup, and drops the least recently used users once
+# either limit is reached (0 = no limit). Limits only apply in lazy mode.
+INV_CACHE_LAZY = True
+INV_CACHE_MAX_USERS = 20_000
+INV_CACHE_MAX_BYTES = 256 * 1024 * 1024
+
+# Cache sync between bot processes.
+# Triggers on ocs and user_oc_inv NOTIFY every change, and a dedicated listener
+# connection applies changes made by other processes (or by hand in SQL) to
+# this process's caches. After the listener reconnects, notifications may
+# have been missed, so the caches are reloaded.
+CACHE_SYNC_ENABLED = True
+# The listener connection is checked this often, so a dead socket is noticed
+CACHE_SYNC_PING_SECONDS = 30
+CACHE_SYNC_RECONNECT_MAX_SECONDS = 60
+# Inventory notifications are gathered this long before the users are reloaded
+CACHE_SYNC_USER_RELOAD_DELAY_MS = 250
+
+# Disk snapshot of the OC catalog and inventory caches.
+# Saved every CACHE_SNAPSHOT_INTERVAL_SECONDS and on shutdown. On the first
+# cache load after a restart the snapshot is read back and only rows changed
+# since it was saved are fetched. Older snapshots are ignored.
+CACHE_SNAPSHOT_ENABLED = True
+CACHE_SNAPSHOT_PATH = "data/cache_snapshot.bin"
+CACHE_SNAPSHOT_INTERVAL_SECONDS = 300
+CACHE_SNAPSHOT_MAX_AGE_HOURS = 24 * 7
+# The watermark is set this far before the save, so rows from transactions
+# still open at save time are fetched again on the next start
+CACHE_SNAPSHOT_WATERMARK_SLACK_SECONDS = 300
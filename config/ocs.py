@@ -1,4 +1,4 @@
-import random
+import re
 
 from .aesthetic import Emojis
 
@@ -29,12 +29,28 @@ OCS_RARITY_MAP = {
 }
 
 
+# Optional per-OC pull weights inside a rarity (e.g. a rate-up banner).
+# OCs not listed here have a weight of 1.0; a weight of 0 removes the OC from the pool.
+OC_PULL_WEIGHTS: dict[str, float] = {}
+
+
 OC_NAMES = ["Kae", "Cherry", "Kiara", "Lyra", "Melissa", "Mika", "Skye", "Dolly", "Nyx"]
 
 
-def determine_is_skin(name: str) -> bool:
+# Single compiled matcher for every base OC name, longest first so overlapping names prefer the longer one
+_OC_NAME_PATTERN = re.compile(
+    "|".join(re.escape(oc) for oc in sorted(OC_NAMES, key=len, reverse=True))
+)
+
+
+def resolve_base_character(name: str) -> str | None:
+    """Returns the base OC a skin belongs to, or None if the name is not a skin."""
     stripped = name.strip()
-    for oc in OC_NAMES:
-        if oc in stripped and stripped != oc:
-            return True
-    return False
+    for match in _OC_NAME_PATTERN.finditer(stripped):
+        if match.group() != stripped:
+            return match.group()
+    return None
+
+
+def determine_is_skin(name: str) -> bool:
+    return resolve_base_character(name) is not None
@@ -2,6 +2,8 @@ from .ocs.create import create_oc_func
 from .ocs.edit import edit_oc_func
 from .ocs.remove import remove_oc_func
 from .ocs.view import view_ocs_func
+from .rates.set import set_rate_func
+from .rates.view import view_rates_func
 from .top_level.echo import echo_func
 __all__ = [
     "echo_func",
@@ -9,4 +11,6 @@ __all__ = [
     "edit_oc_func",
     "remove_oc_func",
     "view_ocs_func",
+    "set_rate_func",
+    "view_rates_func",
 ]
@@ -3,7 +3,7 @@ from discord import app_commands
 from discord.ext import commands
 
 from config.ocs import OCS_RARITY_MAP
-from utils.cache.cache_list import ocs_cache
+from utils.cache.cache_list import oc_catalog
 from utils.db.ocs_db import upsert_oc
 from utils.logs.pretty_log import pretty_log
 from utils.logs.send_log_embed import send_log_embed
@@ -23,9 +23,10 @@ async def create_oc_func(
     loader = await pretty_defer(
         interaction=interaction, content="Creating OC...", ephemeral=False
     )
-    # Check if OC already exists in cache
-    if name in ocs_cache:
-        await loader.error(content=f"OC '{name}' already exists!")
+    # Check if OC already exists in cache, names only differing in case count as the same OC
+    existing = oc_catalog.find(name)
+    if existing:
+        await loader.error(content=f"OC '{existing.name}' already exists!")
         return
 
     # Insert OC into database
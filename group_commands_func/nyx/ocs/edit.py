@@ -22,17 +22,17 @@ async def edit_oc_func(
 ):
     """Edits an existing OC entry in the database."""
     # Always import the cache inside the function to avoid stale cache issues
-    from utils.cache.cache_list import ocs_cache
+    from utils.cache.cache_list import oc_catalog
 
-    debug_log(f"Current OC cache contents: {ocs_cache}")
+    debug_log(f"Current OC cache size: {len(oc_catalog)}")
     # Defer the interaction to allow for processing time
     loader = await pretty_defer(
         interaction=interaction, content="Editing OC...", ephemeral=False
     )
 
-    # Find OC in cache (ocs_cache is a list of dicts)
-    oc_entry = next((oc for oc in ocs_cache if name in oc), None)
-    if not oc_entry:
+    # Find OC in cache
+    oc = oc_catalog.get(name)
+    if not oc:
         debug_log(f"OC '{name}' does not exist in cache.")
         await loader.error(content=f"OC '{name}' does not exist!")
         return
@@ -43,11 +43,10 @@ async def edit_oc_func(
         return
 
     # Fetch old info for embed
-    old_oc_info = oc_entry.get(name, {})
-    old_rarity = old_oc_info.get("rarity", "Unknown")
+    old_rarity = oc.rarity or "Unknown"
     old_rarity_emoji = OCS_RARITY_MAP.get(old_rarity, {}).get("emoji", "")
-    old_image_link = old_oc_info.get("image_link", "")
-    old_character_info = old_oc_info.get("character_info", "")
+    old_image_link = oc.image_link or ""
+    old_character_info = oc.character_info or ""
     # Edit OC in database
     await edit_oc(
         bot,
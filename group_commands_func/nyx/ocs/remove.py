@@ -18,25 +18,24 @@ async def remove_oc_func(
 ):
     """Removes an OC entry from the database."""
     # Always import the cache inside the function to avoid stale cache issues
-    from utils.cache.cache_list import ocs_cache
+    from utils.cache.cache_list import oc_catalog
 
     # Defer the interaction to allow for processing time
     loader = await pretty_defer(
         interaction=interaction, content="Removing OC...", ephemeral=False
     )
-    # Find OC in cache (ocs_cache is a list of dicts)
-    oc_entry = next((oc for oc in ocs_cache if name in oc), None)
-    if not oc_entry:
+    # Find OC in cache
+    oc = oc_catalog.get(name)
+    if not oc:
         debug_log(f"OC '{name}' does not exist in cache.")
         await loader.error(content=f"OC '{name}' does not exist!")
         return
 
     # Get info for embed before removal
-    oc_info = oc_entry.get(name, {})
-    rarity = oc_info.get("rarity", "Unknown")
+    rarity = oc.rarity or "Unknown"
     rarity_color = OCS_RARITY_MAP.get(rarity, {}).get("color", 0xFFFFFF)
     rarity_emoji = OCS_RARITY_MAP.get(rarity, {}).get("emoji", "")
-    image_link = oc_info.get("image_link", "")
+    image_link = oc.image_link or ""
 
     embed = discord.Embed(
         title="OC Removed Successfully!",
@@ -12,12 +12,15 @@ from utils.visuals.pretty_defer import pretty_defer
 #enable_debug(f"{__name__}.get_embed")
 
 
+# The paginator holds the catalog snapshot it was opened on, so edits made
+# while it is open do not shift its pages. Page text is rendered once per page.
 class OC_Paginator(View):
 
     def __init__(
         self,
         bot,
         user,
+        snapshot,
         items,
         title,
         color,
@@ -29,6 +32,7 @@ class OC_Paginator(View):
         super().__init__(timeout=timeout)
         self.bot = bot
         self.user = user
+        self.snapshot = snapshot
         self.items = items
         self.title = title
         self.color = color
@@ -38,6 +42,7 @@ class OC_Paginator(View):
         self.page = 0
         self.max_page = (len(items) - 1) // per_page + 1
         self.message: discord.Message | None = None  # Store the message object
+        self._descriptions: dict[int, str] = {}
 
         # If only one page, disable buttons
         if self.max_page == 0:
@@ -86,35 +91,35 @@ class OC_Paginator(View):
 
         title = self.title
 
-        desc_lines = []
-        for idx, oc in enumerate(page_items):
-            # oc is a dict with a single key (the OC name)
-            oc_name = list(oc.keys())[0]
-            info = oc[oc_name]
-            # Always get rarity from info for each OC
-            oc_rarity = info.get("rarity", self.initial_rarity or "Unknown")
-            rarity_emoji = OCS_RARITY_MAP.get(oc_rarity, {}).get("emoji", "")
-            image_link = info.get("image_link", "No Image")
-            number = start + idx + 1
-            display_name = oc_name.title()
-            name_str = f"{number}. {rarity_emoji} [{display_name}]({image_link})"
-            desc_lines.append(name_str)
-
-        description = "\n".join(desc_lines)
+        description = self._descriptions.get(self.page)
+        if description is None:
+            desc_lines = []
+            for idx, oc in enumerate(page_items):
+                # oc is an OCRecord from the catalog
+                oc_rarity = oc.rarity or self.initial_rarity or "Unknown"
+                rarity_emoji = OCS_RARITY_MAP.get(oc_rarity, {}).get("emoji", "")
+                image_link = oc.image_link or "No Image"
+                number = start + idx + 1
+                display_name = oc.name.title()
+                name_str = f"{number}. {rarity_emoji} [{display_name}]({image_link})"
+                desc_lines.append(name_str)
+
+            description = self._descriptions[self.page] = "\n".join(desc_lines)
         embed = discord.Embed(
             title=title,
             color=self.color,
             description=description,
         )
-        from utils.cache.ocs_cache import (
-            get_overall_count_str,
-            get_total_count_by_rarity,
-        )
+        snapshot = self.snapshot
 
         pretty_log(tag="info", message=f"Context = {self.context}")
         # Footer logic: always show rarity emoji and count if specific rarity, else show detailed count string
         if self.initial_rarity == "All":
-            count_str = get_overall_count_str()
+            counts = {rarity: snapshot.count(rarity) for rarity in OCS_RARITY_MAP}
+            count_str = " | ".join(
+                f"{rarity}: {count}" for rarity, count in counts.items()
+            )
+            count_str = f"{count_str} | Total: {sum(counts.values())}"
             pretty_log(tag="info", message=f"Footer count string: {count_str}")
             debug_log(f"Footer count string: {count_str}")
             footer_text = f"Page {self.page + 1} of {self.max_page} | {count_str}"
@@ -126,7 +131,7 @@ class OC_Paginator(View):
 
             rarity = self.initial_rarity or "Unknown"
             rarity_emoji = OCS_RARITY_MAP.get(rarity, {}).get("emoji", "")
-            total_count = get_total_count_by_rarity(rarity)
+            total_count = snapshot.count(rarity)
             footer_text = f"Page {self.page + 1} of {self.max_page} | {rarity_emoji} {total_count} {rarity} OCs"
         embed.set_footer(text=footer_text)
         return embed
@@ -151,7 +156,7 @@ async def view_ocs_func(
     """Function to view all OCs or OCs by rarity."""
 
     debug_log(f"view_ocs_func called with rarity: {rarity}")
-    debug_log(f"Initial ocs_cache length: {len(cache_list.ocs_cache)}")
+    debug_log(f"Initial oc_catalog length: {len(cache_list.oc_catalog)}")
     debug_log(
         f"User: {getattr(interaction.user, 'id', None)} | {getattr(interaction.user, 'display_name', None)}"
     )
@@ -166,26 +171,21 @@ async def view_ocs_func(
         context = f"{rarity} OCs"
 
     # Check if cache is populated, if not load it
-    if not cache_list.ocs_cache:
+    if not cache_list.oc_catalog:
         debug_log("OCs cache is empty, loading cache...")
         from utils.cache.ocs_cache import load_ocs_cache
 
         await load_ocs_cache(bot)
 
+    # Everything below reads this one version of the catalog
+    snapshot = cache_list.oc_catalog.snapshot()
+
     # Determine which cache to use based on rarity
-    if rarity == "Common":
-        selected_cache = cache_list.common_ocs_cache
-        title = "Common Rarity OCs"
-    elif rarity == "Rare":
-        selected_cache = cache_list.rare_ocs_cache
-        title = "Rare Rarity OCs"
-    elif rarity == "Epic":
-        selected_cache = cache_list.epic_ocs_cache
-        title = "Epic Rarity OCs"
-    elif rarity == "Legendary OCs":
-        selected_cache = cache_list.legendary_ocs_cache
+    if rarity in OCS_RARITY_MAP:
+        selected_cache = snapshot.by_rarity(rarity)
+        title = f"{rarity} Rarity OCs"
     else:
-        selected_cache = cache_list.ocs_cache
+        selected_cache = snapshot.records
         title = "All OCs"
         context = "all OCs"
 
@@ -208,18 +208,16 @@ async def view_ocs_func(
         debug_log(f"Rarity order mapping: {rarity_order}")
 
         def get_rarity_and_name(oc):
-            oc_name = list(oc.keys())[0]
-            info = oc[oc_name]
-            rarity = str(info.get("rarity", "")).strip().title()
-            return (rarity_order.get(rarity, 99), oc_name.lower())
+            return (rarity_order.get(oc.rarity, 99), oc.name.lower())
 
-        sorted_ocs = sorted(selected_cache, key=get_rarity_and_name)
+        sorted_ocs = snapshot.cached(
+            ("sorted", None),
+            lambda: tuple(sorted(selected_cache, key=get_rarity_and_name)),
+        )
         # Debug: print the rarity and name order for ALL sorted OCs
         debug_log("--- FULL SORTED ORDER ---")
         for oc in sorted_ocs:
-            oc_name = list(oc.keys())[0]
-            info = oc[oc_name]
-            debug_log(f"SORTED: {info.get('rarity')} - {oc_name}")
+            debug_log(f"SORTED: {oc.rarity} - {oc.name}")
         debug_log("--- END FULL SORTED ORDER ---")
         import sys
 
@@ -231,10 +229,13 @@ async def view_ocs_func(
         debug_log(f"Sorting OCs by name for rarity: {rarity}")
 
         def get_oc_name(oc):
-            return list(oc.keys())[0]
+            return oc.name
 
         color = OCS_RARITY_MAP.get(rarity, {}).get("color", DEFAULT_EMBED_COLOR)
-        sorted_ocs = sorted(selected_cache, key=get_oc_name)
+        sorted_ocs = snapshot.cached(
+            ("sorted", rarity),
+            lambda: tuple(sorted(selected_cache, key=get_oc_name)),
+        )
         context = f"by rarity"
 
     debug_log(f"Sorted OCs length: {len(sorted_ocs)}")
@@ -244,6 +245,7 @@ async def view_ocs_func(
     paginator = OC_Paginator(
         bot=bot,
         user=interaction.user,
+        snapshot=snapshot,
         items=sorted_ocs,
         title=title,
         color=color,
@@ -0,0 +1,94 @@
+import discord
+from discord.ext import commands
+
+from config.ocs import OCS_RARITY_MAP
+from utils.cache.gacha_rates_cache import update_gacha_rate
+from utils.logs.pretty_log import pretty_log
+from utils.logs.send_log_embed import send_log_embed
+from utils.visuals.pretty_defer import pretty_defer
+
+
+async def set_rate_func(
+    bot: commands.Bot,
+    interaction: discord.Interaction,
+    rarity: str,
+    rate_percent: float | None = None,
+    emoji: str | None = None,
+    color: str | None = None,
+):
+    """Changes the rate, emoji or color of a rarity live."""
+    loader = await pretty_defer(
+        interaction=interaction, content="Updating gacha rates...", ephemeral=False
+    )
+
+    if rate_percent is None and emoji is None and color is None:
+        await loader.error(content="No new information provided to update!")
+        return
+
+    if rate_percent is not None and not 0 <= rate_percent <= 100:
+        await loader.error(content="Rate must be between 0 and 100 percent.")
+        return
+
+    color_value = None
+    if color is not None:
+        try:
+            color_value = int(color.strip().lstrip("#").removeprefix("0x"), 16)
+        except ValueError:
+            await loader.error(content=f"'{color}' is not a valid hex color.")
+            return
+
+    old_info = dict(OCS_RARITY_MAP.get(rarity, {}))
+    try:
+        version = await update_gacha_rate(
+            bot,
+            rarity=rarity,
+            rate=rate_percent / 100 if rate_percent is not None else None,
+            emoji=emoji,
+            color=color_value,
+            updated_by=str(interaction.user),
+        )
+    except ValueError as e:
+        await loader.error(content=str(e))
+        return
+    if version is None:
+        await loader.error(content="Could not save the new rates. Please try again.")
+        return
+
+    new_info = OCS_RARITY_MAP[rarity]
+    embed = discord.Embed(
+        title=f"Gacha Rates Updated (v{version})",
+        description=f"**Rarity:** {new_info['emoji']} {rarity}\n",
+        color=new_info["color"],
+    )
+    if rate_percent is not None:
+        embed.add_field(
+            name="Rate Updated",
+            value=f"{old_info.get('rate', 0) * 100:g}% → {new_info['rate'] * 100:g}%",
+            inline=False,
+        )
+    if emoji is not None:
+        embed.add_field(
+            name="Emoji Updated",
+            value=f"{old_info.get('emoji', '')} → {new_info['emoji']}",
+            inline=False,
+        )
+    if color is not None:
+        embed.add_field(
+            name="Color Updated",
+            value=f"#{old_info.get('color', 0):06X} → #{new_info['color']:06X}",
+            inline=False,
+        )
+    embed.set_author(
+        name=interaction.user.display_name, icon_url=interaction.user.display_avatar.url
+    )
+    await loader.success(embed=embed, content="")
+    pretty_log(
+        tag="info",
+        message=f"Gacha rates for '{rarity}' updated to version {version} by {interaction.user}.",
+    )
+
+    # Send log embed to bot log channel
+    await send_log_embed(
+        bot=bot,
+        embed=embed,
+    )
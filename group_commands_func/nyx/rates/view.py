@@ -0,0 +1,36 @@
+import discord
+from discord.ext import commands
+
+import utils.cache.cache_list as cache_list
+from config.ocs import OCS_RARITY_MAP
+from config.setup import DEFAULT_EMBED_COLOR
+from utils.visuals.pretty_defer import pretty_defer
+
+
+async def view_rates_func(
+    bot: commands.Bot,
+    interaction: discord.Interaction,
+):
+    """Shows the gacha rates currently in use."""
+    loader = await pretty_defer(
+        interaction=interaction, content="Fetching gacha rates...", ephemeral=True
+    )
+
+    total = sum(info["rate"] for info in OCS_RARITY_MAP.values())
+    lines = []
+    for rarity, info in OCS_RARITY_MAP.items():
+        effective = info["rate"] / total * 100 if total else 0
+        lines.append(
+            f"{info['emoji']} **{rarity}**: {info['rate'] * 100:g}% "
+            f"(effective {effective:.4g}%) | #{info['color']:06X}"
+        )
+    version = cache_list.gacha_rates_version
+    embed = discord.Embed(
+        title="Current Gacha Rates",
+        description="\n".join(lines),
+        color=DEFAULT_EMBED_COLOR,
+    )
+    embed.set_footer(
+        text=f"Version {version}" if version else "Hard-coded defaults"
+    )
+    await loader.success(embed=embed, content="")
@@ -7,6 +7,11 @@ import discord
 from discord.ext import commands
 
 from utils.cache.central_cache_loader import load_all_cache
+from utils.cache.disk_snapshot import cache_snapshotter
+from utils.db.cache_sync import cache_sync
+from utils.db.gacha_pull_log import gacha_pull_log
+from utils.db.inv_write_buffer import inv_write_buffer
+from utils.listener_func.reply_coalescer import gacha_reply_coalescer
 from utils.db.get_pg_pool import *
 from utils.logs.pretty_log import pretty_log, set_bot
 
@@ -45,6 +50,16 @@ async def on_command_error(ctx, error):
         return  # Ignore CommandNotFound errors
 
 
+# ╭───────────────────────────────╮
+#   ⭐ On Message Event
+# ╰───────────────────────────────╯
+@bot.event
+async def on_message(message):
+    # Prefix messages are routed by MessageCreateListener, there are no text commands,
+    # so skip the default process_commands parse of every message
+    return
+
+
 # ╭───────────────────────────────╮
 #   ⭐ On Ready Event
 # ╰───────────────────────────────╯
@@ -71,6 +86,30 @@ async def setup_hook():
     except Exception as e:
         pretty_log("critical", f"Postgres connection failed: {e}", include_trace=True)
 
+    # ❀ Replay journaled inventory writes and start the flush timer ❀
+    try:
+        await inv_write_buffer.start(bot)
+    except Exception as e:
+        pretty_log("error", f"Inventory write buffer failed to start: {e}", include_trace=True)
+
+    # ❀ Create pull history partitions and start the COPY batcher ❀
+    try:
+        await gacha_pull_log.start(bot)
+    except Exception as e:
+        pretty_log("error", f"Gacha pull history batcher failed to start: {e}", include_trace=True)
+
+    # ❀ Listen for cache changes made by other processes ❀
+    try:
+        await cache_sync.start(bot)
+    except Exception as e:
+        pretty_log("error", f"Cache sync listener failed to start: {e}", include_trace=True)
+
+    # ❀ Save the caches to disk on a timer for fast restarts ❀
+    try:
+        await cache_snapshotter.start(bot)
+    except Exception as e:
+        pretty_log("error", f"Cache snapshot timer failed to start: {e}", include_trace=True)
+
     # ❀ Load all cogs ❀
     for cog_path in glob.glob("cogs/**/*.py", recursive=True):
         if os.path.basename(cog_path) == "__init__.py":
@@ -86,6 +125,46 @@ async def setup_hook():
             pretty_log("error", f"Failed to load {cog_name}: {e}", include_trace=True)
 
 
+# ╭───────────────────────────────╮
+#   ⭐ Shutdown
+# ╰───────────────────────────────╯
+async def shutdown():
+    # ❀ Unload cogs first, the gacha queue finishes queued pulls on unload ❀
+    for extension in list(bot.extensions):
+        try:
+            await bot.unload_extension(extension)
+        except Exception as e:
+            pretty_log("error", f"Failed to unload {extension}: {e}", include_trace=True)
+
+    # ❀ Send gacha replies still waiting in the coalescer ❀
+    await gacha_reply_coalescer.flush_all()
+
+    # ❀ Flush buffered inventory writes before the pool goes away ❀
+    try:
+        await inv_write_buffer.stop()
+    except Exception as e:
+        pretty_log("error", f"Failed to flush inventory write buffer: {e}", include_trace=True)
+
+    try:
+        await gacha_pull_log.stop()
+    except Exception as e:
+        pretty_log("error", f"Failed to flush gacha pull history: {e}", include_trace=True)
+
+    # ❀ Save the caches for the next start, then stop listening ❀
+    try:
+        await cache_snapshotter.stop()
+    except Exception as e:
+        pretty_log("error", f"Failed to save cache snapshot: {e}", include_trace=True)
+
+    try:
+        await cache_sync.stop()
+    except Exception as e:
+        pretty_log("error", f"Failed to stop cache sync listener: {e}", include_trace=True)
+
+    if not bot.is_closed():
+        await bot.close()
+
+
 # ╭───────────────────────────────╮
 #   ⭐ Main Async Runner
 # ╰───────────────────────────────╯
@@ -97,8 +176,9 @@ async def main():
     while True:
         try:
             await bot.start(os.getenv("DISCORD_TOKEN"))
-        except KeyboardInterrupt:
+        except (KeyboardInterrupt, asyncio.CancelledError):
             pretty_log("ready", "Shutting down Nyx Bot...")
+            await shutdown()
             break
         except Exception as e:
             pretty_log("error", f"Bot crashed: {e}", include_trace=True)
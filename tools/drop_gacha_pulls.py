@@ -0,0 +1,64 @@
+"""
+Gacha pull history cleanup.
+
+Lists the monthly gacha_pulls partitions older than the months to keep, and
+drops them with --drop. The bot itself never removes pull history, this is
+the only thing that does. Without --drop nothing is changed.
+
+Run from the repo root:
+    python -m tools.drop_gacha_pulls --keep-months 12
+    python -m tools.drop_gacha_pulls --keep-months 12 --drop --dsn postgresql://localhost/nyx
+"""
+
+import argparse
+import asyncio
+import datetime
+import os
+import sys
+
+
+class _Bot:
+    def __init__(self, pool):
+        self.pg_pool = pool
+
+
+async def run(dsn: str, keep_months: int, drop: bool) -> list[str]:
+    import asyncpg
+
+    from utils.db.gacha_pulls_db import drop_gacha_pulls_partitions_before, months_before
+
+    today = datetime.datetime.now(datetime.timezone.utc).date()
+    cutoff = months_before(today, keep_months)
+    pool = await asyncpg.create_pool(dsn=dsn, min_size=1, max_size=1)
+    try:
+        names = await drop_gacha_pulls_partitions_before(
+            _Bot(pool), cutoff, dry_run=not drop
+        )
+    finally:
+        await pool.close()
+
+    print(f"Keeping {cutoff:%Y-%m} onwards ({keep_months} months before this one).")
+    if not names:
+        print("No older partitions.")
+    for name in names:
+        print(f"{'Dropped' if drop else 'Would drop'}  {name}")
+    if names and not drop:
+        print("Run again with --drop to drop them.")
+    return names
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Drop old monthly gacha_pulls partitions.")
+    parser.add_argument("--keep-months", type=int, required=True, help="Full months to keep before the current one.")
+    parser.add_argument("--drop", action="store_true", help="Drop the partitions instead of only listing them.")
+    parser.add_argument("--dsn", default=os.getenv("DATABASE_URL"), help="Postgres DSN, defaults to DATABASE_URL.")
+    args = parser.parse_args(argv)
+    if not args.dsn:
+        sys.exit("drop_gacha_pulls needs --dsn or DATABASE_URL")
+    if args.keep_months < 1:
+        sys.exit("--keep-months must be at least 1")
+    asyncio.run(run(args.dsn, args.keep_months, args.drop))
+
+
+if __name__ == "__main__":
+    main()
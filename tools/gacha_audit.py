@@ -0,0 +1,281 @@
+"""
+Offline gacha rate audit and throughput benchmark.
+
+Simulates millions of pulls against OCS_RARITY_MAP (and OC_PULL_WEIGHTS)
+with NumPy batch sampling, then reports observed vs configured rates,
+per-batch variance and the pulls-to-Legendary distribution. It also times
+the live pull paths against the vectorized sampler.
+
+Run from the repo root:
+    python -m tools.gacha_audit
+    python -m tools.gacha_audit --pulls 20000000 --catalog ocs_snapshot.json
+
+Needs NumPy (pip install numpy), which the bot itself does not.
+The catalog snapshot is a JSON list of {"name": str, "rarity": str} rows,
+e.g. an export of the ocs table. Without one a synthetic catalog is used.
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    sys.exit("gacha_audit needs NumPy: pip install numpy")
+
+from config.ocs import OC_PULL_WEIGHTS, OCS_RARITY_MAP
+
+RARITIES = list(OCS_RARITY_MAP.keys())
+
+
+# ╭───────────────────────────────╮
+#   ⭐ Catalog
+# ╰───────────────────────────────╯
+def load_catalog(path: str | None, per_rarity: int) -> dict[str, list[str]]:
+    """Returns OC names grouped by rarity, from a JSON snapshot or synthetic."""
+    catalog = {rarity: [] for rarity in RARITIES}
+    if path:
+        with open(path, "r", encoding="utf-8") as f:
+            rows = json.load(f)
+        for row in rows:
+            rarity = str(row["rarity"]).strip().title()
+            if rarity in catalog:
+                catalog[rarity].append(row["name"])
+        return catalog
+
+    for rarity in RARITIES:
+        catalog[rarity] = [f"{rarity} OC {i + 1}" for i in range(per_rarity)]
+    return catalog
+
+
+def configured_rates() -> dict[str, float]:
+    """Rarity rates as the pull actually applies them (normalized to sum to 1)."""
+    total = sum(info["rate"] for info in OCS_RARITY_MAP.values())
+    return {rarity: OCS_RARITY_MAP[rarity]["rate"] / total for rarity in RARITIES}
+
+
+def outcome_table(catalog: dict[str, list[str]]):
+    """Flattens the catalog into (rarity index, OC name) outcomes with weights,
+    using the same weighting as the live alias sampler."""
+    rarity_idx = []
+    names = []
+    weights = []
+    for r_idx, rarity in enumerate(RARITIES):
+        rate = OCS_RARITY_MAP[rarity]["rate"]
+        if rate <= 0:
+            continue
+        oc_weights = [max(OC_PULL_WEIGHTS.get(name, 1.0), 0.0) for name in catalog[rarity]]
+        total_oc_weight = sum(oc_weights)
+        if total_oc_weight <= 0:
+            rarity_idx.append(r_idx)
+            names.append(None)
+            weights.append(rate)
+            continue
+        for name, oc_weight in zip(catalog[rarity], oc_weights):
+            if oc_weight <= 0:
+                continue
+            rarity_idx.append(r_idx)
+            names.append(name)
+            weights.append(rate * oc_weight / total_oc_weight)
+    weights = np.asarray(weights, dtype=np.float64)
+    cdf = np.cumsum(weights / weights.sum())
+    cdf[-1] = 1.0
+    return np.asarray(rarity_idx, dtype=np.int8), names, cdf
+
+
+# ╭───────────────────────────────╮
+#   ⭐ Simulation
+# ╰───────────────────────────────╯
+def simulate(catalog, pulls: int, batch_size: int, seed: int | None):
+    """Simulates pulls in batches. Returns per-batch rarity counts, the
+    pulls-to-Legendary gaps and per-OC counts."""
+    rarity_of, names, cdf = outcome_table(catalog)
+    rng = np.random.default_rng(seed)
+    legendary_idx = RARITIES.index("Legendary")
+
+    batch_counts = []
+    oc_counts = np.zeros(len(names), dtype=np.int64)
+    gaps = []
+    since_legendary = 0
+
+    remaining = pulls
+    while remaining > 0:
+        size = min(batch_size, remaining)
+        outcomes = np.searchsorted(cdf, rng.random(size), side="right")
+        rarities = rarity_of[outcomes]
+        batch_counts.append(np.bincount(rarities, minlength=len(RARITIES)))
+        oc_counts += np.bincount(outcomes, minlength=len(names))
+
+        # Pulls needed to hit each Legendary, carried across batch boundaries
+        hits = np.flatnonzero(rarities == legendary_idx) + 1
+        if hits.size:
+            batch_gaps = np.diff(hits, prepend=0)
+            batch_gaps[0] += since_legendary
+            gaps.append(batch_gaps)
+            since_legendary = size - hits[-1]
+        else:
+            since_legendary += size
+        remaining -= size
+
+    gaps = np.concatenate(gaps) if gaps else np.zeros(0, dtype=np.int64)
+    return np.vstack(batch_counts), gaps, names, oc_counts
+
+
+# ╭───────────────────────────────╮
+#   ⭐ Reports
+# ╰───────────────────────────────╯
+def report_rates(batch_counts, batch_size: int):
+    rates = configured_rates()
+    totals = batch_counts.sum(axis=0)
+    n = int(totals.sum())
+    full_batches = batch_counts[batch_counts.sum(axis=1) == batch_size]
+
+    print(f"\n== Observed vs configured rates ({n:,} pulls) ==")
+    print(
+        f"{'Rarity':<10} {'Count':>12} {'Observed':>11} {'Configured':>11} "
+        f"{'Diff':>10} {'z':>7} {'Batch var':>11} {'Expected var':>13}"
+    )
+    for i, rarity in enumerate(RARITIES):
+        p = rates[rarity]
+        observed = totals[i] / n
+        std_err = (p * (1 - p) / n) ** 0.5
+        z = (observed - p) / std_err if std_err else 0.0
+        if len(full_batches) > 1:
+            batch_var = float(np.var(full_batches[:, i] / batch_size, ddof=1))
+        else:
+            batch_var = float("nan")
+        expected_var = p * (1 - p) / batch_size
+        print(
+            f"{rarity:<10} {totals[i]:>12,} {observed:>11.6%} {p:>11.6%} "
+            f"{observed - p:>+10.6f} {z:>7.2f} {batch_var:>11.3e} {expected_var:>13.3e}"
+        )
+    print("|z| above ~3 on any rarity is worth a closer look.")
+
+
+def report_legendary_gaps(gaps):
+    p = configured_rates()["Legendary"]
+    print("\n== Pulls to Legendary ==")
+    if not gaps.size:
+        print("No Legendary pulls in this run, increase --pulls.")
+        return
+    percentiles = np.percentile(gaps, [50, 90, 99])
+    print(f"Samples:   {gaps.size:,}")
+    print(f"Mean:      {gaps.mean():,.1f} (expected {1 / p:,.1f})")
+    print(f"Median:    {percentiles[0]:,.0f} (expected {np.ceil(np.log(0.5) / np.log(1 - p)):,.0f})")
+    print(f"p90:       {percentiles[1]:,.0f}")
+    print(f"p99:       {percentiles[2]:,.0f}")
+    print(f"Max:       {gaps.max():,}")
+
+
+def report_oc_spread(catalog, names, oc_counts):
+    print("\n== Per-OC spread within each rarity ==")
+    for rarity in RARITIES:
+        rarity_names = set(catalog[rarity])
+        idx = [i for i, name in enumerate(names) if name in rarity_names]
+        if not idx:
+            print(f"{rarity:<10} no OCs")
+            continue
+        counts = oc_counts[idx]
+        print(
+            f"{rarity:<10} {len(idx):>4} OCs | min {counts.min():,} | max {counts.max():,} "
+            f"| mean {counts.mean():,.1f}"
+        )
+
+
+# ╭───────────────────────────────╮
+#   ⭐ Benchmark
+# ╰───────────────────────────────╯
+def fill_live_caches(catalog):
+    """Loads the catalog into the bot's in-memory OC catalog without a database."""
+    import utils.cache.cache_list as cache_list
+
+    cache_list.oc_catalog.load(
+        {"name": name, "rarity": rarity, "character_info": "", "image_link": ""}
+        for rarity in RARITIES
+        for name in catalog[rarity]
+    )
+
+
+def benchmark(catalog, pulls: int, seed: int | None):
+    import random
+
+    from utils.listener_func.gacha import get_random_rarity, pick_random_oc_by_rarity
+    from utils.listener_func.gacha_sampler import draw_gacha_outcome, get_gacha_sampler
+
+    # Loaded once; a rarity with no OCs would make every pull reload it from the database
+    fill_live_caches(catalog)
+    empty = {rarity for rarity in RARITIES if not catalog[rarity]}
+    random.seed(seed)
+    skipped = 0
+
+    async def two_stage():
+        nonlocal skipped
+        for _ in range(pulls):
+            rarity = get_random_rarity()
+            if rarity in empty:
+                skipped += 1
+                continue
+            await pick_random_oc_by_rarity(None, rarity)
+
+    start = time.perf_counter()
+    asyncio.run(two_stage())
+    two_stage_secs = time.perf_counter() - start
+
+    get_gacha_sampler()  # build outside the timed loop
+    start = time.perf_counter()
+    for _ in range(pulls):
+        draw_gacha_outcome()
+    alias_secs = time.perf_counter() - start
+
+    _, _, cdf = outcome_table(catalog)
+    rng = np.random.default_rng(seed)
+    start = time.perf_counter()
+    np.searchsorted(cdf, rng.random(pulls), side="right")
+    vector_secs = time.perf_counter() - start
+
+    print(f"\n== Throughput ({pulls:,} pulls) ==")
+    if empty:
+        print(
+            f"No OCs for {', '.join(sorted(empty))}: {skipped:,} two-stage pulls "
+            "landed there and were skipped (the bot would reload the catalog)."
+        )
+    for label, secs in (
+        ("get_random_rarity + pick_random_oc_by_rarity", two_stage_secs),
+        ("alias sampler (draw_gacha_outcome)", alias_secs),
+        ("NumPy vectorized", vector_secs),
+    ):
+        print(f"{label:<46} {secs:>8.3f}s  {pulls / secs:>14,.0f} pulls/s")
+
+
+# ╭───────────────────────────────╮
+#   ⭐ Entry Point
+# ╰───────────────────────────────╯
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Simulate and audit gacha rates.")
+    parser.add_argument("--pulls", type=int, default=5_000_000, help="Pulls to simulate.")
+    parser.add_argument("--batch-size", type=int, default=100_000, help="Pulls per simulated batch.")
+    parser.add_argument("--catalog", help="JSON snapshot of the ocs table (list of {name, rarity}).")
+    parser.add_argument("--per-rarity", type=int, default=20, help="Synthetic OCs per rarity when no snapshot is given.")
+    parser.add_argument("--seed", type=int, default=None, help="Random seed for reproducible runs.")
+    parser.add_argument("--bench-pulls", type=int, default=200_000, help="Pulls per benchmarked path, 0 to skip.")
+    args = parser.parse_args(argv)
+
+    catalog = load_catalog(args.catalog, args.per_rarity)
+    print("Catalog: " + " | ".join(f"{r}: {len(catalog[r])}" for r in RARITIES))
+
+    batch_counts, gaps, names, oc_counts = simulate(
+        catalog, args.pulls, args.batch_size, args.seed
+    )
+    report_rates(batch_counts, args.batch_size)
+    report_legendary_gaps(gaps)
+    report_oc_spread(catalog, names, oc_counts)
+
+    if args.bench_pulls > 0:
+        benchmark(catalog, args.bench_pulls, args.seed)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,149 @@
+"""
+Inventory cache memory check.
+
+Builds a synthetic user_oc_inv_cache three ways and reports the bytes used:
+  Row dicts     the old cache, every field copied into every row as asyncpg
+                hands them back
+  UserInventory the current cache, a UserInvCache of UserInventory objects
+                (per-name dict of InvEntry, running totals)
+  + snapshots   the same after every user was read once, so each holds the
+                snapshot built by a read
+
+The catalog is interned before measuring, it is shared by every user.
+The UserInventory cache is measured with every user empty too, so the per
+user cost (USER_INV_BASE_BYTES) and the per card cost (USER_INV_ENTRY_BYTES)
+in utils/cache/user_inv_lru.py can be read off separately.
+
+Run from the repo root:
+    python -m tools.inv_memory
+    python -m tools.inv_memory --users 20000 --cards-per-user 150 --catalog-size 400
+"""
+
+import argparse
+import gc
+import random
+import tracemalloc
+
+RARITIES = ("Common", "Rare", "Epic", "Legendary")
+
+
+def _fresh(text: str) -> str:
+    """Returns an equal string that is a separate object, like a decoded DB value."""
+    return text.encode("utf-8").decode("utf-8")
+
+
+def make_catalog(size: int, bio_length: int) -> list[dict]:
+    return [
+        {
+            "name": f"OC Number {i}",
+            "rarity": RARITIES[i % len(RARITIES)],
+            "character_info": ("A long character bio. " * (bio_length // 22 + 1))[:bio_length],
+            "image_link": f"https://cdn.discordapp.com/attachments/1234567890/{i:020d}/oc_{i}.png",
+        }
+        for i in range(size)
+    ]
+
+
+def make_rows(catalog: list[dict], users: int, cards_per_user: int, seed: int):
+    rng = random.Random(seed)
+    for user_id in range(users):
+        for oc in rng.sample(catalog, min(cards_per_user, len(catalog))):
+            yield user_id, {
+                "user_name": _fresh(f"user{user_id}"),
+                "card_name": _fresh(oc["name"]),
+                "rarity": _fresh(oc["rarity"]),
+                "character_info": _fresh(oc["character_info"]),
+                "image_link": _fresh(oc["image_link"]),
+                "owned": rng.randint(1, 20),
+            }
+
+
+def measure(build) -> int:
+    gc.collect()
+    tracemalloc.start()
+    result = build()
+    gc.collect()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return current
+
+
+def build_dict_cache(catalog, args):
+    cache: dict[int, list[dict]] = {}
+    for user_id, row in make_rows(catalog, args.users, args.cards_per_user, args.seed):
+        cache.setdefault(user_id, []).append(row)
+    return cache
+
+
+def intern_catalog(catalog):
+    from utils.cache.inv_entry import make_inv_entry
+
+    for oc in catalog:
+        make_inv_entry(oc["name"], oc["rarity"], oc["character_info"], oc["image_link"], 0)
+
+
+def build_user_inv_cache(catalog, args, cards_per_user: int, snapshots: bool = False):
+    from utils.cache.inv_entry import UserInventory, make_inv_entry
+    from utils.cache.user_inv_lru import UserInvCache
+
+    entries: dict[int, list] = {user_id: [] for user_id in range(args.users)}
+    for user_id, row in make_rows(catalog, args.users, cards_per_user, args.seed):
+        entries[user_id].append(
+            make_inv_entry(
+                row["card_name"],
+                row["rarity"],
+                row["character_info"],
+                row["image_link"],
+                row["owned"],
+            )
+        )
+    cache = UserInvCache()
+    for user_id, user_entries in entries.items():
+        cache[user_id] = UserInventory(user_entries)
+    del entries
+    if snapshots:
+        for _, user_inv in list(cache.items()):
+            user_inv.snapshot()
+    return cache
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure inventory cache memory per row.")
+    parser.add_argument("--users", type=int, default=5_000)
+    parser.add_argument("--cards-per-user", type=int, default=60)
+    parser.add_argument("--catalog-size", type=int, default=200)
+    parser.add_argument("--bio-length", type=int, default=300)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args(argv)
+
+    catalog = make_catalog(args.catalog_size, args.bio_length)
+    rows = args.users * min(args.cards_per_user, args.catalog_size)
+    intern_catalog(catalog)
+
+    dict_bytes = measure(lambda: build_dict_cache(catalog, args))
+    empty_bytes = measure(lambda: build_user_inv_cache(catalog, args, 0))
+    inv_bytes = measure(lambda: build_user_inv_cache(catalog, args, args.cards_per_user))
+    snapshot_bytes = measure(
+        lambda: build_user_inv_cache(catalog, args, args.cards_per_user, snapshots=True)
+    )
+
+    print(f"{rows:,} inventory rows ({args.users:,} users, {args.catalog_size} OCs)")
+    for label, total in (
+        ("Row dicts", dict_bytes),
+        ("UserInventory", inv_bytes),
+        ("+ snapshots", snapshot_bytes),
+    ):
+        print(f"{label:<14} {total / 2**20:>10.1f} MiB {total / rows:>10.1f} B/row")
+    print(f"Saved {1 - inv_bytes / dict_bytes:.1%}")
+
+    base = empty_bytes / args.users
+    print(f"Per user, empty inventory: {base:.0f} B")
+    print(
+        f"Per card:                  {(inv_bytes - empty_bytes) / rows:.0f} B, "
+        f"{(snapshot_bytes - empty_bytes) / rows:.0f} B with a snapshot"
+    )
+
+
+if __name__ == "__main__":
+    main()
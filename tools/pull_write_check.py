@@ -0,0 +1,94 @@
+"""
+Direct pull write check.
+
+Runs record_user_oc_pull against a real Postgres with an int (BIGINT) user
+ID: a first pull, a second delivery of the same message, and a second
+pull. Everything runs inside one transaction that is rolled back, so the
+database is left as it was. Needs the user_oc_inv and gacha_pull_ledger
+tables to exist.
+
+Run from the repo root:
+    python -m tools.pull_write_check
+    python -m tools.pull_write_check --dsn postgresql://localhost/nyx
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+
+
+class _OneConnectionPool:
+    """Hands out the same connection, so every query shares the open transaction."""
+
+    def __init__(self, conn):
+        self.conn = conn
+
+    def acquire(self):
+        return self
+
+    async def __aenter__(self):
+        return self.conn
+
+    async def __aexit__(self, exc_type, exc, tb):
+        return False
+
+
+class _Bot:
+    def __init__(self, pool):
+        self.pg_pool = pool
+
+
+async def run_check(dsn: str) -> bool:
+    import asyncpg
+
+    from utils.db.user_oc_inv import record_user_oc_pull, to_user_id
+
+    # Above the 2**31 range, like a real Discord snowflake
+    user_id = to_user_id(987_654_321_098_765_432)
+    message_ids = (2**62 + 1, 2**62 + 2)
+    args = ("check-user", "Pull Write Check OC", "Common", None, "https://example.invalid/oc.png")
+
+    conn = await asyncpg.connect(dsn=dsn)
+    transaction = conn.transaction()
+    await transaction.start()
+    try:
+        bot = _Bot(_OneConnectionPool(conn))
+        results = [
+            await record_user_oc_pull(bot, user_id, *args, message_ids[0]),
+            await record_user_oc_pull(bot, user_id, *args, message_ids[0]),
+            await record_user_oc_pull(bot, user_id, *args, message_ids[1]),
+        ]
+        stored_type = await conn.fetchval(
+            "SELECT pg_typeof(user_id)::text FROM user_oc_inv WHERE user_id = $1 LIMIT 1;",
+            user_id,
+        )
+    finally:
+        await transaction.rollback()
+        await conn.close()
+
+    expected = [(1, True), False, (2, False)]
+    checks = [
+        ("first pull inserts the card", results[0] == expected[0]),
+        ("same message again is skipped", results[1] is expected[1]),
+        ("next message adds to the count", results[2] == expected[2]),
+        ("user_id is stored as bigint", stored_type == "bigint"),
+    ]
+    for label, passed in checks:
+        print(f"{'PASS' if passed else 'FAIL'}  {label}")
+    if not all(passed for _, passed in checks):
+        print(f"Results: {results}, stored type: {stored_type}")
+    return all(passed for _, passed in checks)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Check direct pull writes with an int user ID.")
+    parser.add_argument("--dsn", default=os.getenv("DATABASE_URL"), help="Postgres DSN, defaults to DATABASE_URL.")
+    args = parser.parse_args(argv)
+    if not args.dsn:
+        sys.exit("pull_write_check needs --dsn or DATABASE_URL")
+    sys.exit(0 if asyncio.run(run_check(args.dsn)) else 1)
+
+
+if __name__ == "__main__":
+    main()
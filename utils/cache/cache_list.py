@@ -1,73 +1,43 @@
 # Cache Lists
+from config.gacha import INV_CACHE_LAZY, INV_CACHE_MAX_BYTES, INV_CACHE_MAX_USERS
+from utils.cache.oc_catalog import OCCatalog
+from utils.cache.user_inv_lru import UserInvCache
 
-# All Ocs Cache Lists
-ocs_cache: list[dict[str, dict[str, str]]] = []
+# OC catalog: every OC indexed by name, case-folded name and rarity
+oc_catalog = OCCatalog()
 # Structure
-# ocs_cache = {
-#     {
-#         "name": {
-#              "rarity": str,
-#             "character_info": str,
-#             "image_link": str,}
-#     },
-#     ...
-
-# For common rarity ocs
-common_ocs_cache: list[dict[str, dict[str, str]]] = []
-# Structure
-# common_ocs_cache = {
-#     {
-#         "name": {
-#             "character_info": str,
-#             "image_link": str,}
-#     },
-#     ...
-
-# For rare rarity ocs
-rare_ocs_cache: list[dict[str, dict[str, str]]] = []
-# Structure
-# rare_ocs_cache = {
-#     {
-#         "name": {
-#             "character_info": str,
-#             "image_link": str,}
-#     },
-#     ...
+# oc_catalog.get("name") -> OCRecord(
+#     card_id: int,
+#     name: str,
+#     rarity: str,
+#     character_info: str | None,
+#     image_link: str | None,
+#     is_skin: bool,
+#     base_character: str | None,
+# )
+# oc_catalog.by_rarity("Common") -> [OCRecord, ...]
 
-# For epic rarity ocs
-epic_ocs_cache: list[dict[str, dict[str, str]]] = []
+# User inventories, least recently used first. Bounded in lazy mode only,
+# when every user is loaded up front nothing may be evicted.
+user_oc_inv_cache = UserInvCache(
+    max_users=INV_CACHE_MAX_USERS if INV_CACHE_LAZY else 0,
+    max_bytes=INV_CACHE_MAX_BYTES if INV_CACHE_LAZY else 0,
+)
 # Structure
-# epic_ocs_cache = {
-#     {
-#         "name": {
-#             "character_info": str,
-#             "image_link": str,}
-#     },
+# user_oc_inv_cache = {
+#     user_id: UserInventory({
+#         "card_name": InvEntry(card_id: int, owned: int),  # card details via oc_catalog.record_by_id
+#         ...
+#     }),
 #     ...
 
-# For legendary rarity ocs
-legendary_ocs_cache: list[dict[str, dict[str, str]]] = []
+# Prebuilt gacha result embeds
+gacha_embed_cache: dict[tuple[str, bool], dict] = {}
 # Structure
-# legendary_ocs_cache = {
-#     {
-#         "name": {
-#             "character_info": str,
-#             "image_link": str,}
-#     },
+# gacha_embed_cache = {
+#     ("card_name", is_new): discord.Embed.to_dict() payload,
 #     ...
+# }
 
-user_oc_inv_cache: dict[int, list[dict[str, str]]] = {}
-# Structure
-# user_oc_inv_cache = {
-#     "user_id": [
-#         {
-#          "user_name": str,
-#             "card_name": str,
-#             "rarity": str,
-#             "character_info": str,
-#             "image_link": str,
-#             "owned": int,
-#         },
-#         ...
-#     ],
-#     ...
+# Version of the gacha_rates rows currently applied to OCS_RARITY_MAP (0 = hard-coded defaults)
+gacha_rates_version: int = 0
@@ -1,7 +1,10 @@
 import discord
 
+from utils.db.inv_write_buffer import inv_write_buffer
 from utils.logs.pretty_log import pretty_log
 
+from .disk_snapshot import cache_snapshotter
+from .gacha_rates_cache import load_gacha_rates_cache
 from .ocs_cache import load_ocs_cache
 from .user_inv_cache import load_all_user_oc_inv_cache
 
@@ -10,10 +13,21 @@ async def load_all_cache(bot: discord.Client):
     """Loads all caches for the bot."""
     pretty_log("info", "Loading all caches...")
 
+    # Flush buffered inventory writes so the loads below include them
+    await inv_write_buffer.flush()
+
+    # After a restart, start from the disk snapshot and fetch only what changed
+    restored = await cache_snapshotter.restore(bot)
+
     # Load OCs cache
-    await load_ocs_cache(bot)
+    if not restored:
+        await load_ocs_cache(bot)
+
+    # Load gacha rates, rebuilding the sampler and embeds for them
+    await load_gacha_rates_cache(bot)
 
     # Load User OC Inventories cache
-    await load_all_user_oc_inv_cache(bot)
+    if not restored:
+        await load_all_user_oc_inv_cache(bot)
 
     pretty_log("info", "All caches loaded successfully.")
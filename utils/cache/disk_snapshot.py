@@ -0,0 +1,354 @@
+import asyncio
+import datetime
+import mmap
+import os
+import struct
+import time
+
+import discord
+
+from config.gacha import (
+    CACHE_SNAPSHOT_ENABLED,
+    CACHE_SNAPSHOT_INTERVAL_SECONDS,
+    CACHE_SNAPSHOT_MAX_AGE_HOURS,
+    CACHE_SNAPSHOT_PATH,
+    CACHE_SNAPSHOT_WATERMARK_SLACK_SECONDS,
+    INV_CACHE_LAZY,
+)
+from config.ocs import resolve_base_character
+from utils.logs.pretty_log import pretty_log
+
+from .cache_list import oc_catalog, user_oc_inv_cache
+from .inv_entry import InvEntry, UserInventory
+
+# ╭───────────────────────────────╮
+#   ⭐ Disk Snapshot
+# ╰───────────────────────────────╯
+# The OC catalog and the cached inventories are written to one binary file
+# on a timer and at shutdown. The first cache load after a restart reads it
+# back (memory-mapped) and then fetches only what changed in Postgres since
+# the snapshot's watermark, see utils/db/cache_watermark_db.py.
+#
+# Layout, little-endian:
+#   header   magic, format version, watermark (µs since epoch, DB clock),
+#            card count, user count
+#   cards    flags (1 = in the catalog), name, rarity, character_info,
+#            image_link. Strings are a u32 byte length then UTF-8, with
+#            0xFFFFFFFF for None. Card IDs are only valid inside one
+#            process, so entries below point at the card's index here.
+#   users    user ID, entry count, then (card index, owned) per entry
+#
+# A file with another magic or format version is ignored, as is one older
+# than CACHE_SNAPSHOT_MAX_AGE_HOURS (its tombstones may be pruned already).
+
+SNAPSHOT_MAGIC = b"NYXCACHE"
+SNAPSHOT_FORMAT_VERSION = 1
+
+_HEADER = struct.Struct("<8sHqII")
+_U8 = struct.Struct("<B")
+_U32 = struct.Struct("<I")
+_USER = struct.Struct("<qI")
+_ENTRY = struct.Struct("<Ii")
+_NONE = 0xFFFFFFFF
+
+_EPOCH = datetime.datetime(1970, 1, 1, tzinfo=datetime.timezone.utc)
+
+
+def _to_micros(moment: datetime.datetime) -> int:
+    return (moment - _EPOCH) // datetime.timedelta(microseconds=1)
+
+
+def _from_micros(micros: int) -> datetime.datetime:
+    return _EPOCH + datetime.timedelta(microseconds=micros)
+
+
+# -------------------- Encoding --------------------
+def _pack_str(out: list, text: str | None):
+    if text is None:
+        out.append(_U32.pack(_NONE))
+        return
+    data = text.encode("utf-8")
+    out.append(_U32.pack(len(data)))
+    out.append(data)
+
+
+def encode_cache_snapshot(watermark: datetime.datetime) -> bytes:
+    """Serializes the catalog and inventory caches. Runs without awaits,
+    so the result is one consistent view of both."""
+    records = oc_catalog.id_records()
+    index_of = {record.card_id: index for index, record in enumerate(records)}
+    users = list(user_oc_inv_cache.items())
+
+    out = [
+        _HEADER.pack(
+            SNAPSHOT_MAGIC,
+            SNAPSHOT_FORMAT_VERSION,
+            _to_micros(watermark),
+            len(records),
+            len(users),
+        )
+    ]
+    for record in records:
+        out.append(_U8.pack(1 if oc_catalog.get(record.name) is record else 0))
+        _pack_str(out, record.name)
+        _pack_str(out, record.rarity)
+        _pack_str(out, record.character_info)
+        _pack_str(out, record.image_link)
+    for user_id, user_inv in users:
+        entries = user_inv.snapshot().entries
+        out.append(_USER.pack(int(user_id), len(entries)))
+        out.append(
+            b"".join(_ENTRY.pack(index_of[e.card_id], e.owned) for e in entries)
+        )
+    return b"".join(out)
+
+
+# -------------------- Decoding --------------------
+def _unpack_str(buffer, offset: int) -> tuple[str | None, int]:
+    (length,) = _U32.unpack_from(buffer, offset)
+    offset += _U32.size
+    if length == _NONE:
+        return None, offset
+    return bytes(buffer[offset : offset + length]).decode("utf-8"), offset + length
+
+
+def decode_cache_snapshot(buffer):
+    """Returns (watermark, cards, users) from a snapshot, or None if the format is unknown.
+    cards are (in_catalog, name, rarity, character_info, image_link),
+    users map a user ID to (card index, owned) pairs."""
+    if len(buffer) < _HEADER.size:
+        return None
+    magic, format_version, watermark, card_count, user_count = _HEADER.unpack_from(
+        buffer, 0
+    )
+    if magic != SNAPSHOT_MAGIC or format_version != SNAPSHOT_FORMAT_VERSION:
+        return None
+    offset = _HEADER.size
+
+    cards = []
+    for _ in range(card_count):
+        (flags,) = _U8.unpack_from(buffer, offset)
+        offset += _U8.size
+        name, offset = _unpack_str(buffer, offset)
+        rarity, offset = _unpack_str(buffer, offset)
+        character_info, offset = _unpack_str(buffer, offset)
+        image_link, offset = _unpack_str(buffer, offset)
+        cards.append((bool(flags & 1), name, rarity, character_info, image_link))
+
+    users = {}
+    for _ in range(user_count):
+        user_id, entry_count = _USER.unpack_from(buffer, offset)
+        offset += _USER.size
+        end = offset + entry_count * _ENTRY.size
+        users[user_id] = list(_ENTRY.iter_unpack(buffer[offset:end]))
+        offset = end
+    return _from_micros(watermark), cards, users
+
+
+class CacheSnapshotter:
+    def __init__(
+        self,
+        path: str = CACHE_SNAPSHOT_PATH,
+        interval: int = CACHE_SNAPSHOT_INTERVAL_SECONDS,
+    ):
+        self.path = path
+        self.interval = interval
+        self.bot: discord.Client | None = None
+        # Only the first cache load of a process may use the file, a later
+        # one (on_ready after a reconnect) would roll the caches back
+        self.restore_attempted = False
+        self._save_lock = asyncio.Lock()
+        self._task: asyncio.Task | None = None
+
+    # -------------------- Restoring --------------------
+    def _read(self):
+        try:
+            with open(self.path, "rb") as f:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+                    with memoryview(buffer) as view:
+                        return decode_cache_snapshot(view)
+        except FileNotFoundError:
+            return None
+
+    def _apply(self, cards: list[tuple], users: dict[int, list[tuple]]):
+        from .gacha_embed_cache import load_gacha_embed_cache
+
+        oc_catalog.load(
+            (
+                {
+                    "name": name,
+                    "rarity": rarity,
+                    "character_info": character_info,
+                    "image_link": image_link,
+                }
+                for in_catalog, name, rarity, character_info, image_link in cards
+                if in_catalog
+            ),
+            resolve_base_character,
+        )
+        card_ids = [
+            oc_catalog.intern_card(name, rarity, character_info, image_link)
+            for _, name, rarity, character_info, image_link in cards
+        ]
+        user_oc_inv_cache.clear()
+        for user_id, entries in users.items():
+            user_oc_inv_cache[user_id] = UserInventory(
+                [InvEntry(card_ids[index], owned) for index, owned in entries]
+            )
+        load_gacha_embed_cache()
+
+    async def _catch_up(self, bot: discord.Client, since: datetime.datetime) -> bool:
+        from utils.db.cache_watermark_db import (
+            fetch_ocs_changed_since,
+            fetch_user_oc_inv_changed_since,
+        )
+
+        from .ocs_cache import remove_oc_from_cache, upsert_oc_cache
+        from .user_inv_cache import ensure_user_oc_inv_cache
+
+        oc_changes = await fetch_ocs_changed_since(bot, since)
+        changed_users = await fetch_user_oc_inv_changed_since(bot, since)
+        if oc_changes is None or changed_users is None:
+            return False
+
+        rows, deleted_names = oc_changes
+        changed_names = {row["name"] for row in rows}
+        for name in deleted_names:
+            if name not in changed_names:
+                remove_oc_from_cache(name)
+        for row in rows:
+            upsert_oc_cache(
+                row["name"], row["rarity"], row["character_info"], row["image_link"]
+            )
+
+        for user_id in changed_users:
+            user_oc_inv_cache.pop(user_id)
+            if not INV_CACHE_LAZY:
+                await ensure_user_oc_inv_cache(bot, user_id)
+        pretty_log(
+            tag="info",
+            message=f"Cache snapshot caught up: {len(rows) + len(deleted_names)} OC changes, {len(changed_users)} users reloaded.",
+        )
+        return True
+
+    async def restore(self, bot: discord.Client) -> bool:
+        """Loads the caches from the snapshot file and catches up with Postgres.
+        Returns False if the caches must be loaded from Postgres instead."""
+        if not CACHE_SNAPSHOT_ENABLED or self.restore_attempted:
+            return False
+        self.restore_attempted = True
+        started = time.perf_counter()
+        try:
+            decoded = self._read()
+            if decoded is None:
+                return False
+            watermark, cards, users = decoded
+            age = datetime.datetime.now(datetime.timezone.utc) - watermark
+            if age > datetime.timedelta(hours=CACHE_SNAPSHOT_MAX_AGE_HOURS):
+                pretty_log(
+                    tag="info",
+                    message=f"Cache snapshot is {age} old, loading caches from the database.",
+                )
+                return False
+            self._apply(cards, users)
+            pretty_log(
+                tag="info",
+                message=f"Restored {len(oc_catalog)} OCs and {len(users)} inventories from the cache snapshot in {(time.perf_counter() - started) * 1000:.0f} ms.",
+            )
+        except Exception as e:
+            pretty_log(
+                tag="error",
+                message=f"Error reading cache snapshot '{self.path}': {e}",
+                include_trace=True,
+            )
+            return False
+
+        if not await self._catch_up(bot, watermark):
+            pretty_log(
+                tag="warn",
+                message="Could not catch up the cache snapshot, loading caches from the database.",
+            )
+            return False
+        return True
+
+    # -------------------- Saving --------------------
+    async def save(self) -> bool:
+        """Writes the caches to the snapshot file. Returns True if it was written."""
+        from utils.db.cache_sync import cache_sync
+        from utils.db.cache_watermark_db import fetch_db_now, prune_cache_tombstones
+
+        if self.bot is None or not oc_catalog:
+            return False
+        async with self._save_lock:
+            # Changes from other processes may be missing until the listener has caught up
+            if not cache_sync.in_sync:
+                pretty_log(
+                    tag="skip",
+                    message="Cache sync is catching up, skipped saving the cache snapshot.",
+                )
+                return False
+            now = await fetch_db_now(self.bot)
+            if now is None:
+                return False
+            watermark = now - datetime.timedelta(
+                seconds=CACHE_SNAPSHOT_WATERMARK_SLACK_SECONDS
+            )
+            try:
+                data = encode_cache_snapshot(watermark)
+                await asyncio.to_thread(self._write, data)
+            except Exception as e:
+                pretty_log(
+                    tag="error",
+                    message=f"Error writing cache snapshot '{self.path}': {e}",
+                )
+                return False
+            await prune_cache_tombstones(
+                self.bot,
+                watermark - datetime.timedelta(hours=CACHE_SNAPSHOT_MAX_AGE_HOURS),
+            )
+            return True
+
+    def _write(self, data: bytes):
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        temp_path = f"{self.path}.tmp"
+        with open(temp_path, "wb") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        # Readers see the old file or the new one, never a partial write
+        os.replace(temp_path, self.path)
+
+    async def _save_loop(self):
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.save()
+            except Exception as e:
+                pretty_log(
+                    tag="error",
+                    message=f"Error in cache snapshot loop: {e}",
+                )
+
+    # -------------------- Lifecycle --------------------
+    async def start(self, bot: discord.Client):
+        """Starts saving the snapshot on a timer."""
+        self.bot = bot
+        if not CACHE_SNAPSHOT_ENABLED:
+            return
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._save_loop())
+        pretty_log(tag="info", message="Cache snapshot timer started.")
+
+    async def stop(self):
+        """Stops the timer and saves one last snapshot."""
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        if CACHE_SNAPSHOT_ENABLED and not await self.save():
+            pretty_log(
+                tag="warn",
+                message="Cache snapshot was not saved on shutdown, the next start loads from the database.",
+            )
+
+
+cache_snapshotter = CacheSnapshotter()
@@ -0,0 +1,114 @@
+import discord
+
+from config.ocs import OCS_RARITY_MAP
+from utils.logs.pretty_log import pretty_log
+
+from .cache_list import gacha_embed_cache
+
+
+def build_gacha_embed_payload(
+    card_name: str,
+    rarity: str,
+    image_link: str | None,
+    is_new: bool,
+    is_skin: bool,
+    rarity_map: dict[str, dict] | None = None,
+) -> dict:
+    """Builds the serialized result embed for one OC in its new or duplicate state."""
+    rarity_map = rarity_map or OCS_RARITY_MAP
+    display_character_name = card_name.title()
+    rarity_emoji = rarity_map[rarity]["emoji"]
+    rarity_color = rarity_map[rarity]["color"]
+
+    # Determine footer text
+    footer_text = None
+    if is_new:
+        if is_skin:
+            footer_text = "New skin unlocked!"
+        else:
+            footer_text = "New Character unlocked!"
+
+    description = f"{rarity_emoji} `{display_character_name}` has been added to your collection!\n"
+    embed = discord.Embed(
+        title="You have been blessed!",
+        color=rarity_color,
+        description=description,
+    )
+    if image_link:
+        embed.set_image(url=image_link)
+
+    if footer_text:
+        embed.set_footer(text=footer_text)
+    return embed.to_dict()
+
+
+def build_gacha_embed_payloads(
+    rarity_map: dict[str, dict] | None = None,
+) -> dict[tuple[str, bool], dict]:
+    """Builds the new and duplicate result embeds for every OC in the cache."""
+    import utils.cache.cache_list as cache_list
+
+    rarity_map = rarity_map or OCS_RARITY_MAP
+    payloads = {}
+    try:
+        for oc in cache_list.oc_catalog:
+            if oc.rarity not in rarity_map:
+                continue
+            for is_new in (True, False):
+                payloads[(oc.name, is_new)] = build_gacha_embed_payload(
+                    oc.name,
+                    oc.rarity,
+                    oc.image_link,
+                    is_new,
+                    oc.is_skin,
+                    rarity_map,
+                )
+    except Exception as e:
+        pretty_log(
+            tag="error",
+            message=f"Error building gacha embed cache: {e}",
+        )
+    return payloads
+
+
+def install_gacha_embed_payloads(payloads: dict[tuple[str, bool], dict]):
+    """Replaces every prebuilt embed with payloads built off to the side."""
+    gacha_embed_cache.clear()
+    gacha_embed_cache.update(payloads)
+
+
+def load_gacha_embed_cache():
+    """Prebuilds the new and duplicate result embeds for every OC in the cache."""
+    install_gacha_embed_payloads(build_gacha_embed_payloads())
+    pretty_log(
+        tag="info",
+        message=f"Prebuilt {len(gacha_embed_cache)} gacha result embeds.",
+    )
+
+
+def invalidate_gacha_embed(card_name: str):
+    """Drops the prebuilt embeds for one OC, they are rebuilt on the next pull."""
+    gacha_embed_cache.pop((card_name, True), None)
+    gacha_embed_cache.pop((card_name, False), None)
+
+
+def clear_gacha_embed_cache():
+    """Drops every prebuilt embed, e.g. after rarity emoji or colors change."""
+    gacha_embed_cache.clear()
+
+
+def get_gacha_embed(
+    card_name: str, rarity: str, image_link: str | None, is_new: bool, is_skin: bool
+) -> discord.Embed:
+    """Returns a fresh embed for a pull result, copied from the prebuilt payload."""
+    key = (card_name, is_new)
+    payload = gacha_embed_cache.get(key)
+    if payload is None:
+        payload = build_gacha_embed_payload(
+            card_name, rarity, image_link, is_new, is_skin
+        )
+        gacha_embed_cache[key] = payload
+    # Copy nested dicts so edits to the returned embed never reach the cached payload
+    return discord.Embed.from_dict(
+        {k: (v.copy() if isinstance(v, dict) else v) for k, v in payload.items()}
+    )
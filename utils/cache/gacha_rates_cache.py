@@ -0,0 +1,122 @@
+import discord
+
+from config.ocs import OCS_RARITY_MAP
+from utils.db.gacha_rates_db import (
+    fetch_latest_gacha_rates,
+    insert_gacha_rates_version,
+    seed_gacha_rates,
+)
+from utils.listener_func.gacha_sampler import (
+    build_gacha_sampler,
+    get_oc_catalog,
+    install_gacha_sampler,
+)
+from utils.logs.pretty_log import pretty_log
+
+from .gacha_embed_cache import build_gacha_embed_payloads, install_gacha_embed_payloads
+
+
+def validate_gacha_rates(rates: dict[str, dict]):
+    """Raises ValueError if a rates map can't be applied."""
+    unknown = set(rates) - set(OCS_RARITY_MAP)
+    missing = set(OCS_RARITY_MAP) - set(rates)
+    if unknown or missing:
+        raise ValueError(
+            f"Gacha rates must cover exactly {list(OCS_RARITY_MAP)} (unknown: {sorted(unknown)}, missing: {sorted(missing)})."
+        )
+    if any(info["rate"] < 0 for info in rates.values()) or not any(
+        info["rate"] > 0 for info in rates.values()
+    ):
+        raise ValueError("Gacha rates must be non-negative with at least one above 0.")
+
+
+def apply_gacha_rates(rates: dict[str, dict], version: int):
+    """Swaps in a new set of rarity rates, emoji and colors.
+
+    The sampler and prebuilt embeds are built off to the side first, then
+    everything is installed in one step with no await in between, so an
+    in-flight pull sees either the old tables or the new ones.
+    """
+    import utils.cache.cache_list as cache_list
+
+    validate_gacha_rates(rates)
+
+    # Keep the rarity order from the config
+    new_map = {
+        rarity: {
+            "rate": float(rates[rarity]["rate"]),
+            "emoji": rates[rarity]["emoji"],
+            "color": int(rates[rarity]["color"]),
+        }
+        for rarity in OCS_RARITY_MAP
+    }
+    catalog = get_oc_catalog()
+    catalog_version = catalog.version
+    sampler = build_gacha_sampler(catalog, new_map)
+    payloads = build_gacha_embed_payloads(new_map)
+
+    # ── Atomic swap, no awaits below ──
+    OCS_RARITY_MAP.clear()
+    OCS_RARITY_MAP.update(new_map)
+    install_gacha_sampler(sampler, catalog_version)
+    install_gacha_embed_payloads(payloads)
+    cache_list.gacha_rates_version = version
+
+    pretty_log(
+        tag="info",
+        message=f"Applied gacha rates version {version}: "
+        + ", ".join(f"{r} {info['rate']}" for r, info in new_map.items()),
+    )
+
+
+async def load_gacha_rates_cache(bot: discord.Client):
+    """Loads the newest gacha rates from the database.
+    Seeds the table from the hard-coded OCS_RARITY_MAP only if it has no rows.
+    If the rates can't be read, the ones already in memory stay in use."""
+    try:
+        latest = await fetch_latest_gacha_rates(bot)
+        if latest is None:
+            latest = await seed_gacha_rates(bot, dict(OCS_RARITY_MAP))
+        version, rates = latest
+        apply_gacha_rates(rates, version)
+    except Exception as e:
+        pretty_log(
+            tag="error",
+            message=f"Error loading gacha rates into cache, keeping the current rates: {e}",
+            include_trace=True,
+        )
+
+
+async def update_gacha_rate(
+    bot: discord.Client,
+    rarity: str,
+    rate: float | None = None,
+    emoji: str | None = None,
+    color: int | None = None,
+    updated_by: str | None = None,
+) -> int | None:
+    """Stores a new rates version with one rarity changed and applies it live.
+    Returns the new version, or None if it could not be stored."""
+    import utils.cache.cache_list as cache_list
+
+    rates = {r: dict(info) for r, info in OCS_RARITY_MAP.items()}
+    if rarity not in rates:
+        raise ValueError(f"Unknown rarity '{rarity}'.")
+    if rate is not None:
+        rates[rarity]["rate"] = rate
+    if emoji is not None:
+        rates[rarity]["emoji"] = emoji
+    if color is not None:
+        rates[rarity]["color"] = color
+    validate_gacha_rates(rates)
+
+    base_version = cache_list.gacha_rates_version
+    version = await insert_gacha_rates_version(bot, rates, created_by=updated_by)
+    if version is None:
+        return None
+    if cache_list.gacha_rates_version != base_version:
+        # Another version was applied while we were writing, reload the newest
+        await load_gacha_rates_cache(bot)
+    else:
+        apply_gacha_rates(rates, version)
+    return version
@@ -0,0 +1,276 @@
+from .cache_list import oc_catalog
+
+# ╭───────────────────────────────╮
+#   ⭐ Inventory Entry
+# ╰───────────────────────────────╯
+# One card in one user's inventory. Only the card ID and the count are
+# stored; name, rarity, bio and image come from the shared catalog record,
+# so they are kept once per card instead of once per owner.
+# Entries are never changed after creation, a new count means a new entry.
+
+
+class InvEntry:
+    __slots__ = ("card_id", "owned")
+
+    def __init__(self, card_id: int, owned: int):
+        self.card_id = card_id
+        self.owned = owned
+
+    @property
+    def record(self):
+        return oc_catalog.record_by_id(self.card_id)
+
+    @property
+    def card_name(self) -> str:
+        return self.record.name
+
+    @property
+    def rarity(self) -> str:
+        return self.record.rarity
+
+    @property
+    def character_info(self) -> str | None:
+        return self.record.character_info
+
+    @property
+    def image_link(self) -> str | None:
+        return self.record.image_link
+
+    def __repr__(self) -> str:
+        return f"InvEntry({self.card_id}, owned={self.owned})"
+
+
+def make_inv_entry(
+    card_name: str,
+    rarity: str,
+    character_info: str | None,
+    image_link: str | None,
+    owned: int,
+) -> InvEntry:
+    """Builds an entry from an inventory row, registering the card in the catalog if needed."""
+    return InvEntry(
+        oc_catalog.intern_card(card_name, rarity, character_info, image_link), owned
+    )
+
+
+class SnapshotInvEntry(InvEntry):
+    """An entry as it was when a snapshot was taken.
+
+    The catalog record is captured at that point instead of looked up on
+    every read, so name, rarity, bio and image stay as they were even if the
+    OC is edited or renamed later.
+    """
+
+    # Shadows InvEntry.record, the captured record is read instead of the live one
+    __slots__ = ("record",)
+
+    def __init__(self, entry: InvEntry):
+        self.card_id = entry.card_id
+        self.owned = entry.owned
+        self.record = entry.record
+
+    def __repr__(self) -> str:
+        return f"SnapshotInvEntry({self.card_id}, owned={self.owned})"
+
+
+# ╭───────────────────────────────╮
+#   ⭐ User Inventory
+# ╰───────────────────────────────╯
+# One user's entries keyed by card name. The dict keeps insertion order,
+# which is the order cards were first added and the order shown to users.
+#
+# Totals (owned and unique, overall and per rarity) are kept up to date on
+# every write, so reading them is O(1). Change owned counts through the
+# methods below. If a card's rarity changes in the catalog, the per-rarity
+# totals are rebuilt on the next read.
+#
+# Every write bumps `version`. snapshot() returns a frozen view of the
+# current version and catalog version, built at most once per pair. Its
+# entries carry the catalog records of that moment, so anything derived from
+# a snapshot (sorts, pages, per-rarity totals) agrees with itself after an
+# OC edit or rename.
+
+
+class UserInventorySnapshot:
+    """Frozen view of one user's inventory at one version. Safe to hold across awaits.
+
+    Anything derived from it can be memoized with cached(), it never changes.
+    """
+
+    __slots__ = (
+        "version",
+        "catalog_version",
+        "entries",
+        "total_owned",
+        "unique_owned",
+        "_rarity_totals",
+        "_memo",
+    )
+
+    def __init__(
+        self,
+        version: int,
+        catalog_version: int,
+        entries: tuple[SnapshotInvEntry, ...],
+        total_owned: int,
+        unique_owned: int,
+        rarity_totals: dict[str, tuple[int, int]],
+    ):
+        self.version = version
+        self.catalog_version = catalog_version
+        self.entries = entries
+        self.total_owned = total_owned
+        self.unique_owned = unique_owned
+        self._rarity_totals = rarity_totals
+        self._memo: dict = {}
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def names(self) -> tuple[str, ...]:
+        return self.cached("names", lambda: tuple(e.card_name for e in self.entries))
+
+    def owned_by_rarity(self, rarity: str) -> int:
+        return self._rarity_totals.get(rarity, (0, 0))[0]
+
+    def unique_by_rarity(self, rarity: str) -> int:
+        return self._rarity_totals.get(rarity, (0, 0))[1]
+
+    def cached(self, key, build):
+        """Returns build() for this snapshot, building it only once per key."""
+        # Keyed by catalog version too, a result is only valid for the records it was built from
+        key = (self.catalog_version, key)
+        if key not in self._memo:
+            self._memo[key] = build()
+        return self._memo[key]
+
+
+EMPTY_USER_INV_SNAPSHOT = UserInventorySnapshot(0, 0, (), 0, 0, {})
+
+
+class UserInventory:
+    __slots__ = (
+        "_entries",
+        "total_owned",
+        "unique_owned",
+        "_rarity_totals",
+        "_rarity_version",
+        "version",
+        "_snapshot",
+    )
+
+    def __init__(self, entries: list[InvEntry] | None = None):
+        self._entries: dict[str, InvEntry] = {}
+        self.version = 0
+        self._snapshot: UserInventorySnapshot | None = None
+        self.total_owned = 0
+        self.unique_owned = 0
+        # rarity -> [owned, unique]
+        self._rarity_totals: dict[str, list[int]] = {}
+        self._rarity_version = oc_catalog.rarity_version
+        for entry in entries or ():
+            self.upsert(entry)
+
+    # -------------------- Reads --------------------
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, card_name: str) -> bool:
+        return card_name in self._entries
+
+    def __iter__(self):
+        return iter(self._entries.values())
+
+    def get(self, card_name: str) -> InvEntry | None:
+        return self._entries.get(card_name)
+
+    def names(self) -> list[str]:
+        return list(self._entries)
+
+    def entries(self) -> list[InvEntry]:
+        """Returns the entries in insertion order."""
+        return list(self._entries.values())
+
+    def snapshot(self) -> UserInventorySnapshot:
+        """Returns the frozen view of the current version."""
+        # Checked first, a catalog rarity change drops the cached snapshot
+        rarity_totals = self._current_rarity_totals()
+        snapshot = self._snapshot
+        if (
+            snapshot is None
+            or snapshot.version != self.version
+            or snapshot.catalog_version != oc_catalog.version
+        ):
+            snapshot = UserInventorySnapshot(
+                self.version,
+                oc_catalog.version,
+                tuple(SnapshotInvEntry(entry) for entry in self._entries.values()),
+                self.total_owned,
+                self.unique_owned,
+                {rarity: (t[0], t[1]) for rarity, t in rarity_totals.items()},
+            )
+            self._snapshot = snapshot
+        return snapshot
+
+    def owned_by_rarity(self, rarity: str) -> int:
+        totals = self._current_rarity_totals().get(rarity)
+        return totals[0] if totals else 0
+
+    def unique_by_rarity(self, rarity: str) -> int:
+        totals = self._current_rarity_totals().get(rarity)
+        return totals[1] if totals else 0
+
+    # -------------------- Totals --------------------
+    def _current_rarity_totals(self) -> dict[str, list[int]]:
+        if self._rarity_version != oc_catalog.rarity_version:
+            # Totals change without a write here, so cached snapshots are stale too
+            self._snapshot = None
+            self._rarity_totals = {}
+            for entry in self._entries.values():
+                self._count(entry.rarity, 0, entry.owned)
+            self._rarity_version = oc_catalog.rarity_version
+        return self._rarity_totals
+
+    def _count(self, rarity: str, old_owned: int, new_owned: int):
+        totals = self._rarity_totals.get(rarity)
+        if totals is None:
+            totals = self._rarity_totals[rarity] = [0, 0]
+        totals[0] += new_owned - old_owned
+        totals[1] += (new_owned > 0) - (old_owned > 0)
+
+    def _track(self, entry: InvEntry, old_owned: int, new_owned: int):
+        self.version += 1
+        self.total_owned += new_owned - old_owned
+        self.unique_owned += (new_owned > 0) - (old_owned > 0)
+        # If the rarity buckets are stale this lands in the wrong one,
+        # but they are rebuilt from the entries on the next read anyway
+        self._count(entry.rarity, old_owned, new_owned)
+
+    # -------------------- Writes --------------------
+    def upsert(self, entry: InvEntry) -> InvEntry:
+        """Adds an entry, or sets the owned count of the existing one for that card."""
+        existing = self._entries.get(entry.card_name)
+        if existing is None:
+            self._entries[entry.card_name] = entry
+            self._track(entry, 0, entry.owned)
+            return entry
+        return self.set_owned(entry.card_name, entry.owned)
+
+    def add_owned(self, entry: InvEntry) -> InvEntry:
+        """Adds an entry, or adds its owned count to the existing one for that card."""
+        existing = self._entries.get(entry.card_name)
+        if existing is None:
+            self._entries[entry.card_name] = entry
+            self._track(entry, 0, entry.owned)
+            return entry
+        return self.set_owned(entry.card_name, existing.owned + entry.owned)
+
+    def set_owned(self, card_name: str, owned: int) -> InvEntry | None:
+        """Sets the owned count of a card. Returns None if the user does not have it."""
+        old = self._entries.get(card_name)
+        if old is None:
+            return None
+        # Replace rather than modify, snapshots may hold the old entry
+        entry = self._entries[card_name] = InvEntry(old.card_id, owned)
+        self._track(entry, old.owned, owned)
+        return entry
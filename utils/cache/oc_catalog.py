@@ -0,0 +1,316 @@
+import sys
+from typing import Iterable, Iterator
+
+# ╭───────────────────────────────╮
+#   ⭐ OC Catalog
+# ╰───────────────────────────────╯
+# Every OC lives here once as an OCRecord, indexed by:
+#   • exact name             -> record
+#   • case-folded name       -> exact name
+#   • rarity                 -> array of records (order is not meaningful)
+#   • base character         -> skin names
+# Lookups, inserts, updates and removes are all O(1). A removed record is
+# swapped with the last record of its rarity array, so each record's
+# position in that array is tracked.
+#
+# Records are never changed in place. An update replaces the record, so
+# anyone holding a record (a sampler, a paginator page) keeps a consistent
+# view. `version` goes up on every change.
+#
+# Readers that keep what they read across an await (paginators, sorts,
+# autocomplete) should take snapshot() instead of the live indexes. A
+# snapshot is built at most once per version and shared by every reader.
+#
+# Inventory entries refer to OCs by card_id. The id table keeps the latest
+# record for every card_id ever seen, including OCs that were removed and
+# cards that only exist in someone's inventory, so an entry always resolves.
+
+
+class OCRecord:
+    __slots__ = (
+        "card_id",
+        "name",
+        "rarity",
+        "character_info",
+        "image_link",
+        "is_skin",
+        "base_character",
+    )
+
+    def __init__(
+        self,
+        card_id: int,
+        name: str,
+        rarity: str,
+        character_info: str | None,
+        image_link: str | None,
+        base_character: str | None = None,
+    ):
+        self.card_id = card_id
+        self.name = sys.intern(name)
+        self.rarity = sys.intern(rarity)
+        self.character_info = character_info
+        self.image_link = image_link
+        self.is_skin = base_character is not None
+        self.base_character = base_character
+
+    def __repr__(self) -> str:
+        return f"OCRecord({self.card_id}, {self.name!r}, {self.rarity!r})"
+
+
+class CatalogSnapshot:
+    """Frozen view of the catalog at one version. Safe to hold across awaits.
+
+    Anything derived from it (sorted lists, rendered pages) can be memoized
+    with cached(), the snapshot never changes so neither does the result.
+    """
+
+    __slots__ = ("version", "records", "names", "_by_rarity", "_memo")
+
+    def __init__(
+        self,
+        version: int,
+        records: tuple[OCRecord, ...],
+        by_rarity: dict[str, tuple[OCRecord, ...]],
+    ):
+        self.version = version
+        self.records = records
+        self.names = tuple(record.name for record in records)
+        self._by_rarity = by_rarity
+        self._memo: dict = {}
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def by_rarity(self, rarity: str) -> tuple[OCRecord, ...]:
+        return self._by_rarity.get(rarity, ())
+
+    def count(self, rarity: str | None = None) -> int:
+        if rarity is None:
+            return len(self.records)
+        return len(self._by_rarity.get(rarity, ()))
+
+    def cached(self, key, build):
+        """Returns build() for this snapshot, building it only once per key."""
+        if key not in self._memo:
+            self._memo[key] = build()
+        return self._memo[key]
+
+
+def normalize_rarity(rarity: str) -> str:
+    return str(rarity).strip().title()
+
+
+class OCCatalog:
+    def __init__(self):
+        self.version = 0
+        # Goes up only when a card's rarity changes, inventory aggregates re-bucket on it
+        self.rarity_version = 0
+        self._by_name: dict[str, OCRecord] = {}
+        self._by_folded: dict[str, str] = {}
+        self._by_rarity: dict[str, list[OCRecord]] = {}
+        self._positions: dict[str, int] = {}
+        self._skin_families: dict[str, list[str]] = {}
+        # Card IDs stay the same for a name for the life of the process,
+        # even if the OC is removed and added back
+        self._card_ids: dict[str, int] = {}
+        self._by_id: dict[int, OCRecord] = {}
+        self._snapshot: CatalogSnapshot | None = None
+
+    # -------------------- Reads --------------------
+    def __len__(self) -> int:
+        return len(self._by_name)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._by_name
+
+    def __iter__(self) -> Iterator[OCRecord]:
+        return iter(self._by_name.values())
+
+    def get(self, name: str) -> OCRecord | None:
+        """Returns the OC with exactly this name."""
+        return self._by_name.get(name)
+
+    def find(self, name: str) -> OCRecord | None:
+        """Returns the OC with this name, ignoring case."""
+        exact = self._by_folded.get(name.casefold())
+        return self._by_name.get(exact) if exact is not None else None
+
+    def snapshot(self) -> CatalogSnapshot:
+        """Returns the frozen view of the current version."""
+        snapshot = self._snapshot
+        if snapshot is None or snapshot.version != self.version:
+            snapshot = CatalogSnapshot(
+                self.version,
+                tuple(self._by_name.values()),
+                {rarity: tuple(records) for rarity, records in self._by_rarity.items()},
+            )
+            self._snapshot = snapshot
+        return snapshot
+
+    def record_by_id(self, card_id: int) -> OCRecord | None:
+        """Returns the latest record for a card ID, even if the OC was removed."""
+        return self._by_id.get(card_id)
+
+    def id_records(self) -> list[OCRecord]:
+        """Returns the latest record for every card ID, including removed OCs."""
+        return list(self._by_id.values())
+
+    def names(self) -> list[str]:
+        return list(self._by_name)
+
+    def by_rarity(self, rarity: str) -> list[OCRecord]:
+        """Returns the live record array for a rarity. Do not modify it or
+        keep it across an await, use snapshot() for that."""
+        return self._by_rarity.get(rarity, [])
+
+    def count(self, rarity: str | None = None) -> int:
+        if rarity is None:
+            return len(self._by_name)
+        return len(self._by_rarity.get(rarity, ()))
+
+    def rarity_counts(self) -> dict[str, int]:
+        return {rarity: len(records) for rarity, records in self._by_rarity.items()}
+
+    def skin_family(self, base_character: str) -> list[str]:
+        """Returns the names of all skins of a base OC."""
+        return list(self._skin_families.get(base_character, ()))
+
+    # -------------------- Writes --------------------
+    def _card_id_for(self, name: str) -> int:
+        card_id = self._card_ids.get(name)
+        if card_id is None:
+            card_id = len(self._card_ids) + 1
+            self._card_ids[sys.intern(name)] = card_id
+        return card_id
+
+    def intern_card(
+        self,
+        name: str,
+        rarity: str,
+        character_info: str | None,
+        image_link: str | None,
+    ) -> int:
+        """Returns the card ID for an inventory row.
+        Cards missing from the catalog get an id-only record built from the row."""
+        card_id = self._card_id_for(name)
+        if card_id not in self._by_id:
+            self._by_id[card_id] = OCRecord(
+                card_id, name, normalize_rarity(rarity), character_info, image_link
+            )
+        return card_id
+
+    def _unlink_rarity(self, record: OCRecord):
+        records = self._by_rarity[record.rarity]
+        index = self._positions.pop(record.name)
+        last = records.pop()
+        if last is not record:
+            records[index] = last
+            self._positions[last.name] = index
+
+    def _link_rarity(self, record: OCRecord):
+        records = self._by_rarity.setdefault(record.rarity, [])
+        self._positions[record.name] = len(records)
+        records.append(record)
+
+    def upsert(
+        self,
+        name: str,
+        rarity: str,
+        character_info: str | None,
+        image_link: str | None,
+        base_character: str | None = None,
+    ) -> OCRecord:
+        """Adds an OC or replaces the existing one with the same name."""
+        record = OCRecord(
+            self._card_id_for(name),
+            name,
+            normalize_rarity(rarity),
+            character_info,
+            image_link,
+            base_character,
+        )
+        previous = self._by_id.get(record.card_id)
+        if previous is not None and previous.rarity != record.rarity:
+            self.rarity_version += 1
+        old = self._by_name.get(name)
+        if old is None:
+            self._link_rarity(record)
+            self._by_folded[name.casefold()] = name
+        elif old.rarity != record.rarity:
+            self._unlink_rarity(old)
+            self._link_rarity(record)
+        else:
+            self._by_rarity[record.rarity][self._positions[name]] = record
+
+        if old is not None and old.base_character != base_character:
+            self._remove_skin(old)
+        if base_character is not None:
+            family = self._skin_families.setdefault(base_character, [])
+            if name not in family:
+                family.append(name)
+
+        self._by_name[name] = record
+        self._by_id[record.card_id] = record
+        self.version += 1
+        return record
+
+    def remove(self, name: str) -> OCRecord | None:
+        """Removes an OC. Returns the removed record, or None if it was not there."""
+        record = self._by_name.pop(name, None)
+        if record is None:
+            return None
+        self._unlink_rarity(record)
+        if self._by_folded.get(name.casefold()) == name:
+            del self._by_folded[name.casefold()]
+        self._remove_skin(record)
+        self.version += 1
+        return record
+
+    def _remove_skin(self, record: OCRecord):
+        family = self._skin_families.get(record.base_character)
+        if family and record.name in family:
+            family.remove(record.name)
+            if not family:
+                del self._skin_families[record.base_character]
+
+    def clear(self):
+        # The id table is kept, inventory entries still point into it
+        self._by_name.clear()
+        self._by_folded.clear()
+        self._by_rarity.clear()
+        self._positions.clear()
+        self._skin_families.clear()
+        self.version += 1
+
+    def load(self, rows: Iterable[dict], resolve_base=None):
+        """Replaces the catalog with rows holding name, rarity, character_info and image_link.
+        resolve_base maps a name to its base character, if any.
+
+        The new indexes are built off to the side and swapped in together,
+        so readers see either the old catalog or the new one, never a
+        half-filled or empty one.
+        """
+        staged = OCCatalog()
+        # Share card IDs and start from the current id table so IDs stay stable
+        staged._card_ids = self._card_ids
+        staged._by_id = dict(self._by_id)
+        for row in rows:
+            name = row["name"]
+            staged.upsert(
+                name,
+                row["rarity"],
+                row.get("character_info"),
+                row.get("image_link"),
+                resolve_base(name) if resolve_base else None,
+            )
+
+        # ── Swap, no awaits or failures possible below ──
+        self._by_name = staged._by_name
+        self._by_folded = staged._by_folded
+        self._by_rarity = staged._by_rarity
+        self._positions = staged._positions
+        self._skin_families = staged._skin_families
+        self._by_id = staged._by_id
+        self.rarity_version += staged.rarity_version
+        self.version += 1
@@ -1,239 +1,128 @@
 import discord
 
-from utils.db.ocs_db import fetch_all_ocs, fetch_all_ocs_by_rarity
+from config.ocs import OCS_RARITY_MAP, resolve_base_character
+from utils.db.ocs_db import fetch_all_ocs
 from utils.logs.pretty_log import pretty_log
 
-from .cache_list import (
-    common_ocs_cache,
-    epic_ocs_cache,
-    legendary_ocs_cache,
-    ocs_cache,
-    rare_ocs_cache,
+from .cache_list import oc_catalog
+from .gacha_embed_cache import (
+    clear_gacha_embed_cache,
+    invalidate_gacha_embed,
+    load_gacha_embed_cache,
 )
+from .oc_catalog import OCRecord
+
+# The gacha sampler rebuilds itself whenever oc_catalog.version changes,
+# so nothing here has to mark it dirty.
 
 
 def clear_all_ocs_cache():
     """Clears all OC caches."""
-
-    import utils.cache.cache_list as cache_list
-
-    cache_list.ocs_cache = []
-    cache_list.common_ocs_cache = []
-    cache_list.rare_ocs_cache = []
-    cache_list.epic_ocs_cache = []
-    cache_list.legendary_ocs_cache = []
+    oc_catalog.clear()
+    clear_gacha_embed_cache()
     pretty_log(tag="info", message="Cleared all OC caches.")
 
 
 async def load_ocs_cache(bot: discord.Client):
-    """Loads all OCs from the database into the cache."""
-    # Clear existing caches first
-    clear_all_ocs_cache()
+    """Loads all OCs from the database into the cache with a single query.
 
+    The current catalog keeps serving pulls until the new one is built and
+    swapped in, and is kept as is if the query fails.
+    """
     try:
+        rows = await fetch_all_ocs(bot)
+        if rows is None:
+            pretty_log(
+                tag="warn",
+                message="Could not load OCs from the database, keeping the cached catalog.",
+            )
+            return
+        oc_catalog.load(rows, resolve_base_character)
+        pretty_log(tag="info", message=f"Loaded {len(oc_catalog)} OCs into cache.")
+        for rarity in OCS_RARITY_MAP:
+            pretty_log(
+                tag="info",
+                message=f"Loaded {oc_catalog.count(rarity)} {rarity} OCs into cache.",
+            )
+        load_gacha_embed_cache()
 
-        import utils.cache.cache_list as cache_list
-
-        # Always wrap each OC dict from DB in the expected nested format
-        def wrap_oc_entry(oc):
-            normalized_rarity = str(oc["rarity"]).strip().title()
-            return {
-                oc["name"]: {
-                    "rarity": normalized_rarity,
-                    "character_info": oc["character_info"],
-                    "image_link": oc["image_link"],
-                }
-            }
-
-        # Mutate the lists in place so all references see the update
-        cache_list.ocs_cache.clear()
-        cache_list.ocs_cache.extend(
-            [wrap_oc_entry(oc) for oc in await fetch_all_ocs(bot)]
-        )
+    except Exception as e:
         pretty_log(
-            tag="info", message=f"Loaded {len(cache_list.ocs_cache)} OCs into cache."
+            tag="error",
+            message=f"Error loading OCs into cache: {e}",
+            include_trace=True,
         )
 
-        cache_list.common_ocs_cache.clear()
-        cache_list.common_ocs_cache.extend(
-            [wrap_oc_entry(oc) for oc in await fetch_all_ocs_by_rarity(bot, "Common")]
-        )
-        pretty_log(
-            tag="info",
-            message=f"Loaded {len(cache_list.common_ocs_cache)} Common OCs into cache.",
-        )
 
-        cache_list.rare_ocs_cache.clear()
-        cache_list.rare_ocs_cache.extend(
-            [wrap_oc_entry(oc) for oc in await fetch_all_ocs_by_rarity(bot, "Rare")]
-        )
-        pretty_log(
-            tag="info",
-            message=f"Loaded {len(cache_list.rare_ocs_cache)} Rare OCs into cache.",
-        )
+def get_oc(name: str) -> OCRecord | None:
+    """Returns the cached OC with exactly this name."""
+    return oc_catalog.get(name)
 
-        cache_list.epic_ocs_cache.clear()
-        cache_list.epic_ocs_cache.extend(
-            [wrap_oc_entry(oc) for oc in await fetch_all_ocs_by_rarity(bot, "Epic")]
-        )
-        pretty_log(
-            tag="info",
-            message=f"Loaded {len(cache_list.epic_ocs_cache)} Epic OCs into cache.",
-        )
 
-        cache_list.legendary_ocs_cache.clear()
-        cache_list.legendary_ocs_cache.extend(
-            [
-                wrap_oc_entry(oc)
-                for oc in await fetch_all_ocs_by_rarity(bot, "Legendary")
-            ]
-        )
-        pretty_log(
-            tag="info",
-            message=f"Loaded {len(cache_list.legendary_ocs_cache)} Legendary OCs into cache.",
-        )
+def find_oc(name: str) -> OCRecord | None:
+    """Returns the cached OC with this name, ignoring case."""
+    return oc_catalog.find(name)
 
-    except Exception as e:
-        pretty_log(
-            tag="error",
-            message=f"Error loading OCs into cache: {e}",
-            include_trace=True,
-        )
+
+def get_skin_family(base_character: str) -> list[str]:
+    """Returns the names of all skins of a base OC."""
+    return oc_catalog.skin_family(base_character)
 
 
 def get_total_count_by_rarity(rarity: str) -> int:
     """Returns the total count of OCs in the cache for a given rarity."""
-    import utils.cache.cache_list as cache_list
-
-    rarity_cache_map = {
-        "Common": cache_list.common_ocs_cache,
-        "Rare": cache_list.rare_ocs_cache,
-        "Epic": cache_list.epic_ocs_cache,
-        "Legendary": cache_list.legendary_ocs_cache,
-    }
-    cache = rarity_cache_map.get(rarity)
-    if cache is not None:
-        return len(cache)
-    return 0
+    return oc_catalog.count(rarity)
 
 
 def get_total_count_all_ocs() -> int:
     """Returns the total count of all OCs in the main cache."""
-    import utils.cache.cache_list as cache_list
-
-    return len(cache_list.ocs_cache)
+    return len(oc_catalog)
 
 
 def get_overall_total_count() -> int:
     """Returns the overall total count of OCs across all rarity caches as an integer."""
-    import utils.cache.cache_list as cache_list
-
-    common_count = len(cache_list.common_ocs_cache)
-    rare_count = len(cache_list.rare_ocs_cache)
-    epic_count = len(cache_list.epic_ocs_cache)
-    legendary_count = len(cache_list.legendary_ocs_cache)
-    total_count = common_count + rare_count + epic_count + legendary_count
-    return total_count
+    return sum(oc_catalog.count(rarity) for rarity in OCS_RARITY_MAP)
 
 
 def get_overall_count_str() -> str:
     """Returns a string with the count of OCs by rarity and total."""
-    import utils.cache.cache_list as cache_list
-
-    common_count = len(cache_list.common_ocs_cache)
-    rare_count = len(cache_list.rare_ocs_cache)
-    epic_count = len(cache_list.epic_ocs_cache)
-    legendary_count = len(cache_list.legendary_ocs_cache)
-    total_count = common_count + rare_count + epic_count + legendary_count
-    count_str = f"Common: {common_count} | Rare: {rare_count} | Epic: {epic_count} | Legendary: {legendary_count} | Total: {total_count}"
-    return count_str
-
-
-async def edit_oc_cache(bot, name: str, character_info: str, image_link: str):
-    """Edits an existing OC in the cache."""
-    import utils.cache.cache_list as cache_list
-
-    def edit_in_cache(cache: list[dict[str, dict[str, str]]], name: str):
-        for i, oc in enumerate(cache):
-            if name in oc:
-                cache[i] = {
-                    name: {
-                        "character_info": character_info,
-                        "image_link": image_link,
-                    }
-                }
-                return
-
-    edit_in_cache(cache_list.ocs_cache, name)
-    edit_in_cache(cache_list.common_ocs_cache, name)
-    edit_in_cache(cache_list.rare_ocs_cache, name)
-    edit_in_cache(cache_list.epic_ocs_cache, name)
-    edit_in_cache(cache_list.legendary_ocs_cache, name)
+    counts = {rarity: oc_catalog.count(rarity) for rarity in OCS_RARITY_MAP}
+    total_count = sum(counts.values())
+    count_str = " | ".join(f"{rarity}: {count}" for rarity, count in counts.items())
+    return f"{count_str} | Total: {total_count}"
+
+
+def edit_oc_cache(name: str, rarity: str, character_info: str, image_link: str):
+    """Applies an edited OC row to the catalog in place.
+    A rarity change moves the record to its new rarity array and bumps the version."""
+    record = oc_catalog.get(name)
+    base_character = (
+        record.base_character if record is not None else resolve_base_character(name)
+    )
+    oc_catalog.upsert(name, rarity, character_info, image_link, base_character)
+    invalidate_gacha_embed(name)
     pretty_log(tag="info", message=f"Edited OC '{name}' in all caches.")
-    # Reload caches to ensure consistency
-    await load_ocs_cache(bot)
 
 
-def list_all_oc_names() -> list[str]:
-    """Returns a list of all OC names in the main cache."""
-    import utils.cache.cache_list as cache_list
-
-    return [list(oc.keys())[0] for oc in cache_list.ocs_cache]
+def list_all_oc_names() -> tuple[str, ...]:
+    """Returns all OC names in the catalog snapshot."""
+    return oc_catalog.snapshot().names
 
 
 def upsert_oc_cache(name: str, rarity: str, character_info: str, image_link: str):
     """Upserts an OC into the appropriate cache based on its rarity."""
-    import utils.cache.cache_list as cache_list
-
-    normalized_rarity = str(rarity).strip().title()
-    oc_entry = {
-        name: {
-            "character_info": character_info,
-            "image_link": image_link,
-            "rarity": normalized_rarity,
-        }
-    }
-    # Upsert into the main ocs_cache
-    for i, oc in enumerate(cache_list.ocs_cache):
-        if name in oc:
-            cache_list.ocs_cache[i] = oc_entry
-            break
-    else:
-        cache_list.ocs_cache.append(oc_entry)
-    # Upsert into the specific rarity cache
-    rarity_cache_map = {
-        "Common": cache_list.common_ocs_cache,
-        "Rare": cache_list.rare_ocs_cache,
-        "Epic": cache_list.epic_ocs_cache,
-        "Legendary": cache_list.legendary_ocs_cache,
-    }
-    rarity_cache = rarity_cache_map.get(normalized_rarity)
-    if rarity_cache is not None:
-        for i, oc in enumerate(rarity_cache):
-            if name in oc:
-                rarity_cache[i] = oc_entry
-                break
-        else:
-            rarity_cache.append(oc_entry)
+    record = oc_catalog.upsert(
+        name, rarity, character_info, image_link, resolve_base_character(name)
+    )
+    invalidate_gacha_embed(name)
     pretty_log(
         tag="info",
-        message=f"Upserted OC '{name}' with rarity '{normalized_rarity}' into cache.",
+        message=f"Upserted OC '{name}' with rarity '{record.rarity}' into cache.",
     )
 
 
 def remove_oc_from_cache(name: str):
     """Removes an OC from all caches."""
-    import utils.cache.cache_list as cache_list
-
-    def remove_from_cache(cache: list[dict[str, dict[str, str]]], name: str):
-        for i, oc in enumerate(cache):
-            if name in oc:
-                del cache[i]
-                return
-
-    remove_from_cache(cache_list.ocs_cache, name)
-    remove_from_cache(cache_list.common_ocs_cache, name)
-    remove_from_cache(cache_list.rare_ocs_cache, name)
-    remove_from_cache(cache_list.epic_ocs_cache, name)
-    remove_from_cache(cache_list.legendary_ocs_cache, name)
+    oc_catalog.remove(name)
+    invalidate_gacha_embed(name)
     pretty_log(tag="info", message=f"Removed OC '{name}' from all caches.")
@@ -1,18 +1,130 @@
+import asyncio
+
 import discord
 
-from utils.db.user_oc_inv import fetch_all_user_oc_invs
+from config.gacha import INV_CACHE_LAZY
+from utils.db.user_oc_inv import (
+    UserId,
+    fetch_all_user_oc_invs,
+    fetch_user_oc_inv,
+    to_user_id,
+)
 from utils.logs.pretty_log import pretty_log
 
 from .cache_list import user_oc_inv_cache
+from .user_inv_lru import UserInvCache
+from .inv_entry import (
+    EMPTY_USER_INV_SNAPSHOT,
+    InvEntry,
+    SnapshotInvEntry,
+    UserInventory,
+    UserInventorySnapshot,
+    make_inv_entry,
+)
+
+# Entries only hold (card_id, owned). Card details come from the OC catalog
+# and user_name is kept in Postgres only, nothing reads it from the cache.
+#
+# In lazy mode (INV_CACHE_LAZY) a user's inventory is loaded on first use by
+# ensure_user_oc_inv_cache and may be evicted again later. Cache writes for a
+# user that is not loaded are skipped, Postgres already has the change and
+# the next load picks it up.
+#
+# Readers that keep a user's inventory across an await (paginators,
+# autocomplete) should use get_user_oc_inv_snapshot, which hands out the
+# frozen view of the current version instead of the live entries.
+
+# user_id -> load in progress, so concurrent first accesses share one query
+_loading_user_invs: dict[UserId, asyncio.Task] = {}
+
+
+def _user_inv_for_write(user_id: UserId) -> UserInventory | None:
+    """Returns the inventory to apply a cache write to, or None to skip it."""
+    user_id = to_user_id(user_id)
+    user_inv = user_oc_inv_cache.get(user_id)
+    if user_inv is None and not INV_CACHE_LAZY:
+        user_inv = user_oc_inv_cache[user_id] = UserInventory()
+    return user_inv
+
+
+def _row_to_entry(row: dict) -> InvEntry:
+    return make_inv_entry(
+        row["card_name"],
+        row["rarity"],
+        row["character_info"],
+        row["image_link"],
+        row["owned"],
+    )
+
+
+async def _load_user_oc_inv(bot: discord.Client, user_id: UserId) -> UserInventory:
+    from utils.db.inv_write_buffer import inv_write_buffer
+
+    # Changes still in the write buffer are not in Postgres yet, add them on top
+    rows, pending_rows = await inv_write_buffer.fetch_with_pending(
+        user_id, lambda: fetch_user_oc_inv(bot, user_id)
+    )
+    user_inv = UserInventory([_row_to_entry(row) for row in rows])
+    for row in pending_rows:
+        user_inv.add_owned(_row_to_entry(row))
+    user_oc_inv_cache[user_id] = user_inv
+    return user_inv
+
+
+async def ensure_user_oc_inv_cache(bot: discord.Client, user_id: UserId) -> UserInventory:
+    """Returns a user's cached inventory, loading it from the database if needed.
+    Users with no cards get an empty inventory, which is cached too."""
+    user_id = to_user_id(user_id)
+    user_inv = user_oc_inv_cache.get(user_id)
+    if user_inv is not None:
+        return user_inv
+    task = _loading_user_invs.get(user_id)
+    if task is None:
+        task = asyncio.create_task(_load_user_oc_inv(bot, user_id))
+        _loading_user_invs[user_id] = task
+        task.add_done_callback(lambda _: _loading_user_invs.pop(user_id, None))
+    try:
+        return await asyncio.shield(task)
+    except Exception as e:
+        pretty_log(
+            tag="error",
+            message=f"Error loading OC inventory into cache for user '{user_id}': {e}",
+        )
+        return UserInventory()
+
+
+async def reload_user_oc_inv_cache(bot: discord.Client, user_id: UserId):
+    """Reloads a cached user's inventory from the database. Users not in the cache are skipped."""
+    if user_id not in user_oc_inv_cache:
+        return
+    try:
+        await _load_user_oc_inv(bot, user_id)
+    except Exception as e:
+        pretty_log(
+            tag="error",
+            message=f"Error reloading OC inventory cache for user '{user_id}': {e}",
+        )
+        # Better to load it again on next access than to keep a stale copy
+        user_oc_inv_cache.pop(user_id)
 
 
 async def load_all_user_oc_inv_cache(bot: discord.Client):
-    """Loads all user OC inventories from the database into the cache."""
+    """Loads all user OC inventories from the database into the cache.
+    In lazy mode the cache is only cleared, users load on first access."""
     # Clear existing cache first
     user_oc_inv_cache.clear()
+    if INV_CACHE_LAZY:
+        pretty_log(
+            tag="info",
+            message="User OC inventories will be loaded into cache on first access.",
+        )
+        return user_oc_inv_cache
     try:
         user_invs = await fetch_all_user_oc_invs(bot)
-        user_oc_inv_cache.update(user_invs)
+        for user_id, rows in user_invs.items():
+            user_oc_inv_cache[user_id] = UserInventory(
+                [_row_to_entry(row) for row in rows]
+            )
         pretty_log(
             tag="info",
             message=f"Loaded OC inventories for {len(user_oc_inv_cache)} users into cache.",
@@ -25,18 +137,22 @@ async def load_all_user_oc_inv_cache(bot: discord.Client):
     return user_oc_inv_cache
 
 
-def get_user_oc_inv_cache() -> dict[int, list[dict[str, str]]]:
+def get_user_oc_inv_cache() -> UserInvCache:
     """Returns the entire user OC inventory cache."""
     return user_oc_inv_cache
 
 
-def list_oc_names_in_user_inv_cache(user_id: int) -> list[str]:
+def get_user_oc_inv_snapshot(user_id: UserId) -> UserInventorySnapshot:
+    """Returns the frozen view of a user's cached inventory, empty if it is not cached."""
+    user_inv = user_oc_inv_cache.get(user_id)
+    return user_inv.snapshot() if user_inv is not None else EMPTY_USER_INV_SNAPSHOT
+
+
+def list_oc_names_in_user_inv_cache(user_id: UserId) -> tuple[str, ...]:
     """Lists all OC card names in a user's inventory from the cache."""
-    oc_names = []
+    oc_names = ()
     try:
-        user_inv = user_oc_inv_cache.get(user_id, [])
-        for entry in user_inv:
-            oc_names.append(entry.get("card_name", ""))
+        oc_names = get_user_oc_inv_snapshot(user_id).names()
     except Exception as e:
         pretty_log(
             tag="error",
@@ -45,71 +161,32 @@ def list_oc_names_in_user_inv_cache(user_id: int) -> list[str]:
     return oc_names
 
 
-def total_cards_owned_cache(user_id: int) -> int:
-    """Calculates the total number of OC cards owned by a user from the cache."""
-    total_owned = 0
-    try:
-        user_inv = user_oc_inv_cache.get(user_id, [])
-        for entry in user_inv:
-            total_owned += entry.get("owned", 0)
-    except Exception as e:
-        pretty_log(
-            tag="error",
-            message=f"Error calculating total cards owned from cache for user '{user_id}': {e}",
-        )
-    return total_owned
+def total_cards_owned_cache(user_id: UserId) -> int:
+    """Returns the total number of OC cards owned by a user from the cache."""
+    user_inv = user_oc_inv_cache.get(user_id)
+    return user_inv.total_owned if user_inv is not None else 0
 
 
-def total_unique_cards_owned_cache(user_id: int) -> int:
-    """Calculates the total number of unique OC cards owned by a user from the cache."""
-    unique_count = 0
-    try:
-        user_inv = user_oc_inv_cache.get(user_id, [])
-        for entry in user_inv:
-            if entry.get("owned", 0) > 0:
-                unique_count += 1
-    except Exception as e:
-        pretty_log(
-            tag="error",
-            message=f"Error calculating total unique cards owned from cache for user '{user_id}': {e}",
-        )
-    return unique_count
+def total_unique_cards_owned_cache(user_id: UserId) -> int:
+    """Returns the total number of unique OC cards owned by a user from the cache."""
+    user_inv = user_oc_inv_cache.get(user_id)
+    return user_inv.unique_owned if user_inv is not None else 0
 
 
-def total_owned_cards_by_rarity_cache(user_id: int, rarity: str) -> int:
-    """Calculates the total number of OC cards owned by a user of a specific rarity from the cache."""
-    total_owned = 0
-    try:
-        user_inv = user_oc_inv_cache.get(user_id, [])
-        for entry in user_inv:
-            if entry.get("rarity") == rarity:
-                total_owned += entry.get("owned", 0)
-    except Exception as e:
-        pretty_log(
-            tag="error",
-            message=f"Error calculating total owned cards by rarity from cache for user '{user_id}', rarity '{rarity}': {e}",
-        )
-    return total_owned
+def total_owned_cards_by_rarity_cache(user_id: UserId, rarity: str) -> int:
+    """Returns the total number of OC cards owned by a user of a specific rarity from the cache."""
+    user_inv = user_oc_inv_cache.get(user_id)
+    return user_inv.owned_by_rarity(rarity) if user_inv is not None else 0
 
 
-def total_unique_cards_by_rarity_cache(user_id: int, rarity: str) -> int:
-    """Calculates the total number of unique OC cards owned by a user of a specific rarity from the cache."""
-    unique_count = 0
-    try:
-        user_inv = user_oc_inv_cache.get(user_id, [])
-        for entry in user_inv:
-            if entry.get("rarity") == rarity and entry.get("owned", 0) > 0:
-                unique_count += 1
-    except Exception as e:
-        pretty_log(
-            tag="error",
-            message=f"Error calculating total unique cards by rarity from cache for user '{user_id}', rarity '{rarity}': {e}",
-        )
-    return unique_count
+def total_unique_cards_by_rarity_cache(user_id: UserId, rarity: str) -> int:
+    """Returns the total number of unique OC cards owned by a user of a specific rarity from the cache."""
+    user_inv = user_oc_inv_cache.get(user_id)
+    return user_inv.unique_by_rarity(rarity) if user_inv is not None else 0
 
 
 def upsert_user_oc_inv_cache(
-    user_id: int,
+    user_id: UserId,
     user_name: str,
     card_name: str,
     rarity: str,
@@ -119,60 +196,71 @@ def upsert_user_oc_inv_cache(
 ):
     """Upserts a user's OC inventory entry into the cache."""
     try:
-        user_inv = user_oc_inv_cache.get(user_id, [])
-        # Check if the entry already exists
-        for entry in user_inv:
-            if entry["card_name"] == card_name:
-                # Update existing entry
-                entry["user_name"] = user_name
-                entry["rarity"] = rarity
-                entry["character_info"] = character_info
-                entry["image_link"] = image_link
-                entry["owned"] = owned
-                pretty_log(
-                    tag="info",
-                    message=f"Updated OC '{card_name}' for user ID '{user_id}' in cache.",
-                )
-                return
-        # If not found, add new entry
-        new_entry = {
-            "user_name": user_name,
-            "card_name": card_name,
-            "rarity": rarity,
-            "character_info": character_info,
-            "image_link": image_link,
-            "owned": owned,
-        }
-        user_inv.append(new_entry)
-        user_oc_inv_cache[user_id] = user_inv
+        user_inv = _user_inv_for_write(user_id)
+        if user_inv is None:
+            return
+        is_new = card_name not in user_inv
+        user_inv.upsert(
+            make_inv_entry(card_name, rarity, character_info, image_link, owned)
+        )
+        if is_new:
+            pretty_log(
+                tag="info",
+                message=f"Added new OC '{card_name}' for user ID '{user_id}' to cache.",
+            )
+        else:
+            pretty_log(
+                tag="info",
+                message=f"Updated OC '{card_name}' for user ID '{user_id}' in cache.",
+            )
+    except Exception as e:
+        pretty_log(
+            tag="error",
+            message=f"Error upserting user OC inventory in cache for user '{user_id}', card '{card_name}': {e}",
+        )
+
+
+def add_user_oc_pulls_cache(user_id: UserId, user_name: str, pulls: list[dict]):
+    """Adds a batch of pulled OCs to a user's inventory cache, adding to existing counts."""
+    try:
+        user_inv = _user_inv_for_write(user_id)
+        if user_inv is None:
+            return
+        for pull in pulls:
+            user_inv.add_owned(_row_to_entry(pull))
         pretty_log(
             tag="info",
-            message=f"Added new OC '{card_name}' for user ID '{user_id}' to cache.",
+            message=f"Added {len(pulls)} pulled OCs for user ID '{user_id}' to cache.",
         )
     except Exception as e:
         pretty_log(
             tag="error",
-            message=f"Error upserting user OC inventory in cache for user '{user_id}', card '{card_name}': {e}",
+            message=f"Error adding pulled OCs to cache for user '{user_id}': {e}",
         )
 
 
-def fetch_user_oc_inv_cache(user_id: int) -> list[dict[str, str]]:
-    """Fetches a user's OC inventory from the cache."""
-    return user_oc_inv_cache.get(user_id, [])
+def fetch_user_oc_inv_cache(user_id: UserId) -> tuple[SnapshotInvEntry, ...]:
+    """Fetches a user's OC inventory from the cache, in the order cards were added."""
+    return get_user_oc_inv_snapshot(user_id).entries
+
 
+def get_user_oc_entry_cache(user_id: UserId, card_name: str) -> InvEntry | None:
+    """Returns one card from a user's inventory cache."""
+    user_inv = user_oc_inv_cache.get(user_id)
+    return user_inv.get(card_name) if user_inv is not None else None
 
-def increment_oc_owned_cache(user_id: int, card_name: str):
+
+def increment_oc_owned_cache(user_id: UserId, card_name: str):
     """Increments the 'owned' count for a specific OC in a user's inventory cache."""
     try:
-        user_inv = user_oc_inv_cache.get(user_id, [])
-        for entry in user_inv:
-            if entry["card_name"] == card_name:
-                entry["owned"] += 1
-                pretty_log(
-                    tag="info",
-                    message=f"Incremented 'owned' count for OC '{card_name}' for user ID '{user_id}' in cache.",
-                )
-                break
+        user_inv = user_oc_inv_cache.get(user_id)
+        entry = user_inv.get(card_name) if user_inv is not None else None
+        if entry is not None:
+            user_inv.set_owned(card_name, entry.owned + 1)
+            pretty_log(
+                tag="info",
+                message=f"Incremented 'owned' count for OC '{card_name}' for user ID '{user_id}' in cache.",
+            )
     except Exception as e:
         pretty_log(
             tag="error",
@@ -180,19 +268,17 @@ def increment_oc_owned_cache(user_id: int, card_name: str):
         )
 
 
-def decrement_oc_owned_cache(user_id: int, card_name: str):
+def decrement_oc_owned_cache(user_id: UserId, card_name: str):
     """Decrements the 'owned' count for a specific OC in a user's inventory cache."""
     try:
-        user_inv = user_oc_inv_cache.get(user_id, [])
-        for entry in user_inv:
-            if entry["card_name"] == card_name:
-                if entry["owned"] > 0:
-                    entry["owned"] -= 1
-                    pretty_log(
-                        tag="info",
-                        message=f"Decremented 'owned' count for OC '{card_name}' for user ID '{user_id}' in cache.",
-                    )
-                break
+        user_inv = user_oc_inv_cache.get(user_id)
+        entry = user_inv.get(card_name) if user_inv is not None else None
+        if entry is not None and entry.owned > 0:
+            user_inv.set_owned(card_name, entry.owned - 1)
+            pretty_log(
+                tag="info",
+                message=f"Decremented 'owned' count for OC '{card_name}' for user ID '{user_id}' in cache.",
+            )
     except Exception as e:
         pretty_log(
             tag="error",
@@ -201,21 +287,18 @@ def decrement_oc_owned_cache(user_id: int, card_name: str):
 
 
 def update_oc_owned_cache(
-    user_id: int,
+    user_id: UserId,
     card_name: str,
     new_owned: int,
 ):
     """Updates the 'owned' count for a specific OC in a user's inventory cache."""
     try:
-        user_inv = user_oc_inv_cache.get(user_id, [])
-        for entry in user_inv:
-            if entry["card_name"] == card_name:
-                entry["owned"] = new_owned
-                pretty_log(
-                    tag="info",
-                    message=f"Updated 'owned' count for OC '{card_name}' for user ID '{user_id}' to {new_owned} in cache.",
-                )
-                break
+        user_inv = user_oc_inv_cache.get(user_id)
+        if user_inv is not None and user_inv.set_owned(card_name, new_owned):
+            pretty_log(
+                tag="info",
+                message=f"Updated 'owned' count for OC '{card_name}' for user ID '{user_id}' to {new_owned} in cache.",
+            )
     except Exception as e:
         pretty_log(
             tag="error",
@@ -223,7 +306,7 @@ def update_oc_owned_cache(
         )
 
 
-def delete_user_inv_cache(user_id: int):
+def delete_user_inv_cache(user_id: UserId):
     """Deletes a user's OC inventory from the cache."""
     try:
         if user_id in user_oc_inv_cache:
@@ -239,14 +322,17 @@ def delete_user_inv_cache(user_id: int):
         )
 
 
-def fetch_all_rarity_oc_invs_cache(user_id: int, rarity: str) -> list[dict[str, str]]:
+def fetch_all_rarity_oc_invs_cache(
+    user_id: UserId, rarity: str
+) -> tuple[SnapshotInvEntry, ...]:
     """Fetches all OC inventory entries of a specific rarity for a user from the cache."""
-    result = []
+    result = ()
     try:
-        user_inv = user_oc_inv_cache.get(user_id, [])
-        for entry in user_inv:
-            if entry.get("rarity") == rarity:
-                result.append(entry)
+        snapshot = get_user_oc_inv_snapshot(user_id)
+        result = snapshot.cached(
+            ("rarity", rarity),
+            lambda: tuple(e for e in snapshot.entries if e.rarity == rarity),
+        )
     except Exception as e:
         pretty_log(
             tag="error",
@@ -0,0 +1,114 @@
+from collections import OrderedDict
+
+# ╭───────────────────────────────╮
+#   ⭐ User Inventory LRU
+# ╰───────────────────────────────╯
+# Holds UserInventory objects keyed by user ID in least-recently-used order.
+# Once more than max_users are cached, or their estimated size goes over
+# max_bytes, the coldest users are dropped and reloaded on their next access.
+# A limit of 0 means no limit. An empty inventory is cached like any other,
+# so users with nothing do not hit Postgres on every access.
+#
+# Sizes are estimates from the entry count, refreshed whenever a user is
+# read or stored, so they can lag behind pulls made since.
+
+# Sizes from tools/inv_memory.py, which measures a UserInvCache of
+# UserInventory objects (CPython 3.11, 64-bit). The catalog records are shared
+# and not counted here.
+#   base   an empty UserInventory with its cache slots: 383-398 B
+#   entry  per card: 74 B (150 cards) to 108 B (10 cards), plus 68-123 B
+#          once a read has built the snapshot, which copies every entry with
+#          its catalog record. 60 cards: 81 B, 155 B.
+# The entry size is the 60 card figure with a snapshot, so the estimate is
+# close for typical users and on the low side for very small inventories.
+USER_INV_BASE_BYTES = 400
+USER_INV_ENTRY_BYTES = 155
+
+
+def estimate_user_inv_bytes(user_inv) -> int:
+    return USER_INV_BASE_BYTES + USER_INV_ENTRY_BYTES * len(user_inv)
+
+
+class UserInvCache:
+    def __init__(self, max_users: int = 0, max_bytes: int = 0):
+        self.max_users = max_users
+        self.max_bytes = max_bytes
+        self._data: OrderedDict[int, object] = OrderedDict()
+        self._sizes: dict[int, int] = {}
+        self.total_bytes = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __bool__(self) -> bool:
+        return bool(self._data)
+
+    def __contains__(self, user_id: int) -> bool:
+        return user_id in self._data
+
+    def __iter__(self):
+        return iter(self._data)
+
+    def keys(self):
+        return self._data.keys()
+
+    def items(self):
+        return self._data.items()
+
+    def get(self, user_id: int, default=None):
+        """Returns a user's inventory and marks it as recently used."""
+        user_inv = self._data.get(user_id)
+        if user_inv is None:
+            return default
+        self._data.move_to_end(user_id)
+        self._resize(user_id, user_inv)
+        self._evict()
+        return user_inv
+
+    def __getitem__(self, user_id: int):
+        user_inv = self.get(user_id)
+        if user_inv is None:
+            raise KeyError(user_id)
+        return user_inv
+
+    def __setitem__(self, user_id: int, user_inv):
+        self._data[user_id] = user_inv
+        self._data.move_to_end(user_id)
+        self._resize(user_id, user_inv)
+        self._evict()
+
+    def __delitem__(self, user_id: int):
+        del self._data[user_id]
+        self.total_bytes -= self._sizes.pop(user_id, 0)
+
+    def pop(self, user_id: int, default=None):
+        if user_id not in self._data:
+            return default
+        user_inv = self._data[user_id]
+        del self[user_id]
+        return user_inv
+
+    def update(self, user_invs: dict):
+        for user_id, user_inv in user_invs.items():
+            self[user_id] = user_inv
+
+    def clear(self):
+        self._data.clear()
+        self._sizes.clear()
+        self.total_bytes = 0
+
+    def _resize(self, user_id: int, user_inv):
+        size = estimate_user_inv_bytes(user_inv)
+        self.total_bytes += size - self._sizes.get(user_id, 0)
+        self._sizes[user_id] = size
+
+    def _evict(self):
+        # The most recently used user is never evicted
+        while len(self._data) > 1 and (
+            (self.max_users and len(self._data) > self.max_users)
+            or (self.max_bytes and self.total_bytes > self.max_bytes)
+        ):
+            user_id, _ = self._data.popitem(last=False)
+            self.total_bytes -= self._sizes.pop(user_id, 0)
+            self.evictions += 1
@@ -0,0 +1,316 @@
+import asyncio
+import json
+
+import asyncpg
+import discord
+
+from config.gacha import (
+    CACHE_SYNC_ENABLED,
+    CACHE_SYNC_PING_SECONDS,
+    CACHE_SYNC_RECONNECT_MAX_SECONDS,
+    CACHE_SYNC_USER_RELOAD_DELAY_MS,
+)
+from utils.db.get_pg_pool import PG_APPLICATION_NAME
+from utils.db.user_oc_inv import UserId, to_user_id
+from utils.logs.pretty_log import pretty_log
+
+# SQL SCRIPT
+"""CREATE OR REPLACE FUNCTION notify_ocs_change() RETURNS trigger AS $$
+DECLARE
+    src TEXT := current_setting('application_name', true);
+    payload TEXT;
+BEGIN
+    IF TG_OP = 'DELETE' OR (TG_OP = 'UPDATE' AND OLD.name <> NEW.name) THEN
+        PERFORM pg_notify(
+            'nyx_ocs',
+            json_build_object('src', src, 'op', 'D', 'name', OLD.name)::text
+        );
+    END IF;
+    IF TG_OP <> 'DELETE' THEN
+        payload := json_build_object(
+            'src', src, 'op', 'U', 'name', NEW.name, 'rarity', NEW.rarity,
+            'character_info', NEW.character_info, 'image_link', NEW.image_link
+        )::text;
+        -- NOTIFY payloads are capped at 8000 bytes, long rows only send their name
+        IF octet_length(payload) > 7900 THEN
+            payload := json_build_object('src', src, 'op', 'U', 'name', NEW.name)::text;
+        END IF;
+        PERFORM pg_notify('nyx_ocs', payload);
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER ocs_notify
+AFTER INSERT OR UPDATE OR DELETE ON ocs
+FOR EACH ROW EXECUTE FUNCTION notify_ocs_change();
+
+CREATE OR REPLACE FUNCTION notify_user_oc_inv_change() RETURNS trigger AS $$
+DECLARE
+    users JSON;
+    payload TEXT;
+BEGIN
+    SELECT json_agg(DISTINCT user_id) INTO users FROM changed_rows;
+    IF users IS NULL THEN
+        RETURN NULL;
+    END IF;
+    payload := json_build_object(
+        'src', current_setting('application_name', true), 'users', users
+    )::text;
+    -- Too many users for one payload, listeners reload every cached user
+    IF octet_length(payload) > 7900 THEN
+        payload := json_build_object(
+            'src', current_setting('application_name', true), 'users', NULL
+        )::text;
+    END IF;
+    PERFORM pg_notify('nyx_user_oc_inv', payload);
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER user_oc_inv_notify_insert
+AFTER INSERT ON user_oc_inv REFERENCING NEW TABLE AS changed_rows
+FOR EACH STATEMENT EXECUTE FUNCTION notify_user_oc_inv_change();
+
+CREATE TRIGGER user_oc_inv_notify_update
+AFTER UPDATE ON user_oc_inv REFERENCING NEW TABLE AS changed_rows
+FOR EACH STATEMENT EXECUTE FUNCTION notify_user_oc_inv_change();
+
+CREATE TRIGGER user_oc_inv_notify_delete
+AFTER DELETE ON user_oc_inv REFERENCING OLD TABLE AS changed_rows
+FOR EACH STATEMENT EXECUTE FUNCTION notify_user_oc_inv_change();"""
+
+# ╭───────────────────────────────╮
+#   ⭐ Cross-Process Cache Sync
+# ╰───────────────────────────────╯
+# Listens on its own connection (LISTEN needs a connection that is never
+# returned to the pool) for the notifications sent by the triggers above.
+#
+# Payloads carry the application_name of the connection that made the
+# change. Changes from this process are already in the caches and skipped.
+#   nyx_ocs          one row per OC change, applied to the catalog directly.
+#                    A payload without the row (too long) or that cannot be
+#                    read makes that one OC be fetched again.
+#   nyx_user_oc_inv  the user IDs changed by one statement. Cached users are
+#                    reloaded with one query each, which keeps changes still
+#                    in this process's write buffer on top.
+#
+# Notifications sent while the listener is disconnected are lost, so every
+# reconnect reloads the OC catalog and the inventory cache.
+
+OCS_CHANNEL = "nyx_ocs"
+USER_OC_INV_CHANNEL = "nyx_user_oc_inv"
+
+
+class CacheSync:
+    def __init__(self):
+        self.bot: discord.Client | None = None
+        self._conn: asyncpg.Connection | None = None
+        self._task: asyncio.Task | None = None
+        self._lost = asyncio.Event()
+        self._synced = False
+        self._dirty_users: set[UserId] = set()
+        self._reload_all_users = False
+        self._user_reload_task: asyncio.Task | None = None
+        # Keeps fetch tasks alive until they finish
+        self._tasks: set[asyncio.Task] = set()
+
+    @property
+    def in_sync(self) -> bool:
+        """True while listening with no catch-up reload still running."""
+        if not CACHE_SYNC_ENABLED:
+            return True
+        return self._synced and (
+            self._user_reload_task is None or self._user_reload_task.done()
+        )
+
+    # -------------------- Notifications --------------------
+    def _spawn(self, coro):
+        task = asyncio.create_task(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    def _parse(self, channel: str, payload: str) -> dict | None:
+        try:
+            data = json.loads(payload)
+            if isinstance(data, dict):
+                return data
+        except ValueError:
+            pass
+        pretty_log(
+            tag="warn",
+            message=f"Unreadable cache sync payload on '{channel}': {payload[:200]}",
+        )
+        return None
+
+    def _on_ocs(self, conn, pid, channel, payload):
+        data = self._parse(channel, payload)
+        if data is None:
+            self._spawn(self._reload_ocs())
+            return
+        if data.get("src") == PG_APPLICATION_NAME:
+            return
+        name = data.get("name")
+        if not isinstance(name, str):
+            self._spawn(self._reload_ocs())
+            return
+
+        from utils.cache.ocs_cache import remove_oc_from_cache, upsert_oc_cache
+
+        if data.get("op") == "D":
+            remove_oc_from_cache(name)
+        elif "rarity" in data:
+            upsert_oc_cache(
+                name, data["rarity"], data.get("character_info"), data.get("image_link")
+            )
+        else:
+            self._spawn(self._reload_oc(name))
+
+    def _on_user_oc_inv(self, conn, pid, channel, payload):
+        data = self._parse(channel, payload)
+        if data is not None and data.get("src") == PG_APPLICATION_NAME:
+            return
+        users = data.get("users") if data is not None else None
+        if isinstance(users, list):
+            for user_id in users:
+                try:
+                    self._dirty_users.add(to_user_id(user_id))
+                except (TypeError, ValueError):
+                    self._reload_all_users = True
+        else:
+            self._reload_all_users = True
+        if self._user_reload_task is None or self._user_reload_task.done():
+            self._user_reload_task = asyncio.create_task(self._reload_users())
+
+    def _on_termination(self, conn):
+        self._synced = False
+        self._lost.set()
+
+    # -------------------- Reloads --------------------
+    async def _reload_oc(self, name: str):
+        from utils.cache.ocs_cache import upsert_oc_cache
+        from utils.db.ocs_db import fetch_oc
+
+        row = await fetch_oc(self.bot, name)
+        if row is None:
+            # Deleted since, or the fetch failed. The full load tells them apart
+            await self._reload_ocs()
+        else:
+            upsert_oc_cache(
+                row["name"], row["rarity"], row["character_info"], row["image_link"]
+            )
+
+    async def _reload_ocs(self):
+        from utils.cache.ocs_cache import load_ocs_cache
+
+        await load_ocs_cache(self.bot)
+
+    async def _reload_users(self):
+        from utils.cache.user_inv_cache import (
+            load_all_user_oc_inv_cache,
+            reload_user_oc_inv_cache,
+        )
+        from utils.db.inv_write_buffer import inv_write_buffer
+
+        # Let the rest of a burst arrive, one reload covers all of it
+        await asyncio.sleep(CACHE_SYNC_USER_RELOAD_DELAY_MS / 1000)
+        while self._dirty_users or self._reload_all_users:
+            if self._reload_all_users:
+                self._reload_all_users = False
+                self._dirty_users.clear()
+                # The reload replaces cached rows, write ours first so they are in it
+                await inv_write_buffer.flush()
+                await load_all_user_oc_inv_cache(self.bot)
+                continue
+            user_ids = self._dirty_users
+            self._dirty_users = set()
+            for user_id in user_ids:
+                await reload_user_oc_inv_cache(self.bot, user_id)
+
+    async def _resync(self):
+        pretty_log(
+            tag="info",
+            message="Cache sync listener reconnected, reloading OC and inventory caches.",
+        )
+        await self._reload_ocs()
+        self._reload_all_users = True
+        if self._user_reload_task is None or self._user_reload_task.done():
+            self._user_reload_task = asyncio.create_task(self._reload_users())
+
+    # -------------------- Connection --------------------
+    async def _connect(self):
+        pool = self.bot.pg_pool
+        conn = await asyncpg.connect(
+            dsn=pool.dsn,
+            ssl=pool.ssl_context,
+            server_settings={"application_name": f"{PG_APPLICATION_NAME}-listen"},
+        )
+        conn.add_termination_listener(self._on_termination)
+        await conn.add_listener(OCS_CHANNEL, self._on_ocs)
+        await conn.add_listener(USER_OC_INV_CHANNEL, self._on_user_oc_inv)
+        return conn
+
+    async def _close(self):
+        self._synced = False
+        conn, self._conn = self._conn, None
+        if conn is not None and not conn.is_closed():
+            try:
+                await conn.close(timeout=5)
+            except Exception:
+                conn.terminate()
+
+    async def _run(self):
+        connected_before = False
+        retry_delay = 1
+        while True:
+            try:
+                self._lost.clear()
+                self._conn = await self._connect()
+                retry_delay = 1
+                pretty_log(tag="db", message="Cache sync listener connected.")
+                if connected_before:
+                    await self._resync()
+                connected_before = True
+                self._synced = True
+
+                while not self._lost.is_set():
+                    try:
+                        await asyncio.wait_for(
+                            self._lost.wait(), timeout=CACHE_SYNC_PING_SECONDS
+                        )
+                    except asyncio.TimeoutError:
+                        # A half-open socket never fires the termination listener
+                        await self._conn.execute("SELECT 1;", timeout=10)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                pretty_log(
+                    tag="warn",
+                    message=f"Cache sync listener lost its connection: {e}",
+                )
+            await self._close()
+            await asyncio.sleep(retry_delay)
+            retry_delay = min(retry_delay * 2, CACHE_SYNC_RECONNECT_MAX_SECONDS)
+
+    # -------------------- Lifecycle --------------------
+    async def start(self, bot: discord.Client):
+        """Starts the listener connection. It reconnects on its own if dropped."""
+        self.bot = bot
+        if not CACHE_SYNC_ENABLED:
+            return
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+        pretty_log(tag="info", message="Cache sync listener started.")
+
+    async def stop(self):
+        """Stops listening and closes the listener connection."""
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        if self._user_reload_task is not None:
+            self._user_reload_task.cancel()
+            self._user_reload_task = None
+        await self._close()
+
+
+cache_sync = CacheSync()
@@ -0,0 +1,155 @@
+import datetime
+
+import discord
+
+from utils.db.user_oc_inv import UserId, to_user_id
+from utils.logs.pretty_log import pretty_log
+
+# SQL SCRIPT
+"""ALTER TABLE ocs ADD COLUMN updated_at TIMESTAMPTZ NOT NULL DEFAULT now();
+ALTER TABLE user_oc_inv ADD COLUMN updated_at TIMESTAMPTZ NOT NULL DEFAULT now();
+CREATE INDEX ocs_updated_at_idx ON ocs (updated_at);
+CREATE INDEX user_oc_inv_updated_at_idx ON user_oc_inv (updated_at);
+
+CREATE TABLE cache_tombstones (
+    table_name TEXT NOT NULL,
+    key TEXT NOT NULL,
+    deleted_at TIMESTAMPTZ NOT NULL DEFAULT now()
+);
+CREATE INDEX cache_tombstones_deleted_at_idx ON cache_tombstones (deleted_at);
+
+CREATE OR REPLACE FUNCTION touch_updated_at() RETURNS trigger AS $$
+BEGIN
+    NEW.updated_at := now();
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER ocs_touch BEFORE UPDATE ON ocs
+FOR EACH ROW EXECUTE FUNCTION touch_updated_at();
+CREATE TRIGGER user_oc_inv_touch BEFORE UPDATE ON user_oc_inv
+FOR EACH ROW EXECUTE FUNCTION touch_updated_at();
+
+CREATE OR REPLACE FUNCTION record_ocs_tombstone() RETURNS trigger AS $$
+BEGIN
+    INSERT INTO cache_tombstones (table_name, key) VALUES ('ocs', OLD.name);
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION record_user_oc_inv_tombstone() RETURNS trigger AS $$
+BEGIN
+    INSERT INTO cache_tombstones (table_name, key) VALUES ('user_oc_inv', OLD.user_id::text);
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER ocs_tombstone AFTER DELETE ON ocs
+FOR EACH ROW EXECUTE FUNCTION record_ocs_tombstone();
+CREATE TRIGGER ocs_rename_tombstone AFTER UPDATE OF name ON ocs
+FOR EACH ROW WHEN (OLD.name IS DISTINCT FROM NEW.name)
+EXECUTE FUNCTION record_ocs_tombstone();
+CREATE TRIGGER user_oc_inv_tombstone AFTER DELETE ON user_oc_inv
+FOR EACH ROW EXECUTE FUNCTION record_user_oc_inv_tombstone();
+CREATE TRIGGER user_oc_inv_move_tombstone AFTER UPDATE OF user_id ON user_oc_inv
+FOR EACH ROW WHEN (OLD.user_id IS DISTINCT FROM NEW.user_id)
+EXECUTE FUNCTION record_user_oc_inv_tombstone();"""
+
+# updated_at and cache_tombstones let a cache restored from a disk snapshot
+# catch up with only what changed after the snapshot's watermark, instead of
+# reading both tables again. Deleted rows leave a tombstone, since they have
+# no updated_at to find them by. A renamed OC (or an inventory row moved to
+# another user) leaves one for its old key too, otherwise a restored cache
+# would keep the old entry next to the new one. Tombstones are pruned once no snapshot can
+# be old enough to need them.
+
+
+async def fetch_db_now(bot: discord.Client) -> datetime.datetime | None:
+    """Returns the database clock. Returns None if the query failed."""
+    try:
+        async with bot.pg_pool.acquire() as conn:
+            return await conn.fetchval("SELECT clock_timestamp();")
+    except Exception as e:
+        pretty_log(
+            tag="error",
+            message=f"Error reading the database clock: {e}",
+        )
+        return None
+
+
+async def fetch_ocs_changed_since(
+    bot: discord.Client, since: datetime.datetime
+) -> tuple[list[dict], list[str]] | None:
+    """Returns (changed OC rows, names of deleted OCs) since a time.
+    Returns None if the query failed."""
+    try:
+        async with bot.pg_pool.acquire() as conn:
+            rows = await conn.fetch(
+                """
+                SELECT name, rarity, character_info, image_link
+                FROM ocs WHERE updated_at >= $1;
+                """,
+                since,
+            )
+            deleted = await conn.fetch(
+                """
+                SELECT DISTINCT key FROM cache_tombstones
+                WHERE table_name = 'ocs' AND deleted_at >= $1;
+                """,
+                since,
+            )
+        return [
+            {
+                "name": row["name"],
+                "rarity": row["rarity"],
+                "character_info": row["character_info"],
+                "image_link": row["image_link"],
+            }
+            for row in rows
+        ], [row["key"] for row in deleted]
+    except Exception as e:
+        pretty_log(
+            tag="error",
+            message=f"Error fetching OCs changed since {since}: {e}",
+        )
+        return None
+
+
+async def fetch_user_oc_inv_changed_since(
+    bot: discord.Client, since: datetime.datetime
+) -> set[UserId] | None:
+    """Returns the IDs of users whose inventory changed since a time.
+    Returns None if the query failed."""
+    try:
+        async with bot.pg_pool.acquire() as conn:
+            rows = await conn.fetch(
+                """
+                SELECT user_id::text AS user_id FROM user_oc_inv WHERE updated_at >= $1
+                UNION
+                SELECT key FROM cache_tombstones
+                WHERE table_name = 'user_oc_inv' AND deleted_at >= $1;
+                """,
+                since,
+            )
+        return {to_user_id(row["user_id"]) for row in rows}
+    except Exception as e:
+        pretty_log(
+            tag="error",
+            message=f"Error fetching inventories changed since {since}: {e}",
+        )
+        return None
+
+
+async def prune_cache_tombstones(bot: discord.Client, before: datetime.datetime):
+    """Deletes tombstones older than a time."""
+    try:
+        async with bot.pg_pool.acquire() as conn:
+            await conn.execute(
+                "DELETE FROM cache_tombstones WHERE deleted_at < $1;",
+                before,
+            )
+    except Exception as e:
+        pretty_log(
+            tag="error",
+            message=f"Error pruning cache tombstones: {e}",
+        )
@@ -0,0 +1,44 @@
+# SQL SCRIPT
+"""CREATE TABLE gacha_pull_ledger (
+    message_id BIGINT PRIMARY KEY,
+    user_id BIGINT NOT NULL,
+    pulled_at TIMESTAMPTZ NOT NULL DEFAULT now()
+);"""
+
+# Every pull message is recorded once here. The primary key makes a second
+# delivery of the same message (e.g. after a gateway RESUME) a no-op.
+# These helpers take a connection so they can share the caller's transaction.
+
+
+async def claim_gacha_message(conn, message_id: int, user_id: int) -> bool:
+    """Records a pull message. Returns False if it was already recorded."""
+    claimed = await conn.fetchval(
+        """
+        INSERT INTO gacha_pull_ledger (message_id, user_id)
+        VALUES ($1, $2)
+        ON CONFLICT (message_id) DO NOTHING
+        RETURNING message_id;
+        """,
+        message_id,
+        user_id,
+    )
+    return claimed is not None
+
+
+async def claim_gacha_messages(conn, rows: list[tuple[int, int]]) -> set[int]:
+    """Records many (message_id, user_id) pull messages.
+    Returns the message IDs recorded by this call, ones already recorded are left out."""
+    if not rows:
+        return set()
+    message_ids, user_ids = zip(*rows)
+    claimed = await conn.fetch(
+        """
+        INSERT INTO gacha_pull_ledger (message_id, user_id)
+        SELECT * FROM unnest($1::bigint[], $2::bigint[])
+        ON CONFLICT (message_id) DO NOTHING
+        RETURNING message_id;
+        """,
+        list(message_ids),
+        list(user_ids),
+    )
+    return {row["message_id"] for row in claimed}
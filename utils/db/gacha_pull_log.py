@@ -0,0 +1,157 @@
+import asyncio
+import datetime
+from collections import deque
+
+import discord
+
+from config.gacha import (
+    GACHA_PULL_LOG_ENABLED,
+    GACHA_PULL_LOG_FLUSH_MS,
+    GACHA_PULL_LOG_FLUSH_ROWS,
+    GACHA_PULL_LOG_MAX_BUFFERED,
+)
+from utils.db.gacha_pulls_db import (
+    copy_gacha_pulls,
+    ensure_gacha_pulls_partition,
+    month_start,
+    next_month,
+)
+from utils.logs.pretty_log import pretty_log
+
+# ╭───────────────────────────────╮
+#   ⭐ Pull History Batcher
+# ╰───────────────────────────────╯
+# Every pull is appended to gacha_pulls for analytics and rate audits.
+# Records are buffered here and copied in bulk, so a pull never waits on
+# this insert. The history is best effort: if Postgres stays down long
+# enough to fill GACHA_PULL_LOG_MAX_BUFFERED, the oldest records are dropped.
+
+
+class GachaPullLog:
+    def __init__(
+        self,
+        flush_rows: int = GACHA_PULL_LOG_FLUSH_ROWS,
+        flush_ms: int = GACHA_PULL_LOG_FLUSH_MS,
+        max_buffered: int = GACHA_PULL_LOG_MAX_BUFFERED,
+    ):
+        self.flush_rows = flush_rows
+        self.flush_interval = flush_ms / 1000
+        self.max_buffered = max_buffered
+        self.bot: discord.Client | None = None
+        self.records: deque[tuple] = deque()
+        self.dropped = 0
+        self._partition_months: set[datetime.date] = set()
+        self._flush_lock = asyncio.Lock()
+        self._wake = asyncio.Event()
+        self._task: asyncio.Task | None = None
+
+    # -------------------- Recording --------------------
+    def add(
+        self,
+        message: discord.Message,
+        card_name: str,
+        rarity: str,
+        is_new: bool,
+    ):
+        """Queues one pull for the history table."""
+        if not GACHA_PULL_LOG_ENABLED:
+            return
+        import utils.cache.cache_list as cache_list
+
+        if len(self.records) >= self.max_buffered:
+            self.records.popleft()
+            self.dropped += 1
+        self.records.append(
+            (
+                datetime.datetime.now(datetime.timezone.utc),
+                message.id,
+                message.author.id,
+                message.guild.id if message.guild else None,
+                card_name,
+                rarity,
+                is_new,
+                cache_list.gacha_rates_version,
+            )
+        )
+        if len(self.records) >= self.flush_rows:
+            self._wake.set()
+
+    # -------------------- Partitions --------------------
+    async def _ensure_partitions(self, months: set[datetime.date]) -> bool:
+        for month in sorted(months - self._partition_months):
+            if not await ensure_gacha_pulls_partition(self.bot, month):
+                return False
+            self._partition_months.add(month)
+        return True
+
+    # -------------------- Flushing --------------------
+    async def flush(self) -> bool:
+        """Copies all buffered records into gacha_pulls. Returns True if nothing is left over."""
+        async with self._flush_lock:
+            if self.bot is None or not self.records:
+                return not self.records
+
+            batch = list(self.records)
+            self.records.clear()
+
+            months = {month_start(record[0].date()) for record in batch}
+            if await self._ensure_partitions(months) and await copy_gacha_pulls(
+                self.bot, batch
+            ):
+                if self.dropped:
+                    pretty_log(
+                        tag="warn",
+                        message=f"{self.dropped} gacha pull history records were dropped while the database was unavailable.",
+                    )
+                    self.dropped = 0
+                return True
+
+            # Put the batch back in front of anything recorded meanwhile
+            overflow = len(batch) + len(self.records) - self.max_buffered
+            if overflow > 0:
+                batch = batch[overflow:]
+                self.dropped += overflow
+            self.records.extendleft(reversed(batch))
+            return False
+
+    async def _flush_loop(self):
+        while True:
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+            try:
+                await self.flush()
+            except Exception as e:
+                pretty_log(
+                    tag="error",
+                    message=f"Error in gacha pull history flush loop: {e}",
+                )
+
+    # -------------------- Lifecycle --------------------
+    async def start(self, bot: discord.Client):
+        """Creates this and next month's partitions and starts flushing."""
+        self.bot = bot
+        if not GACHA_PULL_LOG_ENABLED:
+            return
+        this_month = month_start(datetime.datetime.now(datetime.timezone.utc).date())
+        await self._ensure_partitions({this_month, next_month(this_month)})
+
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._flush_loop())
+        pretty_log(tag="info", message="Gacha pull history batcher started.")
+
+    async def stop(self):
+        """Stops the flush loop and writes whatever is still buffered."""
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        if not await self.flush():
+            pretty_log(
+                tag="warn",
+                message=f"{len(self.records)} gacha pull history records could not be written on shutdown.",
+            )
+
+
+gacha_pull_log = GachaPullLog()
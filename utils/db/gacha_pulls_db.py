@@ -0,0 +1,140 @@
+import datetime
+
+import discord
+
+from utils.logs.pretty_log import pretty_log
+
+# SQL SCRIPT
+"""CREATE TABLE gacha_pulls (
+    pulled_at TIMESTAMPTZ NOT NULL,
+    message_id BIGINT NOT NULL,
+    user_id BIGINT NOT NULL,
+    guild_id BIGINT,
+    card_name TEXT NOT NULL,
+    rarity TEXT NOT NULL,
+    is_new BOOLEAN NOT NULL,
+    rates_version INT NOT NULL
+) PARTITION BY RANGE (pulled_at);
+
+CREATE INDEX gacha_pulls_user_id_idx ON gacha_pulls (user_id, pulled_at);"""
+
+# One partition per calendar month, named gacha_pulls_yYYYYmMM.
+# Partitions are created ahead of time by ensure_gacha_pulls_partition and
+# The bot never removes history. Old months can be dropped with
+# tools/drop_gacha_pulls.py, a cheap DROP TABLE instead of a DELETE.
+
+GACHA_PULLS_COLUMNS = (
+    "pulled_at",
+    "message_id",
+    "user_id",
+    "guild_id",
+    "card_name",
+    "rarity",
+    "is_new",
+    "rates_version",
+)
+
+
+def month_start(day: datetime.date) -> datetime.date:
+    return day.replace(day=1)
+
+
+def next_month(day: datetime.date) -> datetime.date:
+    day = month_start(day)
+    if day.month == 12:
+        return day.replace(year=day.year + 1, month=1)
+    return day.replace(month=day.month + 1)
+
+
+def months_before(day: datetime.date, months: int) -> datetime.date:
+    """Returns the first day of the month `months` months before `day`'s month."""
+    month = month_start(day)
+    for _ in range(months):
+        month = (month - datetime.timedelta(days=1)).replace(day=1)
+    return month
+
+
+def gacha_pulls_partition_name(month: datetime.date) -> str:
+    return f"gacha_pulls_y{month.year:04d}m{month.month:02d}"
+
+
+async def ensure_gacha_pulls_partition(bot: discord.Client, month: datetime.date) -> bool:
+    """Creates the partition holding the given month if it does not exist yet."""
+    month = month_start(month)
+    name = gacha_pulls_partition_name(month)
+    start = datetime.datetime.combine(month, datetime.time(), datetime.timezone.utc)
+    end = datetime.datetime.combine(next_month(month), datetime.time(), datetime.timezone.utc)
+    try:
+        async with bot.pg_pool.acquire() as conn:
+            # DDL can't take bind parameters, the bounds come from dates built above
+            await conn.execute(
+                f"""
+                CREATE TABLE IF NOT EXISTS {name}
+                PARTITION OF gacha_pulls
+                FOR VALUES FROM ('{start.isoformat()}') TO ('{end.isoformat()}');
+                """
+            )
+        return True
+    except Exception as e:
+        pretty_log(
+            tag="error",
+            message=f"Failed to create gacha pulls partition '{name}': {e}",
+        )
+        return False
+
+
+async def drop_gacha_pulls_partitions_before(
+    bot: discord.Client, cutoff: datetime.date, dry_run: bool = False
+) -> list[str]:
+    """Drops every monthly partition that ends on or before the cutoff month.
+    Returns the names of the dropped partitions, or with dry_run the ones
+    that would be dropped."""
+    cutoff_name = gacha_pulls_partition_name(month_start(cutoff))
+    dropped = []
+    try:
+        async with bot.pg_pool.acquire() as conn:
+            rows = await conn.fetch(
+                """
+                SELECT child.relname AS name
+                FROM pg_inherits
+                JOIN pg_class parent ON pg_inherits.inhparent = parent.oid
+                JOIN pg_class child ON pg_inherits.inhrelid = child.oid
+                WHERE parent.relname = 'gacha_pulls';
+                """
+            )
+            for row in rows:
+                name = row["name"]
+                # Names sort by month, so a string compare finds the old ones
+                if name.startswith("gacha_pulls_y") and name < cutoff_name:
+                    if not dry_run:
+                        await conn.execute(f"DROP TABLE IF EXISTS {name};")
+                    dropped.append(name)
+        if dropped and not dry_run:
+            pretty_log(
+                tag="db",
+                message=f"Dropped old gacha pulls partitions: {', '.join(dropped)}",
+            )
+    except Exception as e:
+        pretty_log(
+            tag="error",
+            message=f"Failed to drop old gacha pulls partitions: {e}",
+        )
+    return dropped
+
+
+async def copy_gacha_pulls(bot: discord.Client, records: list[tuple]) -> bool:
+    """Bulk inserts pull records with COPY. Each record follows GACHA_PULLS_COLUMNS."""
+    if not records:
+        return True
+    try:
+        async with bot.pg_pool.acquire() as conn:
+            await conn.copy_records_to_table(
+                "gacha_pulls", records=records, columns=GACHA_PULLS_COLUMNS
+            )
+        return True
+    except Exception as e:
+        pretty_log(
+            tag="error",
+            message=f"Failed to copy {len(records)} gacha pulls into database: {e}",
+        )
+        return False
@@ -0,0 +1,128 @@
+import discord
+
+from utils.logs.pretty_log import pretty_log
+
+# SQL SCRIPT
+"""CREATE TABLE gacha_rates (
+    version INT NOT NULL,
+    rarity TEXT NOT NULL,
+    rate DOUBLE PRECISION NOT NULL,
+    emoji TEXT NOT NULL,
+    color INT NOT NULL,
+    created_by TEXT,
+    created_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+    PRIMARY KEY (version, rarity)
+);"""
+
+
+def _rows_to_rates(rows) -> tuple[int, dict[str, dict]]:
+    rates = {
+        row["rarity"]: {
+            "rate": row["rate"],
+            "emoji": row["emoji"],
+            "color": row["color"],
+        }
+        for row in rows
+    }
+    return rows[0]["version"], rates
+
+
+async def fetch_latest_gacha_rates(
+    bot: discord.Client,
+) -> tuple[int, dict[str, dict]] | None:
+    """Fetches the newest version of the gacha rates. Returns None if the table is empty.
+    Query errors are raised, so a failed read is never mistaken for an empty table."""
+    async with bot.pg_pool.acquire() as conn:
+        rows = await conn.fetch(
+            """
+            SELECT version, rarity, rate, emoji, color
+            FROM gacha_rates
+            WHERE version = (SELECT max(version) FROM gacha_rates);
+            """
+        )
+    if not rows:
+        return None
+    return _rows_to_rates(rows)
+
+
+async def seed_gacha_rates(
+    bot: discord.Client,
+    rates: dict[str, dict],
+) -> tuple[int, dict[str, dict]]:
+    """Stores rates as version 1 if the table has no rows yet.
+    Returns the newest version afterwards, the seeded one or whatever another
+    process stored first. Query errors are raised."""
+    async with bot.pg_pool.acquire() as conn:
+        async with conn.transaction():
+            # Same lock as insert_gacha_rates_version, so the empty check holds until commit
+            await conn.execute("LOCK TABLE gacha_rates IN EXCLUSIVE MODE;")
+            rows = await conn.fetch(
+                """
+                SELECT version, rarity, rate, emoji, color
+                FROM gacha_rates
+                WHERE version = (SELECT max(version) FROM gacha_rates);
+                """
+            )
+            if rows:
+                return _rows_to_rates(rows)
+            await conn.executemany(
+                """
+                INSERT INTO gacha_rates (version, rarity, rate, emoji, color, created_by)
+                VALUES (1, $1, $2, $3, $4, 'seed');
+                """,
+                [
+                    (rarity, float(info["rate"]), info["emoji"], int(info["color"]))
+                    for rarity, info in rates.items()
+                ],
+            )
+    pretty_log(
+        tag="info",
+        message="Seeded gacha rates version 1 from the hard-coded defaults.",
+    )
+    return 1, rates
+
+
+async def insert_gacha_rates_version(
+    bot: discord.Client,
+    rates: dict[str, dict],
+    created_by: str | None = None,
+) -> int | None:
+    """Stores a full set of gacha rates as a new version. Returns the new version number."""
+    try:
+        async with bot.pg_pool.acquire() as conn:
+            async with conn.transaction():
+                # Serialize writers so two admins can't claim the same version
+                await conn.execute("LOCK TABLE gacha_rates IN EXCLUSIVE MODE;")
+                version = await conn.fetchval(
+                    """
+                    SELECT COALESCE(max(version), 0) + 1 FROM gacha_rates;
+                    """
+                )
+                await conn.executemany(
+                    """
+                    INSERT INTO gacha_rates (version, rarity, rate, emoji, color, created_by)
+                    VALUES ($1, $2, $3, $4, $5, $6);
+                    """,
+                    [
+                        (
+                            version,
+                            rarity,
+                            float(info["rate"]),
+                            info["emoji"],
+                            int(info["color"]),
+                            created_by,
+                        )
+                        for rarity, info in rates.items()
+                    ],
+                )
+        pretty_log(
+            tag="info",
+            message=f"Stored gacha rates version {version} (by {created_by}).",
+        )
+        return version
+    except Exception as e:
+        pretty_log(
+            tag="error",
+            message=f"Error storing gacha rates: {e}",
+        )
+        return None
@@ -1,4 +1,5 @@
 import os
+import secrets
 import ssl
 import asyncio
 import asyncpg
@@ -8,6 +9,10 @@ from dotenv import load_dotenv
 
 load_dotenv()
 
+# Every pool connection reports this application_name. The cache sync
+# triggers put it in their payloads, so this process can skip its own changes.
+PG_APPLICATION_NAME = f"nyx-{os.getpid()}-{secrets.token_hex(3)}"
+
 
 # -------------------- [💙 SAFE POOL WRAPPER WITH RETRY] --------------------
 class SafePool:
@@ -32,6 +37,7 @@ class SafePool:
             ssl=self.ssl_context,
             min_size=self.min_size,
             max_size=self.max_size,
+            server_settings={"application_name": PG_APPLICATION_NAME},
         )
 
     def acquire(self):
@@ -72,6 +78,7 @@ class SafePool:
             ssl=self.ssl_context,
             min_size=self.min_size,
             max_size=self.max_size,
+            server_settings={"application_name": PG_APPLICATION_NAME},
         )
 
     async def fetch(self, *args, **kwargs):
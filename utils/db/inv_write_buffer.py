@@ -0,0 +1,345 @@
+import asyncio
+import glob
+import json
+import os
+import time
+import uuid
+
+import discord
+
+from config.gacha import (
+    INV_FLUSH_BATCH_RETENTION_DAYS,
+    INV_FLUSH_INTERVAL_SECONDS,
+    INV_FLUSH_MAX_PENDING,
+    INV_JOURNAL_FSYNC_INTERVAL_MS,
+    INV_JOURNAL_PATH,
+)
+from utils.db.user_oc_inv import flush_user_oc_inv_batch, prune_user_oc_inv_flushes
+from utils.logs.pretty_log import pretty_log
+
+# ╭───────────────────────────────╮
+#   ⭐ Inventory Write-Behind Buffer
+# ╰───────────────────────────────╯
+# Pulls are applied to user_oc_inv_cache right away and queued here.
+# Repeated (user_id, card_name) increments are combined into one row and
+# flushed to Postgres in batches, on a timer or once the buffer gets big.
+#
+# Callers claim the pull message in gacha_pull_ledger before queueing, so a
+# redelivered message is turned away before it reaches the cache or gets a
+# reply. A crash between the claim and the journal append loses that one
+# pull, before its reply went out. Journals written by older versions carry each message's copies in
+# message_owned instead; the flush claims those and leaves out the copies of
+# messages that were already recorded.
+#
+# Every queued change is first appended to a local journal file. Appends
+# only reach the OS right away, which survives a bot crash. A sync task
+# fsyncs them in a worker thread every INV_JOURNAL_FSYNC_INTERVAL_MS, so one
+# disk sync covers every pull of that interval and the event loop never
+# waits on the disk.
+# On flush the journal is rotated to "<journal>.<batch_id>.flushing" and
+# removed once the batch is committed. The batch ID is stored in
+# user_oc_inv_flushes in the same transaction, so replaying a batch that
+# did commit before a crash is a no-op. Batch IDs are pruned after
+# INV_FLUSH_BATCH_RETENTION_DAYS.
+#
+# Batches that are being written or waiting for a retry are kept in
+# `unflushed` so a user's inventory loaded from Postgres in the meantime
+# can have them added back on top (see fetch_with_pending).
+
+PRUNE_INTERVAL_SECONDS = 24 * 60 * 60
+
+
+class InvWriteBuffer:
+    def __init__(
+        self,
+        journal_path: str = INV_JOURNAL_PATH,
+        flush_interval: float = INV_FLUSH_INTERVAL_SECONDS,
+        max_pending: int = INV_FLUSH_MAX_PENDING,
+        fsync_interval_ms: int = INV_JOURNAL_FSYNC_INTERVAL_MS,
+    ):
+        self.journal_path = journal_path
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self.fsync_interval_ms = fsync_interval_ms
+        self.bot: discord.Client | None = None
+        self.pending: dict[tuple[int, str], dict] = {}
+        self.unflushed: dict[str, dict[tuple[int, str], dict]] = {}
+        self._journal = None
+        self._journal_dirty = False
+        # Held while a worker thread uses the journal's file descriptor
+        self._sync_lock = asyncio.Lock()
+        self._sync_task: asyncio.Task | None = None
+        self._flush_lock = asyncio.Lock()
+        self._timer_task: asyncio.Task | None = None
+        self._size_flush_task: asyncio.Task | None = None
+        # Users whose cache counted pulls the flush skipped as already recorded
+        self._stale_users: set[int] = set()
+
+    # -------------------- Journal --------------------
+    def _open_journal(self):
+        if self._journal is None:
+            directory = os.path.dirname(self.journal_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._journal = open(self.journal_path, "a", encoding="utf-8")
+        return self._journal
+
+    @staticmethod
+    def _sync_and_close(journal):
+        journal.flush()
+        os.fsync(journal.fileno())
+        journal.close()
+
+    async def _close_journal(self):
+        """Detaches the journal, then syncs and closes it in a worker thread."""
+        # Detached before the first await, so appends from here on open a new journal
+        journal, self._journal = self._journal, None
+        self._journal_dirty = False
+        if journal is None:
+            return
+        async with self._sync_lock:
+            await asyncio.to_thread(self._sync_and_close, journal)
+
+    def _append_journal(self, row: dict):
+        journal = self._open_journal()
+        journal.write(json.dumps(row, separators=(",", ":")) + "\n")
+        journal.flush()
+        self._journal_dirty = True
+
+    async def sync_journal(self):
+        """fsyncs the appends made since the last sync in a worker thread."""
+        async with self._sync_lock:
+            journal = self._journal
+            if journal is None or not self._journal_dirty:
+                return
+            self._journal_dirty = False
+            await asyncio.to_thread(os.fsync, journal.fileno())
+
+    async def _sync_loop(self):
+        while True:
+            await asyncio.sleep(self.fsync_interval_ms / 1000)
+            try:
+                await self.sync_journal()
+            except Exception as e:
+                pretty_log(
+                    tag="error",
+                    message=f"Error syncing the inventory journal: {e}",
+                )
+
+    @staticmethod
+    def _read_journal(path: str) -> list[dict]:
+        rows = []
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    rows.append(json.loads(line))
+                except json.JSONDecodeError:
+                    # Torn last line from a crash mid-write
+                    pretty_log(
+                        tag="warn",
+                        message=f"Skipping unreadable inventory journal line in {path}.",
+                    )
+        return rows
+
+    # -------------------- Buffering --------------------
+    def _merge(self, pending: dict, row: dict):
+        key = (row["user_id"], row["card_name"])
+        existing = pending.get(key)
+        if existing:
+            existing["owned"] += row["owned"]
+            existing["user_name"] = row["user_name"]
+            existing["message_owned"].extend(row.get("message_owned", []))
+            existing["message_ids"].extend(row.get("message_ids", []))
+        else:
+            pending[key] = dict(row)
+            pending[key]["message_owned"] = list(row.get("message_owned", []))
+            pending[key]["message_ids"] = list(row.get("message_ids", []))
+
+    def add_pulls(
+        self,
+        user_id: int,
+        user_name: str,
+        pulls: list[dict],
+    ):
+        """Queues pulled OCs for a user and applies them to the cache immediately.
+
+        Each pull dict holds card_name, rarity, character_info, image_link and owned.
+        The pull message must already be claimed in gacha_pull_ledger.
+        """
+        from utils.cache.user_inv_cache import add_user_oc_pulls_cache
+
+        for pull in pulls:
+            row = {
+                "user_id": user_id,
+                "user_name": user_name,
+                "card_name": pull["card_name"],
+                "rarity": pull["rarity"],
+                "character_info": pull["character_info"],
+                "image_link": pull["image_link"],
+                "owned": pull["owned"],
+            }
+            self._append_journal(row)
+            self._merge(self.pending, row)
+
+        add_user_oc_pulls_cache(user_id, user_name, pulls)
+
+        if len(self.pending) >= self.max_pending and (
+            self._size_flush_task is None or self._size_flush_task.done()
+        ):
+            self._size_flush_task = asyncio.create_task(self.flush())
+
+    def _pending_rows_for(self, user_id: int) -> list[dict]:
+        batches = [*self.unflushed.values(), self.pending]
+        return [
+            row for batch in batches for key, row in batch.items() if key[0] == user_id
+        ]
+
+    async def fetch_with_pending(self, user_id: int, fetch) -> tuple[list[dict], list[dict]]:
+        """Runs fetch() for one user's rows while no batch is being written.
+
+        Returns (rows, pending_rows), where pending_rows are this user's
+        changes that are not in Postgres yet and must be added on top.
+        """
+        async with self._flush_lock:
+            rows = await fetch()
+            return rows, self._pending_rows_for(user_id)
+
+    # -------------------- Flushing --------------------
+    async def _flush_file(self, path: str, batch_id: str, rows: list[dict]) -> bool:
+        if rows:
+            skipped_users = await flush_user_oc_inv_batch(self.bot, batch_id, rows)
+            if skipped_users is None:
+                return False
+            self._stale_users |= skipped_users
+        os.remove(path)
+        self.unflushed.pop(batch_id, None)
+        return True
+
+    async def flush(self) -> bool:
+        """Writes all buffered changes to Postgres. Returns True if nothing is left over."""
+        try:
+            return await self._flush()
+        finally:
+            await self._reload_stale_users()
+
+    async def _reload_stale_users(self):
+        # Reloading reads through fetch_with_pending, so this runs after the lock is released
+        from utils.cache.user_inv_cache import reload_user_oc_inv_cache
+
+        while self._stale_users and self.bot is not None:
+            await reload_user_oc_inv_cache(self.bot, self._stale_users.pop())
+
+    async def _flush(self) -> bool:
+        async with self._flush_lock:
+            if self.bot is None:
+                return False
+
+            # Retry batches left behind by a failed flush first
+            all_flushed = True
+            for path in sorted(glob.glob(f"{self.journal_path}.*.flushing")):
+                batch_id = path[len(self.journal_path) + 1 : -len(".flushing")]
+                retry_batch = {}
+                for row in self._read_journal(path):
+                    self._merge(retry_batch, row)
+                self.unflushed[batch_id] = retry_batch
+                if not await self._flush_file(path, batch_id, list(retry_batch.values())):
+                    all_flushed = False
+
+            if not self.pending:
+                return all_flushed
+
+            batch = self.pending
+            self.pending = {}
+            batch_id = uuid.uuid4().hex
+            self.unflushed[batch_id] = batch
+            flushing_path = f"{self.journal_path}.{batch_id}.flushing"
+            if os.path.exists(self.journal_path):
+                # Renamed before any await, so pulls added meanwhile start a new journal
+                os.replace(self.journal_path, flushing_path)
+                await self._close_journal()
+            else:
+                await self._close_journal()
+                await asyncio.to_thread(self._write_rows, flushing_path, list(batch.values()))
+
+            if not await self._flush_file(flushing_path, batch_id, list(batch.values())):
+                # The .flushing file stays on disk and is retried with the same batch ID
+                pretty_log(
+                    tag="warn",
+                    message=f"Inventory batch '{batch_id}' ({len(batch)} rows) will be retried.",
+                )
+                return False
+            return all_flushed
+
+    @staticmethod
+    def _write_rows(path: str, rows: list[dict]):
+        with open(path, "w", encoding="utf-8") as f:
+            for row in rows:
+                f.write(json.dumps(row, separators=(",", ":")) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+    async def _flush_loop(self):
+        last_prune = time.monotonic()
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            try:
+                await self.flush()
+                if time.monotonic() - last_prune >= PRUNE_INTERVAL_SECONDS:
+                    last_prune = time.monotonic()
+                    await prune_user_oc_inv_flushes(
+                        self.bot, INV_FLUSH_BATCH_RETENTION_DAYS
+                    )
+            except Exception as e:
+                pretty_log(
+                    tag="error",
+                    message=f"Error in inventory write buffer flush loop: {e}",
+                )
+
+    # -------------------- Lifecycle --------------------
+    async def start(self, bot: discord.Client):
+        """Replays any journal left by a previous run, flushes it and starts the flush timer."""
+        self.bot = bot
+        if os.path.exists(self.journal_path):
+            rows = self._read_journal(self.journal_path)
+            for row in rows:
+                self._merge(self.pending, row)
+            if rows:
+                pretty_log(
+                    tag="info",
+                    message=f"Replaying {len(rows)} journaled inventory changes.",
+                )
+        # Left over .flushing batches are retried by flush(), already committed ones are skipped
+        await self.flush()
+        await prune_user_oc_inv_flushes(bot, INV_FLUSH_BATCH_RETENTION_DAYS)
+
+        if self._timer_task is None or self._timer_task.done():
+            self._timer_task = asyncio.create_task(self._flush_loop())
+        if self.fsync_interval_ms > 0 and (
+            self._sync_task is None or self._sync_task.done()
+        ):
+            self._sync_task = asyncio.create_task(self._sync_loop())
+        pretty_log(tag="info", message="Inventory write buffer started.")
+
+    async def stop(self):
+        """Stops the flush and sync timers and flushes everything still buffered."""
+        if self._timer_task is not None:
+            self._timer_task.cancel()
+            self._timer_task = None
+        if self._sync_task is not None:
+            self._sync_task.cancel()
+            self._sync_task = None
+        flushed = await self.flush()
+        await self._close_journal()
+        if flushed:
+            pretty_log(tag="info", message="Inventory write buffer flushed on shutdown.")
+        else:
+            pretty_log(
+                tag="warn",
+                message="Inventory write buffer could not fully flush on shutdown, the journal will be replayed on startup.",
+            )
+
+
+inv_write_buffer = InvWriteBuffer()
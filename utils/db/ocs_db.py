@@ -119,14 +119,15 @@ async def fetch_oc(bot: discord.Client, name: str) -> dict | None:
         return None
 
 
-async def fetch_all_ocs(bot: discord.Client) -> list[dict]:
-    """Fetches all OC entries from the database."""
+async def fetch_all_ocs(bot: discord.Client) -> list[dict] | None:
+    """Fetches all OC entries from the database. Returns None if the query failed."""
     try:
         async with bot.pg_pool.acquire() as conn:
             rows = await conn.fetch(
                 """
                 SELECT name, rarity, character_info, image_link
-                FROM ocs;
+                FROM ocs
+                ORDER BY name;
                 """
             )
             return [
@@ -143,7 +144,7 @@ async def fetch_all_ocs(bot: discord.Client) -> list[dict]:
             tag="error",
             message=f"Error fetching all OCs: {e}",
         )
-        return []
+        return None
 
 
 async def fetch_all_ocs_by_rarity(bot: discord.Client, rarity: str) -> list[dict]:
@@ -181,44 +182,30 @@ async def edit_oc(
     new_image_link: str | None = None,
     new_character_info: str | None = None,
 ):
-    """Edits an existing OC entry in the database."""
+    """Edits an existing OC entry in the database. Fields left as None keep their current value."""
     try:
         async with bot.pg_pool.acquire() as conn:
-            # Fetch current values
-            current_oc = await fetch_oc(bot, name)
-            if not current_oc:
-                pretty_log(
-                    tag="error",
-                    message=f"OC '{name}' not found for editing.",
-                )
-                return
-
-            # Use new values if provided, else keep current
-            rarity = new_rarity if new_rarity is not None else current_oc["rarity"]
-            image_link = (
-                new_image_link
-                if new_image_link is not None
-                else current_oc["image_link"]
-            )
-            character_info = (
-                new_character_info
-                if new_character_info is not None
-                else current_oc["character_info"]
-            )
-
-            await conn.execute(
+            # One statement, the edited row comes back for the cache
+            row = await conn.fetchrow(
                 """
                 UPDATE ocs
-                SET rarity = $1,
-                    character_info = $2,
-                    image_link = $3
-                WHERE name = $4;
+                SET rarity = COALESCE($1, rarity),
+                    character_info = COALESCE($2, character_info),
+                    image_link = COALESCE($3, image_link)
+                WHERE name = $4
+                RETURNING name, rarity, character_info, image_link;
                 """,
-                rarity,
-                character_info,
-                image_link,
+                new_rarity,
+                new_character_info,
+                new_image_link,
                 name,
             )
+        if row is None:
+            pretty_log(
+                tag="error",
+                message=f"OC '{name}' not found for editing.",
+            )
+            return
         pretty_log(
             tag="info",
             message=f"Edited OC '{name}' in database.",
@@ -226,7 +213,9 @@ async def edit_oc(
         # Update cache as well
         from utils.cache.ocs_cache import edit_oc_cache
 
-        await edit_oc_cache(bot, name, character_info, image_link)
+        edit_oc_cache(
+            row["name"], row["rarity"], row["character_info"], row["image_link"]
+        )
 
     except Exception as e:
         pretty_log(
@@ -1,10 +1,13 @@
+from typing import NewType
+
 import discord
 
+from utils.db.gacha_ledger_db import claim_gacha_message, claim_gacha_messages
 from utils.logs.pretty_log import pretty_log
 
 # SQL SCRIPT
 """CREATE TABLE user_oc_inv (
-    user_id TEXT NOT NULL,
+    user_id BIGINT NOT NULL,
     user_name TEXT NOT NULL,
     card_name TEXT NOT NULL,
     rarity TEXT NOT NULL,
@@ -14,15 +17,39 @@ from utils.logs.pretty_log import pretty_log
     PRIMARY KEY (user_id, card_name)
 );"""
 
+# SQL SCRIPT
+"""-- Migration for tables created when user_id was TEXT
+ALTER TABLE user_oc_inv ALTER COLUMN user_id TYPE BIGINT USING user_id::bigint;"""
+
+# Discord user IDs are snowflakes, stored as BIGINT and cached under the same
+# int. Anything read back from outside (rows, journal files, payloads) goes
+# through to_user_id, so a user never ends up under a second key in the cache.
+UserId = NewType("UserId", int)
+
+
+def to_user_id(value: int | str) -> UserId:
+    """Returns a user ID as the int used by the database and the cache."""
+    return UserId(int(value))
+
+# SQL SCRIPT
+"""CREATE TABLE user_oc_inv_flushes (
+    batch_id TEXT PRIMARY KEY,
+    flushed_at TIMESTAMPTZ NOT NULL DEFAULT now()
+);"""
+
 
 async def user_inv_oc_name_autocomplete(
     interaction: discord.Interaction,
     current: str,
 ) -> list[discord.app_commands.Choice[str]]:
     """Provides autocomplete suggestions for OC names in a user's inventory."""
-    from utils.cache.user_inv_cache import list_oc_names_in_user_inv_cache
+    from utils.cache.user_inv_cache import (
+        ensure_user_oc_inv_cache,
+        list_oc_names_in_user_inv_cache,
+    )
 
     user_id = interaction.user.id
+    await ensure_user_oc_inv_cache(interaction.client, user_id)
     oc_names_in_inv = list_oc_names_in_user_inv_cache(user_id)
     suggestions = [
         discord.app_commands.Choice(name=oc_name, value=oc_name)
@@ -34,7 +61,7 @@ async def user_inv_oc_name_autocomplete(
 
 async def upsert_user_oc_inv(
     bot: discord.Client,
-    user_id: int,
+    user_id: UserId,
     user_name: str,
     card_name: str,
     rarity: str,
@@ -87,9 +114,289 @@ async def upsert_user_oc_inv(
         )
 
 
+async def claim_user_oc_pull_message(
+    bot: discord.Client, message_id: int, user_id: UserId
+) -> bool | None:
+    """Records a pull message in gacha_pull_ledger on its own, for pulls written
+    through the inventory write buffer.
+    Returns True if it was claimed now, False if it was already recorded, None on error.
+    """
+    try:
+        async with bot.pg_pool.acquire() as conn:
+            return await claim_gacha_message(conn, message_id, user_id)
+    except Exception as e:
+        pretty_log(
+            tag="error",
+            message=f"Error claiming pull message ID {message_id} for user '{user_id}': {e}",
+        )
+        return None
+
+
+async def prune_user_oc_inv_flushes(bot: discord.Client, older_than_days: int):
+    """Deletes flushed batch IDs older than a number of days."""
+    try:
+        async with bot.pg_pool.acquire() as conn:
+            await conn.execute(
+                """
+                DELETE FROM user_oc_inv_flushes
+                WHERE flushed_at < now() - make_interval(days => $1);
+                """,
+                older_than_days,
+            )
+    except Exception as e:
+        pretty_log(
+            tag="error",
+            message=f"Error pruning flushed inventory batch IDs: {e}",
+        )
+
+
+async def record_user_oc_pull(
+    bot: discord.Client,
+    user_id: UserId,
+    user_name: str,
+    card_name: str,
+    rarity: str,
+    character_info: str | None,
+    image_link: str,
+    message_id: int,
+) -> tuple[int, bool] | bool | None:
+    """Adds one pulled OC to a user's inventory in a single round trip.
+
+    The pull message is claimed in gacha_pull_ledger by the same statement,
+    so a message delivered twice only writes once.
+    Returns (owned, is_new) where is_new is True if the row was just inserted,
+    False if this message was already pulled, or None if the write failed.
+    """
+    try:
+        async with bot.pg_pool.acquire() as conn:
+            row = await conn.fetchrow(
+                """
+                WITH claim AS (
+                    INSERT INTO gacha_pull_ledger (message_id, user_id)
+                    VALUES ($7, $8)
+                    ON CONFLICT (message_id) DO NOTHING
+                    RETURNING message_id
+                )
+                INSERT INTO user_oc_inv (user_id, user_name, card_name, rarity, character_info, image_link, owned)
+                SELECT $1::bigint, $2::text, $3::text, $4::text, $5::text, $6::text, 1
+                WHERE EXISTS (SELECT 1 FROM claim)
+                ON CONFLICT (user_id, card_name) DO UPDATE
+                SET user_name = EXCLUDED.user_name,
+                    rarity = EXCLUDED.rarity,
+                    character_info = EXCLUDED.character_info,
+                    image_link = EXCLUDED.image_link,
+                    owned = user_oc_inv.owned + 1
+                RETURNING owned, (xmax = 0) AS inserted;
+                """,
+                user_id,
+                user_name,
+                card_name,
+                rarity,
+                character_info,
+                image_link,
+                message_id,
+                user_id,
+            )
+        if row is None:
+            pretty_log(
+                tag="skip",
+                message=f"Pull for message ID {message_id} was already recorded, skipping.",
+            )
+            return False
+        owned, is_new = row["owned"], row["inserted"]
+        pretty_log(
+            tag="info",
+            message=f"Recorded pull for user '{user_id}', card '{card_name}' (owned: {owned}, new: {is_new}).",
+        )
+        # Update cache as well
+        from utils.cache.user_inv_cache import upsert_user_oc_inv_cache
+
+        upsert_user_oc_inv_cache(
+            user_id=user_id,
+            user_name=user_name,
+            card_name=card_name,
+            rarity=rarity,
+            character_info=character_info,
+            image_link=image_link,
+            owned=owned,
+        )
+        return owned, is_new
+    except Exception as e:
+        pretty_log(
+            tag="error",
+            message=f"Error recording pull for user '{user_id}', card '{card_name}': {e}",
+        )
+        return None
+
+
+async def _add_owned_many(conn, rows: list[tuple]):
+    """Upserts inventory rows, adding each row's owned count to any existing count.
+    Rows are (user_id, user_name, card_name, rarity, character_info, image_link, owned)."""
+    await conn.executemany(
+        """
+        INSERT INTO user_oc_inv (user_id, user_name, card_name, rarity, character_info, image_link, owned)
+        VALUES ($1, $2, $3, $4, $5, $6, $7)
+        ON CONFLICT (user_id, card_name) DO UPDATE
+        SET user_name = EXCLUDED.user_name,
+            rarity = EXCLUDED.rarity,
+            character_info = EXCLUDED.character_info,
+            image_link = EXCLUDED.image_link,
+            owned = user_oc_inv.owned + EXCLUDED.owned;
+        """,
+        rows,
+    )
+
+
+async def add_user_oc_pulls(
+    bot: discord.Client,
+    user_id: UserId,
+    user_name: str,
+    pulls: list[dict],
+    message_id: int,
+) -> bool | None:
+    """Adds a batch of pulled OCs to a user's inventory in one transaction.
+
+    Each pull dict holds card_name, rarity, character_info, image_link and owned,
+    where owned is the number of copies to add. The pull message is claimed in
+    gacha_pull_ledger in the same transaction.
+    Returns True on success, None if this message was already pulled, False on error.
+    """
+    if not pulls:
+        return True
+    try:
+        async with bot.pg_pool.acquire() as conn:
+            async with conn.transaction():
+                if not await claim_gacha_message(conn, message_id, user_id):
+                    pretty_log(
+                        tag="skip",
+                        message=f"Pulls for message ID {message_id} were already recorded, skipping.",
+                    )
+                    return None
+                await _add_owned_many(
+                    conn,
+                    [
+                        (
+                            user_id,
+                            user_name,
+                            pull["card_name"],
+                            pull["rarity"],
+                            pull["character_info"],
+                            pull["image_link"],
+                            pull["owned"],
+                        )
+                        for pull in pulls
+                    ],
+                )
+        pretty_log(
+            tag="info",
+            message=f"Added {len(pulls)} pulled OCs for user '{user_id}' into database.",
+        )
+        # Update cache as well
+        from utils.cache.user_inv_cache import add_user_oc_pulls_cache
+
+        add_user_oc_pulls_cache(user_id, user_name, pulls)
+        return True
+    except Exception as e:
+        pretty_log(
+            tag="error",
+            message=f"Error adding pulled OCs for user '{user_id}': {e}",
+        )
+        return False
+
+
+async def flush_user_oc_inv_batch(
+    bot: discord.Client,
+    batch_id: str,
+    rows: list[dict],
+) -> set[UserId] | None:
+    """Writes one batch of buffered inventory increments in a single transaction.
+
+    The batch ID is recorded in the same transaction, so a batch that was
+    already committed is skipped instead of being applied twice.
+
+    Each row's message_owned lists [message_id, owned] for the pull messages
+    it came from. Those messages are claimed in gacha_pull_ledger first, and
+    the copies from messages that were already recorded (a second delivery of
+    the same message) are left out of the increment.
+    Does not touch the cache, the write buffer has already applied it.
+    Returns the users whose copies were left out, as their cached inventory
+    counted them. Returns None if the batch could not be written.
+    """
+    try:
+        async with bot.pg_pool.acquire() as conn:
+            async with conn.transaction():
+                claimed = await conn.fetchval(
+                    """
+                    INSERT INTO user_oc_inv_flushes (batch_id)
+                    VALUES ($1)
+                    ON CONFLICT (batch_id) DO NOTHING
+                    RETURNING batch_id;
+                    """,
+                    batch_id,
+                )
+                if claimed is None:
+                    pretty_log(
+                        tag="info",
+                        message=f"Inventory batch '{batch_id}' was already flushed, skipping.",
+                    )
+                    return set()
+
+                message_users = {}
+                for row in rows:
+                    user_id = to_user_id(row["user_id"])
+                    for message_id, _ in row.get("message_owned", []):
+                        message_users[message_id] = user_id
+                    # Journals written before message_owned only list the IDs
+                    for message_id in row.get("message_ids", []):
+                        message_users[message_id] = user_id
+                claimed_ids = await claim_gacha_messages(
+                    conn, list(message_users.items())
+                )
+
+                upserts = []
+                skipped_users = set()
+                for row in rows:
+                    user_id = to_user_id(row["user_id"])
+                    owned = row["owned"]
+                    for message_id, message_owned in row.get("message_owned", []):
+                        if message_id not in claimed_ids:
+                            owned -= message_owned
+                            skipped_users.add(user_id)
+                    if owned <= 0:
+                        continue
+                    upserts.append(
+                        (
+                            user_id,
+                            row["user_name"],
+                            row["card_name"],
+                            row["rarity"],
+                            row["character_info"],
+                            row["image_link"],
+                            owned,
+                        )
+                    )
+                await _add_owned_many(conn, upserts)
+        if skipped_users:
+            pretty_log(
+                tag="skip",
+                message=f"Inventory batch '{batch_id}' held already recorded pull messages for {len(skipped_users)} users, skipped those copies.",
+            )
+        pretty_log(
+            tag="db",
+            message=f"Flushed inventory batch '{batch_id}' ({len(upserts)} rows) into database.",
+        )
+        return skipped_users
+    except Exception as e:
+        pretty_log(
+            tag="error",
+            message=f"Error flushing inventory batch '{batch_id}': {e}",
+        )
+        return None
+
+
 async def fetch_all_user_oc_invs(
     bot: discord.Client,
-) -> dict[int, list[dict[str, str]]]:
+) -> dict[UserId, list[dict[str, str]]]:
     """Fetches the OC inventories for all users."""
     try:
         async with bot.pg_pool.acquire() as conn:
@@ -101,7 +408,7 @@ async def fetch_all_user_oc_invs(
             )
             user_invs = {}
             for row in rows:
-                user_id = row["user_id"]
+                user_id = to_user_id(row["user_id"])
                 if user_id not in user_invs:
                     user_invs[user_id] = []
                 user_invs[user_id].append(
@@ -123,7 +430,7 @@ async def fetch_all_user_oc_invs(
         return {}
 
 
-async def fetch_user_oc_inv(bot: discord.Client, user_id: int) -> list[dict[str, str]]:
+async def fetch_user_oc_inv(bot: discord.Client, user_id: UserId) -> list[dict[str, str]]:
     """Fetches the OC inventory for a specific user."""
     try:
         async with bot.pg_pool.acquire() as conn:
@@ -155,7 +462,7 @@ async def fetch_user_oc_inv(bot: discord.Client, user_id: int) -> list[dict[str,
 
 async def increment_oc_owned(
     bot: discord.Client,
-    user_id: int,
+    user_id: UserId,
     card_name: str,
     increment_by: int = 1,
 ):
@@ -189,7 +496,7 @@ async def increment_oc_owned(
 
 async def decrement_oc_owned(
     bot: discord.Client,
-    user_id: int,
+    user_id: UserId,
     card_name: str,
     decrement_by: int = 1,
 ):
@@ -223,7 +530,7 @@ async def decrement_oc_owned(
 
 async def update_oc_owned(
     bot: discord.Client,
-    user_id: int,
+    user_id: UserId,
     card_name: str,
     new_owned: int,
 ):
@@ -257,7 +564,7 @@ async def update_oc_owned(
 
 async def delete_user_inv(
     bot: discord.Client,
-    user_id: int,
+    user_id: UserId,
 ):
     """Deletes the entire OC inventory for a specific user."""
     try:
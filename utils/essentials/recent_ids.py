@@ -0,0 +1,34 @@
+from collections import OrderedDict
+
+from config.gacha import GACHA_RECENT_MESSAGE_IDS
+
+# ╭───────────────────────────────╮
+#   ⭐ Recent ID Set
+# ╰───────────────────────────────╯
+# Bounded set of recently seen IDs. Once full, the oldest ID is dropped.
+
+
+class RecentIds:
+    __slots__ = ("maxsize", "_ids")
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._ids: OrderedDict[int, None] = OrderedDict()
+
+    def __contains__(self, item: int) -> bool:
+        return item in self._ids
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def add(self, item: int) -> bool:
+        """Adds an ID. Returns False if it was already seen."""
+        if item in self._ids:
+            return False
+        self._ids[item] = None
+        if len(self._ids) > self.maxsize:
+            self._ids.popitem(last=False)
+        return True
+
+
+recent_gacha_messages = RecentIds(GACHA_RECENT_MESSAGE_IDS)
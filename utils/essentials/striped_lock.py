@@ -0,0 +1,29 @@
+import asyncio
+
+from config.gacha import USER_INV_LOCK_STRIPES
+
+
+# 💜────────────────────────────────────────────
+#       🟣 Striped Async Locks 🟣
+# 💜────────────────────────────────────────────
+class StripedLock:
+    """
+    Fixed set of asyncio locks picked by key hash.
+
+    ✅ Same key always maps to the same lock, so work for one key runs one at a time.
+    ✅ Different keys usually land on different stripes and run in parallel.
+    ✅ Memory stays constant no matter how many keys are seen.
+    """
+
+    def __init__(self, stripes: int = 64):
+        if stripes < 1:
+            raise ValueError("StripedLock needs at least one stripe.")
+        self._locks = tuple(asyncio.Lock() for _ in range(stripes))
+
+    def for_key(self, key) -> asyncio.Lock:
+        """Returns the lock guarding the given key. Not reentrant."""
+        return self._locks[hash(key) % len(self._locks)]
+
+
+# Guards per-user inventory changes: async with user_inv_locks.for_key(user_id): ...
+user_inv_locks = StripedLock(USER_INV_LOCK_STRIPES)
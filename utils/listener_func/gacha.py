@@ -2,26 +2,27 @@ import random
 
 import discord
 
-from config.ocs import OCS_RARITY_MAP, determine_is_skin
-from utils.cache.cache_list import (
-    common_ocs_cache,
-    epic_ocs_cache,
-    legendary_ocs_cache,
-    ocs_cache,
-    rare_ocs_cache,
-    user_oc_inv_cache,
+from config.gacha import INV_WRITE_BEHIND
+from config.ocs import OCS_RARITY_MAP
+from utils.cache.cache_list import oc_catalog, user_oc_inv_cache
+from utils.cache.gacha_embed_cache import get_gacha_embed
+from utils.cache.inv_entry import InvEntry
+from utils.cache.user_inv_cache import ensure_user_oc_inv_cache
+from utils.cache.oc_catalog import OCRecord
+from utils.db.gacha_pull_log import gacha_pull_log
+from utils.db.inv_write_buffer import inv_write_buffer
+from utils.db.user_oc_inv import (
+    add_user_oc_pulls,
+    claim_user_oc_pull_message,
+    record_user_oc_pull,
 )
-from utils.db.user_oc_inv import increment_oc_owned, upsert_user_oc_inv
+from utils.essentials.striped_lock import user_inv_locks
+from utils.listener_func.gacha_sampler import draw_gacha_outcome
+from utils.listener_func.reply_coalescer import gacha_reply_coalescer
 from utils.logs.debug_log import debug_log, enable_debug
 from utils.logs.pretty_log import pretty_log
 
 #enable_debug(f"{__name__}.gacha_pull")
-RARITY_CACHE_MAP = {
-    "Common": common_ocs_cache,
-    "Rare": rare_ocs_cache,
-    "Epic": epic_ocs_cache,
-    "Legendary": legendary_ocs_cache,
-}
 
 
 def get_random_rarity():
@@ -32,43 +33,41 @@ def get_random_rarity():
 
 async def pick_random_oc_by_rarity(
     bot: discord.Client, rarity: str
-) -> dict[str, dict[str, str]] | None:
-    cache = RARITY_CACHE_MAP.get(rarity)
-    if not cache:
+) -> OCRecord | None:
+    records = oc_catalog.by_rarity(rarity)
+    if not records:
         # Reload caches if not found
         from utils.cache.ocs_cache import load_ocs_cache
 
         await load_ocs_cache(bot)
-        # Re-import cache variables to get updated references
-        from utils.cache.cache_list import (
-            common_ocs_cache,
-            epic_ocs_cache,
-            legendary_ocs_cache,
-            rare_ocs_cache,
-        )
+        records = oc_catalog.by_rarity(rarity)
+    return random.choice(records) if records else None
+
 
-        cache = {
-            "Common": common_ocs_cache,
-            "Rare": rare_ocs_cache,
-            "Epic": epic_ocs_cache,
-            "Legendary": legendary_ocs_cache,
-        }.get(rarity)
-    if not cache:
-        return None
-    return random.choice(cache) if cache else None
+def get_oc_from_user_inv_cache(user_id: int, card_name: str) -> InvEntry | None:
+    user_inv = user_oc_inv_cache.get(user_id)
+    return user_inv.get(card_name) if user_inv is not None else None
 
 
-def get_oc_from_user_inv_cache(user_id: int, card_name: str) -> dict[str, str] | None:
-    user_inv = user_oc_inv_cache.get(user_id, [])
-    return next((item for item in user_inv if item["card_name"] == card_name), None)
+def build_gacha_embed(
+    rarity: str,
+    character_name: str,
+    image_url: str | None,
+    is_new: bool,
+    is_skin: bool,
+) -> discord.Embed:
+    """Returns the result embed for a single pulled OC from the prebuilt embed cache."""
+    return get_gacha_embed(character_name, rarity, image_url, is_new, is_skin)
 
 
 async def gacha_pull(bot: discord.Client, message: discord.Message):
     """Simulates a gacha pull and sends the result as an embed."""
     try:
-        rarity = get_random_rarity()
-        oc_entry = await pick_random_oc_by_rarity(bot, rarity)
-        if not oc_entry:
+        rarity, oc = draw_gacha_outcome()
+        if not oc:
+            # Rarity had no OCs in cache, reload and retry within the same rarity
+            oc = await pick_random_oc_by_rarity(bot, rarity)
+        if not oc:
             debug_log(
                 f"No OC found for rarity {rarity} during gacha pull",
             )
@@ -76,60 +75,82 @@ async def gacha_pull(bot: discord.Client, message: discord.Message):
                 "No OCs available for the selected rarity. Please try again later."
             )
             return
-        character_name = list(oc_entry.keys())[0]
-        info = oc_entry[character_name]
-        # Debug: log the structure of oc_entry and info
-        debug_log(f"oc_entry: {oc_entry}")
-        debug_log(f"character_name: {character_name}")
-        debug_log(f"info: {info} (type: {type(info)})")
-        character_info = info.get("character_info", None)
-        image_url = info["image_link"]
-
-        display_character_name = character_name.title()
-        rarity_emoji = OCS_RARITY_MAP[rarity]["emoji"]
-        rarity_color = OCS_RARITY_MAP[rarity]["color"]
-
-        # Check if user already owns the OC
-        already_owned = False
-        footer_text = None
-        is_skin = determine_is_skin(character_name)
+        debug_log(f"Pulled OC: {oc}")
+        character_name = oc.name
+        character_info = oc.character_info
+        image_url = oc.image_link
+
         user = message.author
         user_id = user.id
-        owned_oc_info = get_oc_from_user_inv_cache(user_id, character_name)
-        if owned_oc_info:
-            already_owned = True
-            await increment_oc_owned(bot, user_id, character_name)
-        else:
-            await upsert_user_oc_inv(
-                bot=bot,
-                user_id=user_id,
-                user_name=user.name,
-                card_name=character_name,
-                rarity=rarity,
-                character_info=character_info,
-                image_link=image_url,
-                owned=1,
-            )
 
-        # Determine footer text
-        if not already_owned:
-            if is_skin:
-                footer_text = "New skin unlocked!"
+        # One pull at a time per user so the ownership check and write can't interleave
+        async with user_inv_locks.for_key(user_id):
+            # Loads the inventory on first use, so the ownership check below sees it
+            await ensure_user_oc_inv_cache(bot, user_id)
+            if INV_WRITE_BEHIND:
+                # Claimed before anything user-visible, so a redelivered message
+                # gets no second reply even after it left recent_gacha_messages
+                claimed = await claim_user_oc_pull_message(bot, message.id, user_id)
+                if claimed is None:
+                    await message.reply(
+                        "An error occurred while processing your gacha pull. Please try again later."
+                    )
+                    return
+                if not claimed:
+                    pretty_log(
+                        tag="skip",
+                        message=f"Pull for message ID {message.id} was already recorded, skipping.",
+                    )
+                    return
+                # Cache is updated now, Postgres catches up on the next buffer flush
+                already_owned = (
+                    get_oc_from_user_inv_cache(user_id, character_name) is not None
+                )
+                inv_write_buffer.add_pulls(
+                    user_id,
+                    user.name,
+                    [
+                        {
+                            "card_name": character_name,
+                            "rarity": rarity,
+                            "character_info": character_info,
+                            "image_link": image_url,
+                            "owned": 1,
+                        }
+                    ],
+                )
             else:
-                footer_text = "New Character unlocked!"
+                result = await record_user_oc_pull(
+                    bot,
+                    user_id=user_id,
+                    user_name=user.name,
+                    card_name=character_name,
+                    rarity=rarity,
+                    character_info=character_info,
+                    image_link=image_url,
+                    message_id=message.id,
+                )
+                if result is None:
+                    await message.reply(
+                        "An error occurred while processing your gacha pull. Please try again later."
+                    )
+                    return
+                if result is False:
+                    # Already pulled for this message, the first delivery replied
+                    return
+                _, is_new = result
+                already_owned = not is_new
 
-        description = f"{rarity_emoji} `{display_character_name}` has been added to your collection!\n"
-        embed = discord.Embed(
-            title="You have been blessed!",
-            color=rarity_color,
-            description=description,
+        gacha_pull_log.add(message, character_name, rarity, is_new=not already_owned)
+        embed = build_gacha_embed(
+            rarity=rarity,
+            character_name=character_name,
+            image_url=image_url,
+            is_new=not already_owned,
+            is_skin=oc.is_skin,
         )
-        if image_url:
-            embed.set_image(url=image_url)
-
-        if footer_text:
-            embed.set_footer(text=footer_text)
-        await message.reply(embed=embed)
+        # Sent together with other results for this channel within a short window
+        gacha_reply_coalescer.submit(message, embed)
     except Exception as e:
         pretty_log(
             tag="error",
@@ -139,3 +160,107 @@ async def gacha_pull(bot: discord.Client, message: discord.Message):
         await message.reply(
             "An error occurred while processing your gacha pull. Please try again later."
         )
+
+
+async def gacha_multi_pull(bot: discord.Client, message: discord.Message, count: int):
+    """Simulates several gacha pulls at once.
+
+    All results are drawn up front, written in one transaction and sent
+    back as a single reply with one embed per pull.
+    """
+    try:
+        # Draw every result before touching the database
+        pulled: list[tuple[str, OCRecord]] = []
+        for _ in range(count):
+            rarity, oc = draw_gacha_outcome()
+            if not oc:
+                # Rarity had no OCs in cache, reload and retry within the same rarity
+                oc = await pick_random_oc_by_rarity(bot, rarity)
+            if not oc:
+                debug_log(
+                    f"No OC found for rarity {rarity} during gacha multi pull",
+                )
+                continue
+            pulled.append((rarity, oc))
+
+        if not pulled:
+            await message.reply(
+                "No OCs available for the selected rarity. Please try again later."
+            )
+            return
+
+        user = message.author
+        user_id = user.id
+
+        async with user_inv_locks.for_key(user_id):
+            await ensure_user_oc_inv_cache(bot, user_id)
+            # Combine duplicates into one row per card, keeping pull order
+            pulls_by_name: dict[str, dict] = {}
+            embeds = []
+            new_flags = []
+            for rarity, oc in pulled:
+                pull = pulls_by_name.get(oc.name)
+                if pull:
+                    pull["owned"] += 1
+                    is_new = False
+                else:
+                    pulls_by_name[oc.name] = {
+                        "card_name": oc.name,
+                        "rarity": rarity,
+                        "character_info": oc.character_info,
+                        "image_link": oc.image_link,
+                        "owned": 1,
+                    }
+                    is_new = not get_oc_from_user_inv_cache(user_id, oc.name)
+                new_flags.append(is_new)
+                embeds.append(
+                    build_gacha_embed(
+                        rarity=rarity,
+                        character_name=oc.name,
+                        image_url=oc.image_link,
+                        is_new=is_new,
+                        is_skin=oc.is_skin,
+                    )
+                )
+
+            if INV_WRITE_BEHIND:
+                # Claimed before the reply, see gacha_pull
+                claimed = await claim_user_oc_pull_message(bot, message.id, user_id)
+                if claimed:
+                    inv_write_buffer.add_pulls(
+                        user_id, user.name, list(pulls_by_name.values())
+                    )
+                    saved = True
+                else:
+                    # Same meaning as add_user_oc_pulls: None is a repeat, False an error
+                    saved = None if claimed is False else False
+            else:
+                saved = await add_user_oc_pulls(
+                    bot,
+                    user_id=user_id,
+                    user_name=user.name,
+                    pulls=list(pulls_by_name.values()),
+                    message_id=message.id,
+                )
+        if saved is None:
+            # Already pulled for this message, the first delivery replied
+            return
+        if not saved:
+            await message.reply(
+                "An error occurred while processing your gacha pull. Please try again later."
+            )
+            return
+
+        for (rarity, oc), is_new in zip(pulled, new_flags):
+            gacha_pull_log.add(message, oc.name, rarity, is_new=is_new)
+
+        await message.reply(embeds=embeds)
+    except Exception as e:
+        pretty_log(
+            tag="error",
+            message=f"Error during gacha multi pull for message ID {message.id}: {e}",
+            include_trace=True,
+        )
+        await message.reply(
+            "An error occurred while processing your gacha pull. Please try again later."
+        )
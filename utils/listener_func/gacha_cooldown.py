@@ -0,0 +1,204 @@
+import asyncio
+import json
+import math
+import os
+import time
+from functools import lru_cache
+
+import discord
+
+from config.gacha import (
+    GACHA_COOLDOWN_REPLY_INTERVAL,
+    GACHA_COOLDOWN_SAVE_INTERVAL_SECONDS,
+    GACHA_COOLDOWN_STATE_PATH,
+    GACHA_GUILD_BUCKET_CAPACITY,
+    GACHA_GUILD_REFILL_PER_SECOND,
+    GACHA_USER_BUCKET_CAPACITY,
+    GACHA_USER_REFILL_PER_SECOND,
+)
+from utils.logs.pretty_log import pretty_log
+
+
+class TokenBucketLimiter:
+    """
+    Token buckets keyed by ID, refilled lazily on access.
+
+    ✅ Each bucket is one (tokens, updated_at) tuple, nothing runs per tick.
+    ✅ Buckets that have refilled to full are dropped by cleanup().
+    ✅ Timestamps are wall clock so saved state stays valid across restarts.
+    """
+
+    def __init__(self, capacity: float, refill_per_second: float):
+        self.capacity = capacity
+        self.refill_per_second = refill_per_second
+        self._buckets: dict[int, tuple[float, float]] = {}
+
+    def _tokens(self, key: int, now: float) -> float:
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            return self.capacity
+        tokens, updated_at = bucket
+        return min(
+            self.capacity, tokens + (now - updated_at) * self.refill_per_second
+        )
+
+    def retry_after(self, key: int, cost: float, now: float) -> float:
+        """Seconds until `cost` tokens are available, 0 if they are available now."""
+        missing = cost - self._tokens(key, now)
+        if missing <= 0:
+            return 0.0
+        if cost > self.capacity or self.refill_per_second <= 0:
+            return math.inf
+        return missing / self.refill_per_second
+
+    def consume(self, key: int, cost: float, now: float):
+        """Takes `cost` tokens. Call only after retry_after() returned 0."""
+        self._buckets[key] = (self._tokens(key, now) - cost, now)
+
+    def refund(self, key: int, amount: float, now: float):
+        """Gives back tokens taken by consume(), never above capacity."""
+        self._buckets[key] = (min(self.capacity, self._tokens(key, now) + amount), now)
+
+    def cleanup(self, now: float) -> int:
+        """Drops buckets that are full again. Returns how many were dropped."""
+        full = [key for key in self._buckets if self._tokens(key, now) >= self.capacity]
+        for key in full:
+            del self._buckets[key]
+        return len(full)
+
+    def dump(self) -> dict[str, list[float]]:
+        return {str(key): list(bucket) for key, bucket in self._buckets.items()}
+
+    def load(self, data: dict[str, list[float]]):
+        self._buckets = {int(key): (bucket[0], bucket[1]) for key, bucket in data.items()}
+
+    def __len__(self):
+        return len(self._buckets)
+
+
+@lru_cache(maxsize=64)
+def cooldown_reply(seconds: int) -> str:
+    """Cooldown reply text, cached per whole second."""
+    return f"Easy there! Nyx needs a breather, try again in **{seconds}s**."
+
+
+class GachaCooldown:
+    """Per-user and per-guild gacha cooldowns with persisted state."""
+
+    def __init__(self, state_path: str = GACHA_COOLDOWN_STATE_PATH):
+        self.state_path = state_path
+        self.users = TokenBucketLimiter(
+            GACHA_USER_BUCKET_CAPACITY, GACHA_USER_REFILL_PER_SECOND
+        )
+        self.guilds = TokenBucketLimiter(
+            GACHA_GUILD_BUCKET_CAPACITY, GACHA_GUILD_REFILL_PER_SECOND
+        )
+        self._last_notice: dict[int, float] = {}
+        self._task: asyncio.Task | None = None
+
+    def try_acquire(self, user_id: int, guild_id: int | None, cost: int = 1) -> float:
+        """Takes tokens for a pull. Returns 0 if allowed, else seconds to wait."""
+        now = time.time()
+        wait = self.users.retry_after(user_id, cost, now)
+        if guild_id is not None:
+            wait = max(wait, self.guilds.retry_after(guild_id, cost, now))
+        if wait > 0:
+            return wait
+        self.users.consume(user_id, cost, now)
+        if guild_id is not None:
+            self.guilds.consume(guild_id, cost, now)
+        return 0.0
+
+    def refund(self, message: discord.Message, cost: int = 1):
+        """Gives back the tokens of a pull that was allowed but never ran, e.g. shed by the queue."""
+        now = time.time()
+        self.users.refund(message.author.id, cost, now)
+        if message.guild is not None:
+            self.guilds.refund(message.guild.id, cost, now)
+
+    async def check(self, message: discord.Message, cost: int = 1) -> bool:
+        """Returns True if the pull may go ahead, else sends a rate-limited cooldown reply."""
+        user_id = message.author.id
+        guild_id = message.guild.id if message.guild else None
+        wait = self.try_acquire(user_id, guild_id, cost)
+        if wait == 0:
+            return True
+
+        now = time.time()
+        if now - self._last_notice.get(user_id, 0) >= GACHA_COOLDOWN_REPLY_INTERVAL:
+            self._last_notice[user_id] = now
+            if math.isinf(wait):
+                content = "That's more pulls than Nyx allows at once, try a smaller number!"
+            else:
+                content = cooldown_reply(math.ceil(wait))
+            try:
+                await message.reply(content)
+            except Exception:
+                pass
+        return False
+
+    # -------------------- Housekeeping --------------------
+    def cleanup(self):
+        now = time.time()
+        self.users.cleanup(now)
+        self.guilds.cleanup(now)
+        self._last_notice = {
+            user_id: at
+            for user_id, at in self._last_notice.items()
+            if now - at < GACHA_COOLDOWN_REPLY_INTERVAL
+        }
+
+    def save(self):
+        """Writes the non-idle buckets to disk."""
+        self.cleanup()
+        try:
+            directory = os.path.dirname(self.state_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            tmp_path = f"{self.state_path}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({"users": self.users.dump(), "guilds": self.guilds.dump()}, f)
+            os.replace(tmp_path, self.state_path)
+        except Exception as e:
+            pretty_log(
+                tag="error",
+                message=f"Error saving gacha cooldown state: {e}",
+            )
+
+    def load(self):
+        """Restores buckets saved by a previous run."""
+        if not os.path.exists(self.state_path):
+            return
+        try:
+            with open(self.state_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            self.users.load(data.get("users", {}))
+            self.guilds.load(data.get("guilds", {}))
+            self.cleanup()
+            pretty_log(
+                tag="info",
+                message=f"Restored gacha cooldowns for {len(self.users)} users and {len(self.guilds)} guilds.",
+            )
+        except Exception as e:
+            pretty_log(
+                tag="error",
+                message=f"Error loading gacha cooldown state: {e}",
+            )
+
+    async def _save_loop(self):
+        while True:
+            await asyncio.sleep(GACHA_COOLDOWN_SAVE_INTERVAL_SECONDS)
+            self.save()
+
+    def start(self):
+        """Loads saved state and starts the periodic cleanup + save."""
+        self.load()
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._save_loop())
+
+    def stop(self):
+        """Stops the periodic save and saves one last time."""
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        self.save()
@@ -0,0 +1,169 @@
+import asyncio
+import time
+
+import discord
+
+from config.gacha import (
+    GACHA_QUEUE_DRAIN_TIMEOUT_SECONDS,
+    GACHA_QUEUE_HIGH_WATER,
+    GACHA_QUEUE_METRICS_INTERVAL_SECONDS,
+    GACHA_WORKERS,
+)
+from utils.listener_func.gacha import gacha_multi_pull, gacha_pull
+from utils.logs.pretty_log import pretty_log
+
+BUSY_REPLY = "Nyx is a little overwhelmed right now, please try again in a moment!"
+
+
+class GachaWorkQueue:
+    """
+    Bounded queue of gacha pulls served by a fixed pool of workers.
+
+    ✅ At most `workers` pulls run at once, so bursts can't drain the DB pool.
+    ✅ Past the high-water mark new pulls are shed with a fast busy reply.
+    ✅ Keeps queue depth, wait time and shed counts, logged on a timer.
+    ✅ Stopping lets queued pulls finish before the workers are cancelled.
+    """
+
+    def __init__(
+        self,
+        bot: discord.Client,
+        workers: int = GACHA_WORKERS,
+        high_water: int = GACHA_QUEUE_HIGH_WATER,
+    ):
+        self.bot = bot
+        self.worker_count = workers
+        self.high_water = high_water
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=high_water)
+        self._workers: list[asyncio.Task] = []
+        self._metrics_task: asyncio.Task | None = None
+        self._shedding = False
+        self._closing = False
+
+        # Metrics
+        self.enqueued = 0
+        self.processed = 0
+        self.failed = 0
+        self.shed = 0
+        self.max_depth = 0
+        self.total_wait = 0.0
+
+    def start(self):
+        """Starts the worker tasks."""
+        if self._workers:
+            return
+        self._closing = False
+        self._metrics_task = asyncio.create_task(self._metrics_loop())
+        self._workers = [
+            asyncio.create_task(self._worker(i)) for i in range(self.worker_count)
+        ]
+        pretty_log(
+            tag="info",
+            message=f"Gacha queue started with {self.worker_count} workers (high water {self.high_water}).",
+        )
+
+    async def stop(self, timeout: float = GACHA_QUEUE_DRAIN_TIMEOUT_SECONDS):
+        """Stops taking pulls, waits up to `timeout` seconds for queued ones to
+        finish, then cancels the workers. Pulls still queued after that are dropped."""
+        self._closing = True
+        if self._workers:
+            try:
+                await asyncio.wait_for(self._queue.join(), timeout=timeout)
+            except asyncio.TimeoutError:
+                pretty_log(
+                    tag="warn",
+                    message=f"Gacha queue did not drain in {timeout}s, dropping {self._queue.qsize()} queued pulls.",
+                )
+        for task in self._workers:
+            task.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+        if self._metrics_task is not None:
+            self._metrics_task.cancel()
+            self._metrics_task = None
+        self._log_metrics()
+
+    async def submit(self, message: discord.Message, count: int = 1) -> bool:
+        """Queues a pull. Returns False and sends a busy reply if the queue is full
+        or shutting down."""
+        if self._closing:
+            try:
+                await message.reply(BUSY_REPLY)
+            except Exception:
+                pass
+            return False
+
+        if self._queue.qsize() >= self.high_water:
+            self.shed += 1
+            if not self._shedding:
+                self._shedding = True
+                pretty_log(
+                    tag="warn",
+                    message=f"Gacha queue hit high water ({self.high_water}), shedding new pulls.",
+                )
+            try:
+                await message.reply(BUSY_REPLY)
+            except Exception:
+                pass
+            return False
+
+        self._shedding = False
+        self._queue.put_nowait((message, count, time.monotonic()))
+        self.enqueued += 1
+        self.max_depth = max(self.max_depth, self._queue.qsize())
+        return True
+
+    async def _worker(self, worker_id: int):
+        while True:
+            message, count, queued_at = await self._queue.get()
+            self.total_wait += time.monotonic() - queued_at
+            try:
+                if count == 1:
+                    await gacha_pull(self.bot, message)
+                else:
+                    await gacha_multi_pull(self.bot, message, count)
+                self.processed += 1
+            except Exception as e:
+                self.failed += 1
+                pretty_log(
+                    tag="error",
+                    message=f"Gacha worker {worker_id} failed on message ID {message.id}: {e}",
+                )
+            finally:
+                self._queue.task_done()
+
+    def get_metrics(self) -> dict:
+        """Returns a snapshot of the queue metrics."""
+        finished = self.processed + self.failed
+        return {
+            "depth": self._queue.qsize(),
+            "max_depth": self.max_depth,
+            "workers": len(self._workers),
+            "enqueued": self.enqueued,
+            "processed": self.processed,
+            "failed": self.failed,
+            "shed": self.shed,
+            "avg_wait_ms": (self.total_wait / finished * 1000) if finished else 0.0,
+        }
+
+    def _log_metrics(self):
+        metrics = self.get_metrics()
+        pretty_log(
+            tag="info",
+            message=(
+                f"Gacha queue: depth {metrics['depth']} (max {metrics['max_depth']}), "
+                f"{metrics['processed']} processed, {metrics['failed']} failed, "
+                f"{metrics['shed']} shed, avg wait {metrics['avg_wait_ms']:.1f}ms"
+            ),
+        )
+
+    async def _metrics_loop(self):
+        last_enqueued = self.enqueued
+        last_shed = self.shed
+        while True:
+            await asyncio.sleep(GACHA_QUEUE_METRICS_INTERVAL_SECONDS)
+            if self.enqueued == last_enqueued and self.shed == last_shed:
+                continue
+            last_enqueued = self.enqueued
+            last_shed = self.shed
+            self._log_metrics()
@@ -0,0 +1,144 @@
+import random
+from typing import TYPE_CHECKING
+
+from config.ocs import OC_PULL_WEIGHTS, OCS_RARITY_MAP
+
+if TYPE_CHECKING:
+    from utils.cache.oc_catalog import OCCatalog, OCRecord
+
+# ╭───────────────────────────────╮
+#   ⭐ Alias Sampler
+# ╰───────────────────────────────╯
+# Walker/Vose alias table over every (rarity, OC) outcome of a pull.
+# Each slot's weight is:
+#   rarity rate * (OC weight / sum of OC weights in that rarity)
+# so one draw covers both the rarity roll and the OC pick.
+# A rarity with no OCs keeps its full rate as a single (rarity, None) slot,
+# which keeps the overall odds identical to the two-stage pull.
+
+
+class AliasSampler:
+    """Precomputed O(1) sampler over weighted outcomes."""
+
+    __slots__ = ("outcomes", "prob", "alias", "size")
+
+    def __init__(self, outcomes: list, weights: list[float]):
+        self.outcomes = tuple(outcomes)
+        self.size = len(outcomes)
+        self.prob, self.alias = build_alias_table(weights)
+
+    def draw(self, rng: random.Random | None = None):
+        """Returns one outcome. One random float, no allocation."""
+        u = (rng or random).random() * self.size
+        i = int(u)
+        if u - i < self.prob[i]:
+            return self.outcomes[i]
+        return self.outcomes[self.alias[i]]
+
+
+def build_alias_table(weights: list[float]) -> tuple[tuple[float, ...], tuple[int, ...]]:
+    """Builds Vose's alias table for the given non-negative weights."""
+    n = len(weights)
+    if n == 0:
+        raise ValueError("Cannot build an alias table with no outcomes.")
+    total = float(sum(weights))
+    if total <= 0:
+        raise ValueError("Alias table weights must sum to a positive value.")
+
+    scaled = [w * n / total for w in weights]
+    prob = [0.0] * n
+    alias = [0] * n
+    small = [i for i, p in enumerate(scaled) if p < 1.0]
+    large = [i for i, p in enumerate(scaled) if p >= 1.0]
+
+    while small and large:
+        s = small.pop()
+        l = large.pop()
+        prob[s] = scaled[s]
+        alias[s] = l
+        scaled[l] = (scaled[l] + scaled[s]) - 1.0
+        if scaled[l] < 1.0:
+            small.append(l)
+        else:
+            large.append(l)
+
+    # Leftovers are 1.0 up to float error
+    for i in large:
+        prob[i] = 1.0
+    for i in small:
+        prob[i] = 1.0
+
+    return tuple(prob), tuple(alias)
+
+
+# ╭───────────────────────────────╮
+#   ⭐ Gacha Sampler State
+# ╰───────────────────────────────╯
+# The sampler remembers the catalog version it was built from and is
+# rebuilt on the next draw once the catalog has changed.
+_gacha_sampler: AliasSampler | None = None
+_gacha_sampler_version: int | None = None
+
+
+def mark_gacha_sampler_dirty():
+    """Drops the current sampler so the next draw rebuilds it.
+    Call when OC weights change, catalog changes are picked up on their own."""
+    global _gacha_sampler
+    _gacha_sampler = None
+
+
+def install_gacha_sampler(sampler: AliasSampler, catalog_version: int):
+    """Swaps in a sampler that was built off to the side from the given catalog version."""
+    global _gacha_sampler, _gacha_sampler_version
+    _gacha_sampler = sampler
+    _gacha_sampler_version = catalog_version
+
+
+def get_oc_catalog() -> "OCCatalog":
+    """Returns the live OC catalog."""
+    import utils.cache.cache_list as cache_list
+
+    return cache_list.oc_catalog
+
+
+def build_gacha_sampler(
+    catalog: "OCCatalog",
+    rarity_map: dict[str, dict] | None = None,
+) -> AliasSampler:
+    """Builds the combined rarity + OC alias sampler from the OC catalog.
+    Uses OCS_RARITY_MAP unless another rarity map is given."""
+    outcomes = []
+    weights = []
+    for rarity, rarity_info in (rarity_map or OCS_RARITY_MAP).items():
+        rate = rarity_info["rate"]
+        if rate <= 0:
+            continue
+        records = catalog.by_rarity(rarity)
+        oc_weights = [max(OC_PULL_WEIGHTS.get(oc.name, 1.0), 0.0) for oc in records]
+        total_oc_weight = sum(oc_weights)
+        if total_oc_weight <= 0:
+            # No pullable OCs, keep the rarity's share so odds stay the same
+            outcomes.append((rarity, None))
+            weights.append(rate)
+            continue
+        for oc, oc_weight in zip(records, oc_weights):
+            if oc_weight <= 0:
+                continue
+            outcomes.append((rarity, oc))
+            weights.append(rate * oc_weight / total_oc_weight)
+    return AliasSampler(outcomes, weights)
+
+
+def get_gacha_sampler() -> AliasSampler:
+    """Returns the current sampler, rebuilding it if it is stale."""
+    catalog = get_oc_catalog()
+    sampler = _gacha_sampler
+    if sampler is None or _gacha_sampler_version != catalog.version:
+        sampler = build_gacha_sampler(catalog)
+        install_gacha_sampler(sampler, catalog.version)
+    return sampler
+
+
+def draw_gacha_outcome() -> tuple[str, "OCRecord | None"]:
+    """Draws one (rarity, OC record) pair. The record is None if the rarity has no OCs."""
+    return get_gacha_sampler().draw()
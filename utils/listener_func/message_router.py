@@ -0,0 +1,66 @@
+from typing import Awaitable, Callable
+
+import discord
+
+# Handlers get the message and everything after the command word, stripped
+MessageHandler = Callable[[discord.Message, str], Awaitable[None]]
+
+
+class MessageRouter:
+    """
+    Listener-level router for prefix messages.
+
+    ✅ Rejects messages on first character and length before allocating anything.
+    ✅ Checks a precomputed per-guild channel allowlist for each command.
+    ✅ Dispatches to registered handlers through a dict lookup.
+    """
+
+    def __init__(self, prefix: str = ".", max_length: int = 32):
+        self.prefix = prefix
+        self.max_length = max_length
+        self._handlers: dict[str, MessageHandler] = {}
+        self._channel_allowlists: dict[str, dict[int, frozenset[int]]] = {}
+
+    def register(
+        self,
+        command: str,
+        handler: MessageHandler,
+        channel_allowlist: dict[int, list[int]] | None = None,
+    ):
+        """Registers a handler for a command word.
+
+        channel_allowlist maps guild IDs to the channel IDs the command may run in.
+        Guilds that are not listed allow every channel.
+        """
+        command = command.lower()
+        self._handlers[command] = handler
+        self._channel_allowlists[command] = {
+            guild_id: frozenset(channel_ids)
+            for guild_id, channel_ids in (channel_allowlist or {}).items()
+        }
+
+    async def route(self, message: discord.Message) -> bool:
+        """Dispatches a message to its handler. Returns True if a handler ran."""
+        content = message.content
+        if (
+            not content
+            or content[0] != self.prefix
+            or len(content) > self.max_length
+            or message.author.bot
+        ):
+            return False
+
+        command, _, args = content[1:].partition(" ")
+        command = command.lower()
+        handler = self._handlers.get(command)
+        if handler is None:
+            return False
+
+        guild = message.guild
+        if guild is not None:
+            allowed_channels = self._channel_allowlists[command].get(guild.id)
+            if allowed_channels is not None and message.channel.id not in allowed_channels:
+                return False
+
+        await handler(message, args.strip())
+        return True
@@ -0,0 +1,101 @@
+import asyncio
+
+import discord
+
+from config.gacha import GACHA_REPLY_WINDOW_SECONDS
+from utils.logs.pretty_log import pretty_log
+
+# Discord allows at most 10 embeds per message
+MAX_EMBEDS_PER_MESSAGE = 10
+
+
+class ReplyCoalescer:
+    """
+    Batches gacha result embeds per channel.
+
+    ✅ Results for the same channel within `window` seconds go out as one message.
+    ✅ A batch is sent early once it reaches 10 embeds.
+    ✅ A lone result is still sent as a normal reply.
+    """
+
+    def __init__(self, window: float = GACHA_REPLY_WINDOW_SECONDS):
+        self.window = window
+        self._pending: dict[int, list[tuple[discord.Message, discord.Embed]]] = {}
+        self._timers: dict[int, asyncio.Task] = {}
+        # Timers and sends still running, kept so they are not garbage collected
+        # and so flush_all can wait for them
+        self._tasks: set[asyncio.Task] = set()
+
+    def _spawn(self, coro) -> asyncio.Task:
+        task = asyncio.create_task(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return task
+
+    def submit(self, message: discord.Message, embed: discord.Embed):
+        """Queues a result embed as the reply to a message."""
+        channel_id = message.channel.id
+        batch = self._pending.setdefault(channel_id, [])
+        batch.append((message, embed))
+
+        if len(batch) >= MAX_EMBEDS_PER_MESSAGE:
+            # Take the full batch now, later results start a new one
+            del self._pending[channel_id]
+            timer = self._timers.pop(channel_id, None)
+            if timer:
+                timer.cancel()
+            self._spawn(self._send(channel_id, batch))
+        elif channel_id not in self._timers:
+            self._timers[channel_id] = self._spawn(
+                self._flush_after_window(channel_id)
+            )
+
+    async def _flush_after_window(self, channel_id: int):
+        await asyncio.sleep(self.window)
+        self._timers.pop(channel_id, None)
+        await self._flush(channel_id)
+
+    async def _flush(self, channel_id: int):
+        batch = self._pending.pop(channel_id, None)
+        if batch:
+            await self._send(channel_id, batch)
+
+    async def _send(
+        self, channel_id: int, batch: list[tuple[discord.Message, discord.Embed]]
+    ):
+        try:
+            if len(batch) == 1:
+                message, embed = batch[0]
+                await message.reply(embed=embed)
+                return
+
+            embeds = []
+            for message, embed in batch:
+                user = message.author
+                embed.set_author(
+                    name=f"For {user.display_name}",
+                    icon_url=user.display_avatar.url,
+                )
+                embeds.append(embed)
+            channel = batch[0][0].channel
+            for start in range(0, len(embeds), MAX_EMBEDS_PER_MESSAGE):
+                await channel.send(
+                    embeds=embeds[start : start + MAX_EMBEDS_PER_MESSAGE]
+                )
+        except Exception as e:
+            pretty_log(
+                tag="error",
+                message=f"Error sending {len(batch)} coalesced gacha replies to channel {channel_id}: {e}",
+            )
+
+    async def flush_all(self):
+        """Sends every pending batch now and waits for sends in progress, e.g. on shutdown."""
+        for timer in self._timers.values():
+            timer.cancel()
+        self._timers.clear()
+        for channel_id in list(self._pending):
+            self._spawn(self._flush(channel_id))
+        await asyncio.gather(*list(self._tasks), return_exceptions=True)
+
+
+gacha_reply_coalescer = ReplyCoalescer()